@@ -1,27 +1,57 @@
-from typing import List, Tuple
+from typing import Callable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 from habit import Habit
+from db import DatabaseConnector, iter_batches
 import datetime
 
+#BACKEND SELECTION
+
+_BACKEND = "python"
+
+def set_backend(name: str) -> str:
+    """
+    Selects the implementation used by the batch analytics functions.
+
+    Args:
+        name (str): 'python' or 'numpy'. 'numpy' falls back to 'python'
+            when NumPy is not installed.
+
+    Returns:
+        str: The backend that is now active.
+    """
+    global _BACKEND
+    if name not in ("python", "numpy"):
+        raise ValueError(f"Unknown analytics backend: {name!r}")
+    if name == "numpy":
+        import analysis_numpy
+        if not analysis_numpy.available():
+            name = "python"
+    _BACKEND = name
+    return _BACKEND
+
+def get_backend() -> str:
+    """Return the name of the active analytics backend."""
+    return _BACKEND
+
 #HABIT LISTING FUNCTIONS
 
-def list_all_habits(habits: List[Habit])-> List[str]:
+def list_all_habits(habits: Iterable[Habit])-> List[str]:
     """
     Return a list containing the names of all tracked habits.
     
     Args:
-    habits (List[Habit]): List of Habit objects.
+    habits (Iterable[Habit]): Habit objects, e.g. a list or DatabaseConnector.iter_habits().
     
     Returns:
     List[str] Names of all habits
     """
 
     return [h.name for h in habits]
-def list_by_periodicity(habits: List[Habit],periodicity: str) -> List[str]:
+def list_by_periodicity(habits: Iterable[Habit],periodicity: str) -> List[str]:
     """
     Returns habit names filtered by periodicity.
     
     Args:
-        habits (List[Habit]): List of Habit objects.
+        habits (Iterable[Habit]): Habit objects, e.g. a list or DatabaseConnector.iter_habits().
         periodicity (str): 'daily' or 'weekly'.
     
     Returns:
@@ -31,50 +61,56 @@ def list_by_periodicity(habits: List[Habit],periodicity: str) -> List[str]:
     return [h.name for h in habits if h.periodicity == periodicity]
 
 
-def calculate_average_success_rate(habits: List[Habit]) -> float:
+def calculate_average_success_rate(habits: Iterable[Habit]) -> float:
     """
     Calculates the average success rate across all habits since creation.
 
+    The habits are consumed in one pass, a batch at a time, so a stream
+    such as DatabaseConnector.iter_habits() is never held in memory.
+
     Args:
-        habits (List[Habit]): List of Habit objects.
+        habits (Iterable[Habit]): Habit objects, e.g. a list or DatabaseConnector.iter_habits().
 
         Returns:
             float: Average completion rate as a percentage (rounded to 2 decimal places.)
     """
 
-    if not habits:
-        return 0.0
-    
-    rates = []
     today = datetime.date.today()
-    for habit in habits:
-        if habit.periodicity == "daily":
-            total_periods = (today - habit.creation_date).days + 1
-        elif habit.periodicity == "weekly":
-            total_periods = ((today - habit.creation_date).days // 7) + 1
-        else:
-            total_periods = 1
-
-        rate = (len(habit.completion_dates) /total_periods) * 100 if total_periods > 0 else 0
-        rates.append(rate)
-    return round(sum(rates) / len(rates), 2)
+    total = 0.0
+    count = 0
+    for batch in iter_batches(habits, 256):
+        # Added one by one, so the sum is the same as over a single list.
+        for rate in success_rates(batch, today):
+            total += rate
+        count += len(batch)
+    if not count:
+        return 0.0
+    return round(total / count, 2)
 
-def find_longest_streak(habits: List[Habit]) -> Tuple[str,int]:
+def find_longest_streak(habits: Iterable[Habit]) -> Tuple[str,int]:
     """
     Find the habit with the longest currently active streak.
     
     Args:
-        habits (List[Habit]): List of Habit objects.
+        habits (Iterable[Habit]): Habit objects, e.g. a list or DatabaseConnector.iter_habits().
         
     Returns:
-        Tuple[str, int]: Habit name and its current streak count.
-        Returns("None", 0) if the input list is empty.
+        Tuple[str, int]: Habit name and its current streak count (the first
+        habit wins ties). Returns("None", 0) if the input is empty.
     """
 
-    if not habits:
-        return ("None", 0)
-    longest = max(habits, key=lambda h: h.current_streak)
-    return (longest.name, longest.current_streak)
+    return _first_max(habits, lambda h: h.current_streak)
+
+def _first_max(habits: Iterable[Habit], key: Callable[[Habit], int]) -> Tuple[str, int]:
+    """
+    Returns (name, key) of the first habit with the highest key, in one pass, or ("None", 0).
+    """
+    best_name, best = "None", None
+    for habit in habits:
+        value = key(habit)
+        if best is None or value > best:
+            best_name, best = habit.name, value
+    return (best_name, best) if best is not None else ("None", 0)
 
 def longest_streak_for_habit(habit: Habit) -> int:
     """
@@ -88,6 +124,73 @@ def longest_streak_for_habit(habit: Habit) -> int:
     """
     return habit.current_streak 
 
+#HISTORICAL STREAKS
+
+def longest_ever_streak_for_habit(habit: Habit) -> int:
+    """
+    Returns the longest streak a habit has ever reached, not just the current one.
+
+    Args:
+        habit (Habit): The habit object to check.
+
+    Returns:
+        int: The longest historical streak.
+    """
+    return habit.streak_index.longest()
+
+def find_longest_ever_streak(habits: Iterable[Habit]) -> Tuple[str, int]:
+    """
+    Find the habit with the longest streak ever reached.
+
+    Args:
+        habits (Iterable[Habit]): Habit objects, e.g. a list or DatabaseConnector.iter_habits().
+
+    Returns:
+        Tuple[str, int]: Habit name and its longest historical streak (the
+        first habit wins ties). Returns ("None", 0) if the input is empty.
+    """
+    return _first_max(habits, longest_ever_streak_for_habit)
+
+def streak_as_of(habit: Habit, day: datetime.date) -> int:
+    """
+    Returns the streak a habit had on a given day.
+
+    Args:
+        habit (Habit): The habit to analyze.
+        day (datetime.date): The day to evaluate.
+
+    Returns:
+        int: The streak running on that day, or 0 if it was broken.
+    """
+    return habit.streak_index.streak_as_of(day)
+
+def completions_between(habit: Habit, start: datetime.date, end: datetime.date) -> int:
+    """
+    Counts a habit's completions within a date range.
+
+    Args:
+        habit (Habit): The habit to analyze.
+        start (datetime.date): First day of the range.
+        end (datetime.date): Last day of the range (inclusive).
+
+    Returns:
+        int: Number of completed days in the range.
+    """
+    return habit.streak_index.count_between(start, end)
+
+def streaks_as_of_report(habits: Sequence[Habit], day: datetime.date) -> List[Tuple[str, int]]:
+    """
+    Lists every habit's streak on a given day.
+
+    Args:
+        habits (Sequence[Habit]): List of Habit objects.
+        day (datetime.date): The day to evaluate.
+
+    Returns:
+        List[Tuple[str, int]]: Habit name and streak, in input order.
+    """
+    return [(habit.name, streak_as_of(habit, day)) for habit in habits]
+
 #MISSED DAYS ANALYSIS
 
 def get_missed_days(habit: Habit) -> List[datetime.date]:
@@ -102,24 +205,326 @@ def get_missed_days(habit: Habit) -> List[datetime.date]:
          ( For weekly habits, this is the start date of the missed week).
     """
     
-    today = datetime.date.today()
-    expected_dates = []
-    missed = []
-    
+    return habit.missed_periods(datetime.date.today())
+
+#BATCH ANALYTICS
+
+def _success_rate(habit: Habit, today: datetime.date) -> float:
+    """
+    Completion rate of one habit since creation, as a percentage.
+    """
     if habit.periodicity == "daily":
-        delta = (today - habit.creation_date).days
-        expected_dates = [habit.creation_date + datetime.timedelta(days=i) for i in range(delta + 1)]
+        total_periods = (today - habit.creation_date).days + 1
     elif habit.periodicity == "weekly":
-        delta = (today -habit.creation_date).days // 7
-        expected_dates = [habit.creation_date + datetime.timedelta(weeks=i) for i in range(delta + 1)]
-    
-    for expected_date in expected_dates:
-        if expected_date not in habit.completion_dates:
-            missed.append(expected_date)
+        total_periods = ((today - habit.creation_date).days // 7) + 1
+    else:
+        total_periods = 1
+
+    return (habit.completion_count /total_periods) * 100 if total_periods > 0 else 0.0
+
+def _streak_runs(habit: Habit) -> List[int]:
+    """
+    Splits a habit's history into streak runs using the Habit.update_streak() gap rule.
+
+    Returns:
+        List[int]: Length of every run, oldest first.
+    """
+    return _day_runs(habit.completions, habit.periodicity)
 
-    return missed
+def _day_runs(days: Iterable[datetime.date], periodicity: str) -> List[int]:
+    """
+    Splits ascending completion days into streak runs using the Habit.update_streak() gap rule.
+    """
+    gap_days = 1 if periodicity == "daily" else 7
+    runs = []
+    previous = None
+    for day in days:
+        gap = (day - previous).days if previous is not None else None
+        if gap is None or gap > gap_days:
+            runs.append(1)
+        elif gap == gap_days:
+            runs[-1] += 1
+        previous = day
+    return runs
+
+def success_rates(habits: Sequence[Habit], today: Optional[datetime.date] = None) -> List[float]:
+    """
+    Calculates each habit's success rate since creation.
+
+    Args:
+        habits (Sequence[Habit]): List of Habit objects.
+        today (Optional[datetime.date]): Evaluation date. Defaults to today.
+
+    Returns:
+        List[float]: Completion rate per habit as a percentage, in input order.
+    """
+    today = today or datetime.date.today()
+    if _BACKEND == "numpy":
+        import analysis_numpy
+        return analysis_numpy.success_rates(habits, today)
+    return [_success_rate(habit, today) for habit in habits]
+
+def missed_days_report(habits: Sequence[Habit],
+                       today: Optional[datetime.date] = None) -> List[List[datetime.date]]:
+    """
+    Runs get_missed_days for many habits at once.
+
+    Args:
+        habits (Sequence[Habit]): List of Habit objects.
+        today (Optional[datetime.date]): Evaluation date. Defaults to today.
+
+    Returns:
+        List[List[datetime.date]]: Missed periods per habit, in input order.
+    """
+    today = today or datetime.date.today()
+    if _BACKEND == "numpy":
+        import analysis_numpy
+        return analysis_numpy.missed_days(habits, today)
+    return [habit.missed_periods(today) for habit in habits]
+
+def current_streaks(habits: Sequence[Habit], today: Optional[datetime.date] = None) -> List[int]:
+    """
+    Recomputes each habit's current streak from its completion history.
 
+    Args:
+        habits (Sequence[Habit]): List of Habit objects.
+        today (Optional[datetime.date]): Evaluation date. Defaults to today.
+
+    Returns:
+        List[int]: Streak per habit, as Habit.update_streak(today) would set it.
+    """
+    today = today or datetime.date.today()
+    if _BACKEND == "numpy":
+        import analysis_numpy
+        return analysis_numpy.current_streaks(habits, today)
+    return [_current_run(habit, today) for habit in habits]
 
- 
+def _current_run(habit: Habit, today: datetime.date) -> int:
+    """
+    Returns the last streak run of a habit, or 0 if it lapsed before ``today``.
+    """
+    last = habit.completions.last()
+    gap_days = 1 if habit.periodicity == "daily" else 7
+    if last is None or (today - last).days > gap_days:
+        return 0
+    return _streak_runs(habit)[-1]
 
-  
\ No newline at end of file
+def longest_streaks(habits: Sequence[Habit]) -> List[int]:
+    """
+    Finds the longest streak each habit has ever reached.
+
+    Args:
+        habits (Sequence[Habit]): List of Habit objects.
+
+    Returns:
+        List[int]: Longest historical streak per habit, in input order.
+    """
+    if _BACKEND == "numpy":
+        import analysis_numpy
+        return analysis_numpy.longest_streaks(habits)
+    return [max(_streak_runs(habit), default=0) for habit in habits]
+
+#WINDOWED ANALYTICS
+
+class WindowReport(NamedTuple):
+    """
+    A habit's results between two dates, from window_reports() or window_reports_from_db().
+
+    Attributes:
+        id (Optional[int]): Habit ID.
+        name (str): Habit name.
+        completions (int): Completed days inside the window.
+        expected_periods (int): Days (daily) or weekly anniversaries of creation_date
+            (weekly) inside the window and not before creation.
+        success_rate (float): completions / expected_periods as a percentage.
+        missed_days (List[datetime.date]): Expected periods without a completion.
+        longest_streak (int): Longest streak formed by the completions inside the window.
+    """
+    id: Optional[int]
+    name: str
+    completions: int
+    expected_periods: int
+    success_rate: float
+    missed_days: List[datetime.date]
+    longest_streak: int
+
+def _check_window(start: datetime.date, end: datetime.date):
+    if start > end:
+        raise ValueError(f"Window start {start} is after its end {end}")
+
+def _window_report(id: Optional[int], name: str, periodicity: str, creation_date: datetime.date,
+                   days: List[datetime.date], start: datetime.date, end: datetime.date) -> WindowReport:
+    """
+    Computes a WindowReport from the completed days inside the window.
+
+    Over the whole history (start <= creation_date, end = today) the success
+    rate and missed days equal those of the unwindowed functions.
+    """
+    if periodicity in ("daily", "weekly"):
+        step = 1 if periodicity == "daily" else 7
+        # First period that starts inside the window.
+        lag = max((start - creation_date).days, 0)
+        first = creation_date.toordinal() + -(-lag // step) * step
+        expected = range(first, end.toordinal() + 1, step)
+        completed = {day.toordinal() for day in days}
+        missed = [datetime.date.fromordinal(ordinal) for ordinal in expected if ordinal not in completed]
+        expected_periods = len(expected)
+    else:
+        missed, expected_periods = [], 1
+    rate = len(days) / expected_periods * 100 if expected_periods > 0 else 0.0
+    return WindowReport(id, name, len(days), expected_periods, rate, missed,
+                        max(_day_runs(days, periodicity), default=0))
+
+def window_report(habit: Habit, start: datetime.date, end: datetime.date) -> WindowReport:
+    """
+    Computes a habit's success rate, missed days and longest streak between two dates.
+
+    Only the completions inside the window are visited (found by binary
+    search in the habit's streak_index).
+
+    Args:
+        habit (Habit): The habit to analyze.
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window (inclusive).
+
+    Returns:
+        WindowReport: The habit's results inside the window.
+    """
+    _check_window(start, end)
+    return _window_report(habit.id, habit.name, habit.periodicity, habit.creation_date,
+                          habit.streak_index.days_between(start, end), start, end)
+
+def window_reports(habits: Sequence[Habit], start: datetime.date, end: datetime.date) -> List[WindowReport]:
+    """
+    Runs window_report for many habits, skipping habits created after ``end``.
+
+    Args:
+        habits (Sequence[Habit]): List of Habit objects.
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window (inclusive).
+
+    Returns:
+        List[WindowReport]: One report per habit, in input order.
+    """
+    return [window_report(habit, start, end) for habit in habits if habit.creation_date <= end]
+
+def calculate_average_success_rate_in_window(habits: Sequence[Habit], start: datetime.date,
+                                             end: datetime.date) -> float:
+    """
+    Calculates the average success rate between two dates, e.g. over the last 30 days.
+
+    Args:
+        habits (Sequence[Habit]): List of Habit objects. Habits created after ``end`` are left out.
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window (inclusive).
+
+    Returns:
+        float: Average completion rate as a percentage (rounded to 2 decimal places).
+    """
+    return _average_rate(window_reports(habits, start, end))
+
+def get_missed_days_in_window(habit: Habit, start: datetime.date, end: datetime.date) -> List[datetime.date]:
+    """
+    Identifies the missed periods (days or weeks) between two dates.
+
+    Args:
+        habit (Habit): The habit to analyze.
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window (inclusive).
+
+    Returns:
+        List[datetime.date]: Dates of missed periods, as get_missed_days() reports them.
+    """
+    return window_report(habit, start, end).missed_days
+
+def longest_streak_in_window(habit: Habit, start: datetime.date, end: datetime.date) -> int:
+    """
+    Returns the longest streak formed by a habit's completions between two dates.
+
+    Args:
+        habit (Habit): The habit to analyze.
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window (inclusive).
+
+    Returns:
+        int: Longest streak inside the window.
+    """
+    return window_report(habit, start, end).longest_streak
+
+def window_reports_from_db(db: DatabaseConnector, start: datetime.date, end: datetime.date,
+                           periodicity: Optional[str] = None) -> List[WindowReport]:
+    """
+    Computes window reports from the completions stored inside the window only.
+
+    Args:
+        db (DatabaseConnector): Connector of the database to analyze.
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window (inclusive).
+        periodicity (Optional[str]): Only habits with this periodicity.
+
+    Returns:
+        List[WindowReport]: Same reports as window_reports(db.get_all_habits(), start, end), in ID order.
+    """
+    _check_window(start, end)
+    return [_window_report(window.id, window.name, window.periodicity, window.creation_date, window.days, start, end)
+            for window in db.habit_windows(start, end, periodicity)]
+
+def average_success_rate_in_window_from_db(db: DatabaseConnector, start: datetime.date, end: datetime.date) -> float:
+    """
+    Calculates the average success rate between two dates from the stored completions inside the window.
+
+    Args:
+        db (DatabaseConnector): Connector of the database to analyze.
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window (inclusive).
+
+    Returns:
+        float: Same value as calculate_average_success_rate_in_window(db.get_all_habits(), start, end).
+    """
+    return _average_rate(window_reports_from_db(db, start, end))
+
+def _average_rate(reports: List[WindowReport]) -> float:
+    if not reports:
+        return 0.0
+    return round(sum(report.success_rate for report in reports) / len(reports), 2)
+
+#DATABASE-BACKED REPORTS
+
+def average_success_rate_from_db(db: DatabaseConnector) -> float:
+    """
+    Calculates the average success rate inside SQLite, without loading Habit objects.
+
+    Args:
+        db (DatabaseConnector): Connector of the database to analyze.
+
+    Returns:
+        float: Same value as calculate_average_success_rate(db.get_all_habits()).
+    """
+    rates = list(db.success_rates().values())
+    if not rates:
+        return 0.0
+    return round(sum(rates) / len(rates), 2)
+
+def longest_streak_from_db(db: DatabaseConnector) -> Tuple[str, int]:
+    """
+    Finds the habit with the longest currently active streak inside SQLite.
+
+    Args:
+        db (DatabaseConnector): Connector of the database to analyze.
+
+    Returns:
+        Tuple[str, int]: Same value as find_longest_streak(db.get_all_habits()).
+    """
+    return db.top_current_streak() or ("None", 0)
+
+def longest_ever_streak_from_db(db: DatabaseConnector) -> Tuple[str, int]:
+    """
+    Finds the habit with the longest streak ever reached, from the stored habit statistics.
+
+    Args:
+        db (DatabaseConnector): Connector of the database to analyze.
+
+    Returns:
+        Tuple[str, int]: Same value as find_longest_ever_streak(db.get_all_habits()).
+    """
+    return db.top_longest_streak() or ("None", 0)
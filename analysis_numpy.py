@@ -0,0 +1,174 @@
+"""
+analysis_numpy.py
+
+Purpose: Vectorized implementations of the batch analytics in analysis.py.
+
+Habits are flattened into a ragged CSR layout: one sorted array of
+completion day ordinals for all habits, plus ``indptr`` offsets marking
+where each habit's slice begins. Every function returns exactly what the
+pure-Python implementation in analysis.py returns for the same input.
+
+NumPy is optional; use available() before calling anything else, or go
+through analysis.set_backend("numpy") which falls back automatically.
+"""
+import datetime
+from typing import List, Sequence
+
+from habit import Habit
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+
+def available() -> bool:
+    """
+    Returns True if NumPy could be imported.
+    """
+    return np is not None
+
+
+class _HabitArrays:
+    """
+    Column arrays for a batch of habits.
+
+    Attributes:
+        days: Completion day ordinals of all habits, ascending within each habit.
+        rows: Index of the owning habit for every entry in ``days``.
+        indptr: Start offset of each habit's slice in ``days`` (length habits + 1).
+        counts: Number of completions per habit.
+        creation: Creation date ordinal per habit.
+        step: Days per period (1 daily, 7 weekly, 0 for anything else).
+        gap_days: Streak gap per habit, as used by Habit.update_streak().
+    """
+
+    def __init__(self, habits: Sequence[Habit]):
+        chunks = []
+        for habit in habits:
+            bitmap = habit.completions
+            bits = np.unpackbits(np.frombuffer(bitmap.as_bytes(), dtype=np.uint8), bitorder="little")
+            chunks.append(np.flatnonzero(bits).astype(np.int64) + bitmap.origin.toordinal())
+
+        self.counts = np.array([len(chunk) for chunk in chunks], dtype=np.int64)
+        self.indptr = np.concatenate(([0], np.cumsum(self.counts)))
+        self.days = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+        self.rows = np.repeat(np.arange(len(habits)), self.counts)
+        self.creation = np.array([h.creation_date.toordinal() for h in habits], dtype=np.int64)
+        periodicity = [h.periodicity for h in habits]
+        self.step = np.array([1 if p == "daily" else 7 if p == "weekly" else 0 for p in periodicity], dtype=np.int64)
+        self.gap_days = np.where(self.step == 1, 1, 7)
+
+
+def success_rates(habits: Sequence[Habit], today: datetime.date) -> List[float]:
+    """
+    Computes each habit's completion rate since creation, as a percentage.
+
+    Args:
+        habits (Sequence[Habit]): Habits to analyze.
+        today (datetime.date): Evaluation date.
+
+    Returns:
+        List[float]: One rate per habit, in input order.
+    """
+    arrays = _HabitArrays(habits)
+    delta = today.toordinal() - arrays.creation
+    total = np.where(arrays.step == 1, delta + 1, np.where(arrays.step == 7, delta // 7 + 1, 1))
+    rates = np.zeros(len(habits), dtype=np.float64)
+    np.divide(arrays.counts, total, out=rates, where=total > 0)
+    return (rates * 100).tolist()
+
+
+def missed_days(habits: Sequence[Habit], today: datetime.date) -> List[List[datetime.date]]:
+    """
+    Lists the missed periods of each habit since creation.
+
+    Args:
+        habits (Sequence[Habit]): Habits to analyze.
+        today (datetime.date): Evaluation date.
+
+    Returns:
+        List[List[datetime.date]]: Missed days per habit, in input order.
+    """
+    if not habits:
+        return []
+    arrays = _HabitArrays(habits)
+    delta = today.toordinal() - arrays.creation
+    expected_counts = np.where(arrays.step > 0, delta // np.maximum(arrays.step, 1) + 1, 0)
+    expected_counts = np.maximum(expected_counts, 0)
+
+    rows = np.repeat(np.arange(len(habits)), expected_counts)
+    position = np.arange(len(rows)) - np.repeat(np.cumsum(expected_counts) - expected_counts, expected_counts)
+    expected = arrays.creation[rows] + arrays.step[rows] * position
+
+    # Day ordinals stay below 2**22, so (row, day) packs into one sortable int64 key.
+    key_scale = 1 << 32
+    completed = np.isin(rows * key_scale + expected, arrays.rows * key_scale + arrays.days, assume_unique=True)
+    missed_rows = rows[~completed]
+    missed = expected[~completed]
+
+    per_habit = np.split(missed, np.searchsorted(missed_rows, np.arange(1, len(habits))))
+    return [[datetime.date.fromordinal(int(o)) for o in chunk] for chunk in per_habit]
+
+
+def _runs(arrays: _HabitArrays):
+    """
+    Splits every habit's completions into streak runs.
+
+    Returns:
+        tuple: (run length per run, habit row per run, index of each habit's last run).
+    """
+    days, rows = arrays.days, arrays.rows
+    if len(days) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(len(arrays.counts), dtype=np.int64)
+
+    gaps = np.diff(days)
+    same_row = rows[1:] == rows[:-1]
+    gap_days = arrays.gap_days[rows[1:]]
+    breaks = ~same_row | (gaps > gap_days)
+    extends = same_row & (gaps == gap_days)
+
+    run_start = np.concatenate(([True], breaks))
+    run_id = np.cumsum(run_start) - 1
+    run_lengths = np.bincount(run_id[1:][extends], minlength=run_id[-1] + 1) + 1
+    run_rows = rows[run_start]
+    last_run = run_id[np.clip(arrays.indptr[1:] - 1, 0, len(days) - 1)]
+    return run_lengths, run_rows, last_run
+
+
+def current_streaks(habits: Sequence[Habit], today: datetime.date) -> List[int]:
+    """
+    Recomputes each habit's streak from its history, matching Habit.update_streak(today).
+
+    Args:
+        habits (Sequence[Habit]): Habits to analyze.
+        today (datetime.date): Evaluation date.
+
+    Returns:
+        List[int]: One streak per habit, in input order.
+    """
+    arrays = _HabitArrays(habits)
+    run_lengths, _, last_run = _runs(arrays)
+    if len(run_lengths) == 0:
+        return [0] * len(habits)
+    last_day = arrays.days[np.clip(arrays.indptr[1:] - 1, 0, len(arrays.days) - 1)]
+    running = (arrays.counts > 0) & (today.toordinal() - last_day <= arrays.gap_days)
+    return np.where(running, run_lengths[last_run], 0).tolist()
+
+
+def longest_streaks(habits: Sequence[Habit]) -> List[int]:
+    """
+    Finds the longest streak each habit has ever reached.
+
+    Args:
+        habits (Sequence[Habit]): Habits to analyze.
+
+    Returns:
+        List[int]: One streak per habit, in input order.
+    """
+    arrays = _HabitArrays(habits)
+    run_lengths, run_rows, _ = _runs(arrays)
+    longest = np.zeros(len(habits), dtype=np.int64)
+    np.maximum.at(longest, run_rows, run_lengths)
+    return longest.tolist()
@@ -0,0 +1,209 @@
+"""
+analytics_cache.py
+
+Purpose: Memoized per-habit analytics that survive between runs.
+
+A habit's report row (success rate, missed days, current and longest
+streak) only changes when the habit is written or when the day rolls
+over. AnalyticsCache stores rows under (habit id, habit version, today);
+DatabaseConnector raises the version on every write to a habit, so a
+stale row is simply never looked up again and ages out of the LRU.
+Those keys are only unique within one database, so a cache is bound to
+a DatabaseConnector.database_id() and emptied when used with another.
+
+    cache = AnalyticsCache.load("analytics.cache")
+    rows = cached_report(db, cache)
+    cache.save("analytics.cache")
+
+Cache files are pickles: only load files this tracker wrote.
+"""
+import datetime
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from db import DatabaseConnector
+from parallel_reports import HabitReport, habit_reports
+
+# Bumped when the layout of saved cache files changes; other files are ignored.
+_FILE_FORMAT = 2
+
+CacheKey = Tuple[int, int, datetime.date]
+
+class AnalyticsCache:
+    """
+    Size-bounded LRU map from (habit id, version, today) to analytics results.
+
+    All methods are safe to call from several threads.
+
+    Attributes:
+        max_size (int): Maximum number of cached entries.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to be computed.
+        database_id (Optional[str]): ID of the database the entries belong to,
+            or None while the cache is not bound to one.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_size (int): Maximum number of cached entries.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.database_id: Optional[str] = None
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """
+        Looks up an entry and records a hit or miss.
+
+        Args:
+            key (Hashable): Usually a CacheKey.
+
+        Returns:
+            Optional[object]: The cached value, or None on a miss.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: object):
+        """
+        Stores an entry, evicting the least recently used one if full.
+
+        Args:
+            key (Hashable): Usually a CacheKey.
+            value (object): The result to cache (not None).
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def bind(self, database_id: str):
+        """
+        Ties the cache to a database, dropping the entries of any other one.
+
+        Args:
+            database_id (str): DatabaseConnector.database_id() of the database about to be read.
+        """
+        with self._lock:
+            if self.database_id != database_id:
+                self._entries.clear()
+                self.database_id = database_id
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the size, capacity and hit/miss counters.
+        """
+        return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+    def save(self, path: str):
+        """
+        Writes the entries, least recently used first, to a file.
+
+        The file is replaced atomically, so a crash never leaves a torn cache behind.
+
+        Args:
+            path (str): Destination file.
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+            database_id = self.database_id
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as stream:
+            pickle.dump({"format": _FILE_FORMAT, "database_id": database_id, "entries": entries}, stream,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, max_size: int = 100_000, database_id: Optional[str] = None) -> "AnalyticsCache":
+        """
+        Reads a cache written by save().
+
+        A missing, unreadable or outdated file, one whose classes no longer
+        import, or one saved for another database yields an empty cache, as
+        every entry can be recomputed.
+
+        Args:
+            path (str): File written by save().
+            max_size (int): Maximum number of entries; the most recently used ones are kept.
+            database_id (Optional[str]): Only keep entries saved for this
+                DatabaseConnector.database_id(). Defaults to any database.
+
+        Returns:
+            AnalyticsCache: The loaded cache.
+        """
+        cache = cls(max_size)
+        cache.database_id = database_id
+        try:
+            with open(path, "rb") as stream:
+                data = pickle.load(stream)
+        # Renamed or removed classes surface as AttributeError or ImportError (ModuleNotFoundError).
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError, AttributeError, ImportError):
+            return cache
+        if not isinstance(data, dict) or data.get("format") != _FILE_FORMAT:
+            return cache
+        if database_id is not None and data.get("database_id") != database_id:
+            return cache
+        cache.database_id = data.get("database_id")
+        for key, value in data["entries"][-max_size:]:
+            cache._entries[key] = value
+        return cache
+
+def cached_report(db: DatabaseConnector, cache: AnalyticsCache,
+                  today: Optional[datetime.date] = None) -> List[HabitReport]:
+    """
+    Computes the same rows as parallel_reports.serial_report(), reusing cached rows.
+
+    Only the versions of all habits are read; habits without a cached row
+    for their current version and ``today`` are loaded and recomputed.
+    A cache holding rows of another database is emptied first.
+
+    Args:
+        db (DatabaseConnector): Connector of the database to analyze.
+        cache (AnalyticsCache): Cache to read from and fill.
+        today (Optional[datetime.date]): Evaluation date. Defaults to today.
+
+    Returns:
+        List[HabitReport]: One row per habit, in ID order.
+    """
+    today = today or datetime.date.today()
+    cache.bind(db.database_id())
+    keys: List[CacheKey] = [(habit_id, version, today) for habit_id, version in db.habit_versions()]
+    rows = [cache.get(key) for key in keys]
+
+    stale = {key[0]: index for index, (key, row) in enumerate(zip(keys, rows)) if row is None}
+    if stale:
+        habits = db.load_habits_by_ids(stale)
+        for habit, row in zip(habits, habit_reports(habits, today)):
+            index = stale[habit.id]
+            rows[index] = row
+            cache.put(keys[index], row)
+    # A habit deleted after its version was read has no row.
+    return [row for row in rows if row is not None]
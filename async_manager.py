@@ -0,0 +1,125 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import partial
+from typing import Callable, List, Tuple, TypeVar, Union
+
+import analysis
+from db import DatabaseConnector, StorageProfile
+from habit import Habit
+from habit_manager import HabitManager
+
+T = TypeVar("T")
+
+class AsyncHabitManager:
+    """
+    Asyncio facade over HabitManager for use inside async services.
+
+    Every call is run on a bounded thread pool. Each worker thread opens its
+    own DatabaseConnector on first use, since a sqlite3 connection must stay
+    on the thread that created it, so concurrent check-ins never block the
+    event loop and never share a connection.
+
+    Example:
+        async with AsyncHabitManager("habits.db", max_workers=8) as manager:
+            await manager.complete_habit(1)
+    """
+
+    def __init__(self, db_path: str = "habits.db", max_workers: int = 4,
+                 profile: Union[str, StorageProfile] = "fast"):
+        """
+        Initializes the worker pool. Connections are opened lazily per worker.
+
+        Args:
+            db_path (str): Path to the SQLite database file. ':memory:' is not
+                supported because every worker would see its own empty database.
+            max_workers (int): Maximum number of worker threads (and connections).
+            profile (Union[str, StorageProfile]): Storage profile for the worker
+                connections; WAL ('fast' or 'durable') lets readers run during writes.
+        """
+        if db_path == ":memory:":
+            raise ValueError("AsyncHabitManager needs a file-backed database")
+        self.db_path = db_path
+        self.profile = profile
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="habit-db")
+        self._local = threading.local()
+        self._connectors: List[DatabaseConnector] = []
+        self._connectors_lock = threading.Lock()
+
+    def _manager(self) -> HabitManager:
+        """
+        Returns the calling worker thread's HabitManager, creating it on first use.
+        """
+        manager = getattr(self._local, "manager", None)
+        if manager is None:
+            # Used only by this worker; check_same_thread is relaxed so close() can run elsewhere.
+            db = DatabaseConnector(self.db_path, profile=self.profile, check_same_thread=False)
+            with self._connectors_lock:
+                self._connectors.append(db)
+            manager = self._local.manager = HabitManager(db)
+        return manager
+
+    async def _run(self, work: Callable[[HabitManager], T]) -> T:
+        """
+        Runs ``work(manager)`` on a worker thread and awaits its result.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: work(self._manager()))
+
+    async def create_habit(self, name: str, periodicity: str) -> Habit:
+        """Async version of HabitManager.create_habit."""
+        return await self._run(lambda m: m.create_habit(name, periodicity))
+
+    async def complete_habit(self, habit_id: int) -> bool:
+        """Async version of HabitManager.complete_habit."""
+        return await self._run(lambda m: m.complete_habit(habit_id))
+
+    async def delete_habit(self, habit_id: int) -> bool:
+        """Async version of HabitManager.delete_habit."""
+        return await self._run(lambda m: m.delete_habit(habit_id))
+
+    async def list_habits(self) -> List[Habit]:
+        """Async version of HabitManager.list_habits."""
+        return await self._run(lambda m: m.list_habits())
+
+    async def list_by_periodicity(self, periodicity: str) -> List[Habit]:
+        """Async version of HabitManager.list_by_periodicity."""
+        return await self._run(lambda m: m.list_by_periodicity(periodicity))
+
+    async def average_success_rate(self) -> float:
+        """Async version of analysis.average_success_rate_from_db."""
+        return await self._run(lambda m: analysis.average_success_rate_from_db(m.db))
+
+    async def longest_streak(self) -> Tuple[str, int]:
+        """Async version of analysis.longest_streak_from_db."""
+        return await self._run(lambda m: analysis.longest_streak_from_db(m.db))
+
+    async def missed_days(self, habit_id: int) -> List[date]:
+        """
+        Async version of analysis.get_missed_days for one stored habit.
+
+        Returns:
+            List[date]: Missed periods, or an empty list if the habit does not exist.
+        """
+        def work(manager: HabitManager) -> List[date]:
+            habit = manager.db.get_habit_by_id(habit_id)
+            return analysis.get_missed_days(habit) if habit else []
+        return await self._run(work)
+
+    async def close(self):
+        """
+        Waits for running calls, stops the workers and closes their connections.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self._executor.shutdown, wait=True))
+        with self._connectors_lock:
+            for db in self._connectors:
+                db.close()
+            self._connectors.clear()
+
+    async def __aenter__(self) -> "AsyncHabitManager":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
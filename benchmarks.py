@@ -0,0 +1,599 @@
+"""
+benchmarks.py
+
+Purpose: Small, dependency-free benchmarks for the Digital Detox Tracker
+storage layer. Run ``python benchmarks.py --help`` to list them.
+
+``python benchmarks.py suite`` times the main storage, streak and analytics
+paths over a grid of dataset sizes, writes the timings as JSON and can
+compare them with a stored baseline:
+
+    python benchmarks.py suite --output baseline.json
+    python benchmarks.py suite --baseline baseline.json --threshold 0.25
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+import analysis
+from async_manager import AsyncHabitManager
+from connection_pool import PooledDatabaseConnector
+from example_data import populate_database
+from parallel_reports import parallel_report, serial_report
+from db import STORAGE_PROFILES, DatabaseConnector
+from completion_bitmap import CompletionBitmap
+from habit import Habit
+from habit_manager import HabitManager
+
+
+def _fresh_db_path(directory: str, name: str) -> str:
+    """
+    Returns a database path inside ``directory`` with no leftover files.
+    """
+    path = os.path.join(directory, f"{name}.db")
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return path
+
+
+def bench_storage_profiles(operations: int = 500, directory: str = None) -> List[Dict[str, object]]:
+    """
+    Measures check-in write throughput for every storage profile.
+
+    Each profile records ``operations`` completions twice on a file-backed
+    database: once committing every check-in, and once inside a single
+    DatabaseConnector.transaction().
+
+    Args:
+        operations (int): Number of check-ins per run.
+        directory (str, optional): Where to create the databases. Defaults to a temporary directory.
+
+    Returns:
+        List[Dict[str, object]]: One row per profile with writes per second for both modes.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = directory or tmp
+        for name in STORAGE_PROFILES:
+            db = DatabaseConnector(_fresh_db_path(directory, f"profile_{name}"), profile=name)
+            start_day = date.today() - timedelta(days=2 * operations)
+            habit = Habit("Benchmark", "daily", creation_date=start_day)
+            db.save_habit(habit)
+
+            started = time.perf_counter()
+            for offset in range(operations):
+                day = start_day + timedelta(days=offset)
+                habit.completions.add(day)
+                db.add_completion(habit, day)
+            autocommit = operations / (time.perf_counter() - started)
+
+            started = time.perf_counter()
+            with db.transaction():
+                for offset in range(operations, 2 * operations):
+                    day = start_day + timedelta(days=offset)
+                    habit.completions.add(day)
+                    db.add_completion(habit, day)
+            batched = operations / (time.perf_counter() - started)
+
+            db.close()
+            results.append({"profile": name, "autocommit_per_s": round(autocommit), "transaction_per_s": round(batched)})
+    return results
+
+
+def bench_async_checkins(habits: int = 2000, concurrency_levels=(1, 2, 4, 8), directory: str = None) -> List[Dict[str, object]]:
+    """
+    Load test for AsyncHabitManager: completions per second at several concurrency levels.
+
+    For every level a fresh database with ``habits`` habits is created and all
+    of them are checked in concurrently through a pool of that many workers.
+
+    Args:
+        habits (int): Number of habits (and check-ins) per level.
+        concurrency_levels: Worker counts to measure.
+        directory (str, optional): Where to create the databases. Defaults to a temporary directory.
+
+    Returns:
+        List[Dict[str, object]]: One row per level with completions per second.
+    """
+    async def check_in_all(path: str, workers: int, ids: List[int]) -> float:
+        async with AsyncHabitManager(path, max_workers=workers) as manager:
+            started = time.perf_counter()
+            results = await asyncio.gather(*(manager.complete_habit(habit_id) for habit_id in ids))
+            elapsed = time.perf_counter() - started
+        if not all(results):
+            raise RuntimeError("some check-ins were not recorded")
+        return len(ids) / elapsed
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = directory or tmp
+        for workers in concurrency_levels:
+            path = _fresh_db_path(directory, f"async_{workers}")
+            db = DatabaseConnector(path, profile="fast")
+            seeded = [Habit(f"Load {i}", "daily") for i in range(habits)]
+            db.save_habits(seeded)
+            db.close()
+            rate = asyncio.run(check_in_all(path, workers, [h.id for h in seeded]))
+            results.append({"workers": workers, "completions_per_s": round(rate)})
+    return results
+
+
+def bench_pooled_reads(habits: int = 2000, queries: int = 50, thread_counts=(1, 2, 4, 8),
+                       directory: str = None) -> List[Dict[str, object]]:
+    """
+    Read throughput of PooledDatabaseConnector: analytics queries per second by thread count.
+
+    Every thread runs ``queries`` success-rate reports over a database with
+    ``habits`` habits and 30 days of history each, sharing one connector
+    whose reader pool has as many connections as there are threads. The
+    total stays roughly flat as threads are added, since the Python side of
+    each report holds the GIL; the wait counters show that no thread queues
+    for a reader connection.
+
+    Args:
+        habits (int): Number of habits in the database.
+        queries (int): Reports run by each thread.
+        thread_counts: Thread counts to measure.
+        directory (str, optional): Where to create the database. Defaults to a temporary directory.
+
+    Returns:
+        List[Dict[str, object]]: One row per thread count with queries per second and pool wait counters.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _fresh_db_path(directory or tmp, "pool")
+        seeder = DatabaseConnector(path, profile="fast")
+        start_day = date.today() - timedelta(days=30)
+        seeded = []
+        for i in range(habits):
+            habit = Habit(f"Pool {i}", "daily", creation_date=start_day)
+            habit.completion_dates = [start_day + timedelta(days=d) for d in range(0, 30, 1 + i % 3)]
+            habit.update_streak()
+            seeded.append(habit)
+        seeder.save_habits(seeded)
+        seeder.close()
+
+        for threads in thread_counts:
+            db = PooledDatabaseConnector(path, pool_size=threads)
+
+            def worker():
+                for _ in range(queries):
+                    db.success_rates()
+
+            workers = [threading.Thread(target=worker) for _ in range(threads)]
+            started = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            stats = db.pool_stats()["readers"]
+            db.close()
+            results.append({"threads": threads, "queries_per_s": round(threads * queries / elapsed),
+                            "waits": stats["waits"], "max_wait_ms": round(stats["max_wait"] * 1000, 2)})
+    return results
+
+
+def bench_parallel_reports(habits: int = 20_000, history_days: int = 365, worker_counts=(1, 2, 4),
+                           chunk_size: int = 2000, directory: str = None) -> List[Dict[str, object]]:
+    """
+    Time of a full per-habit report by worker process count.
+
+    Workers 0 is the serial in-process report; every parallel report is
+    checked to equal it.
+
+    Args:
+        habits (int): Number of generated habits.
+        history_days (int): Longest history a habit can have.
+        worker_counts: Worker process counts to measure.
+        chunk_size (int): Habits per worker task.
+        directory (str, optional): Where to create the database. Defaults to a temporary directory.
+
+    Returns:
+        List[Dict[str, object]]: One row per worker count with the report time in seconds.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _fresh_db_path(directory or tmp, "parallel")
+        db = DatabaseConnector(path, profile="fast")
+        populate_database(db, habits, seed=1, history_days=history_days)
+        today = date.today()
+        started = time.perf_counter()
+        expected = serial_report(db, today)
+        results.append({"workers": 0, "seconds": round(time.perf_counter() - started, 3)})
+        db.close()
+
+        for workers in worker_counts:
+            started = time.perf_counter()
+            report = parallel_report(path, workers, chunk_size, today)
+            elapsed = time.perf_counter() - started
+            if report != expected:
+                raise AssertionError(f"parallel report with {workers} workers differs from the serial one")
+            results.append({"workers": workers, "seconds": round(elapsed, 3)})
+    return results
+
+
+class _ListHabit:
+    """
+    The original Habit layout: a per-instance __dict__ and a list of date objects.
+    Only used as the "before" reference of bench_habit_memory().
+    """
+
+    def __init__(self, name: str, periodicity: str, creation_date: date, id: int):
+        self.id = id
+        self.name = name
+        self.periodicity = periodicity
+        self.creation_date = creation_date
+        self.completion_dates: List[date] = []
+        self.current_streak = 0
+
+
+def _traced_bytes(build) -> int:
+    """
+    Returns the bytes still allocated by ``build()`` while its result is alive.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def bench_habit_memory(totals=(10_000, 100_000, 1_000_000), per_habit: int = 100) -> List[Dict[str, object]]:
+    """
+    Measures in-memory bytes per habit with tracemalloc for three layouts:
+    the original list-of-dates class, the slotted Habit with a decoded
+    CompletionBitmap, and a Habit loaded from the database whose history
+    is still an undecoded blob.
+
+    Every habit is daily and completed on ``per_habit`` of its first
+    ``2 * per_habit`` days, so each total is split over ``total // per_habit`` habits.
+
+    Args:
+        totals: Total completion counts to measure.
+        per_habit (int): Completions per habit.
+
+    Returns:
+        List[Dict[str, object]]: One row per total with bytes per habit for each layout.
+    """
+    start_day = date.today() - timedelta(days=2 * per_habit)
+    # Shared by all layouts so the measurement only covers per-habit storage.
+    days = [start_day + timedelta(days=2 * offset) for offset in range(per_habit)]
+    blob = CompletionBitmap(start_day, days).to_bytes()
+
+    def list_habits(count: int) -> list:
+        habits = []
+        for i in range(count):
+            habit = _ListHabit(f"Habit {i}", "daily", start_day, i)
+            # Fresh date objects, as parsing each stored day used to produce.
+            habit.completion_dates = [date.fromordinal(d.toordinal()) for d in days]
+            habits.append(habit)
+        return habits
+
+    def bitmap_habits(count: int) -> list:
+        habits = []
+        for i in range(count):
+            habit = Habit(f"Habit {i}", "daily", creation_date=start_day, id=i)
+            habit.completions = CompletionBitmap(start_day, days)
+            habits.append(habit)
+        return habits
+
+    def lazy_habits(count: int) -> list:
+        habits = []
+        for i in range(count):
+            habit = Habit(f"Habit {i}", "daily", creation_date=start_day, id=i)
+            habit.load_completions_from(bytes(blob))
+            habits.append(habit)
+        return habits
+
+    results = []
+    for total in totals:
+        count = max(1, total // per_habit)
+        row = {"completions": total, "habits": count}
+        for name, build in (("list", list_habits), ("bitmap", bitmap_habits), ("lazy", lazy_habits)):
+            row[f"{name}_bytes_per_habit"] = round(_traced_bytes(lambda: build(count)) / count)
+        results.append(row)
+    return results
+
+
+def _suite_habits(count: int, history_days: int, weekly_share: float, seed: int = 0) -> List[Habit]:
+    """
+    Builds ``count`` habits created ``history_days`` ago, completed on about
+    80% of their expected days. The same seed always gives the same habits.
+    """
+    rng = random.Random(seed)
+    start_day = date.today() - timedelta(days=history_days)
+    habits = []
+    for i in range(count):
+        weekly = rng.random() < weekly_share
+        habit = Habit(f"Suite {i}", "weekly" if weekly else "daily", creation_date=start_day)
+        step = 7 if weekly else 1
+        # Today is left open so complete_habit() records a new check-in.
+        habit.completion_dates = [start_day + timedelta(days=offset) for offset in range(0, history_days, step)
+                                  if rng.random() < 0.8]
+        habit.update_streak()
+        habits.append(habit)
+    return habits
+
+
+def _best_of(work: Callable[[], object], repeat: int) -> float:
+    """
+    Returns the fastest of ``repeat`` timed runs of ``work``, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        work()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _suite_case(storage: str, habits: int, history_days: int, weekly_share: float,
+                repeat: int, directory: str) -> Dict[str, float]:
+    """
+    Times every suite operation on one dataset; see run_suite().
+    """
+    if storage == "memory":
+        path = ":memory:"
+    else:
+        path = _fresh_db_path(directory, f"suite_{habits}_{history_days}_{int(weekly_share * 100)}")
+    dataset = _suite_habits(habits, history_days, weekly_share)
+    db = DatabaseConnector(path)
+    manager = HabitManager(db)
+    timings = {}
+
+    started = time.perf_counter()
+    for habit in dataset:
+        db.save_habit(habit)
+    timings["save_habit"] = time.perf_counter() - started
+
+    timings["load_habits"] = _best_of(db.load_habits, repeat)
+    loaded = db.load_habits()
+    # Decode every history once so the remaining timings exclude lazy loading.
+    timings["load_habits_hydrated"] = _best_of(lambda: [h.completion_count for h in db.load_habits()], repeat)
+    for habit in loaded:
+        habit.completion_count
+
+    def update_streaks():
+        for habit in loaded:
+            habit.update_streak()
+
+    timings["update_streak"] = _best_of(update_streaks, repeat)
+    timings["average_success_rate"] = _best_of(lambda: analysis.calculate_average_success_rate(loaded), repeat)
+    timings["find_longest_streak"] = _best_of(lambda: analysis.find_longest_streak(loaded), repeat)
+    timings["missed_days_report"] = _best_of(lambda: analysis.missed_days_report(loaded), repeat)
+    timings["longest_streaks"] = _best_of(lambda: analysis.longest_streaks(loaded), repeat)
+    timings["average_success_rate_from_db"] = _best_of(lambda: analysis.average_success_rate_from_db(db), repeat)
+
+    started = time.perf_counter()
+    for habit in dataset:
+        manager.complete_habit(habit.id)
+    timings["complete_habit"] = time.perf_counter() - started
+
+    db.close()
+    return timings
+
+
+def run_suite(habit_counts: Sequence[int] = (100, 1000), history_days: Sequence[int] = (30, 365),
+              weekly_shares: Sequence[float] = (0.0, 0.5), storages: Sequence[str] = ("memory", "file"),
+              repeat: int = 3, directory: Optional[str] = None) -> Dict[str, object]:
+    """
+    Runs the benchmark suite over every combination of the given parameters.
+
+    Each case builds a seeded dataset and times save_habit (all habits, one
+    commit each), load_habits (lazy and fully decoded), Habit.update_streak,
+    the analysis.py reports and HabitManager.complete_habit. Read-only
+    operations report the best of ``repeat`` runs.
+
+    Args:
+        habit_counts (Sequence[int]): Number of habits per dataset.
+        history_days (Sequence[int]): Days of history per habit.
+        weekly_shares (Sequence[float]): Fraction of weekly habits, from 0.0 to 1.0.
+        storages (Sequence[str]): 'memory' for ':memory:', 'file' for a database file.
+        repeat (int): Runs per read-only measurement.
+        directory (Optional[str]): Where file databases go. Defaults to a temporary directory.
+
+    Returns:
+        Dict[str, object]: {'environment': {...}, 'results': {case: {operation: seconds}}},
+        ready to be written with json.dump().
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage, habits, days, share in itertools.product(storages, habit_counts, history_days, weekly_shares):
+            case = f"{storage}/habits={habits}/history={days}/weekly={share:g}"
+            results[case] = _suite_case(storage, habits, days, share, repeat, directory or tmp)
+    environment = {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                   "platform": platform.platform(), "date": date.today().isoformat()}
+    return {"environment": environment, "results": results}
+
+
+def compare_results(current: Dict[str, object], baseline: Dict[str, object], threshold: float = 0.25,
+                    min_seconds: float = 0.001) -> List[Dict[str, object]]:
+    """
+    Finds operations that got slower than a baseline run of run_suite().
+
+    Cases or operations missing from either run are ignored, and so are
+    timings below ``min_seconds`` in both runs, which are mostly noise.
+
+    Args:
+        current (Dict[str, object]): Results of this run.
+        baseline (Dict[str, object]): Stored results to compare with.
+        threshold (float): Allowed slowdown as a fraction (0.25 = 25% slower).
+        min_seconds (float): Timings below this in both runs are not compared.
+
+    Returns:
+        List[Dict[str, object]]: One entry per regression with case, operation,
+        baseline and current seconds and the ratio between them.
+    """
+    regressions = []
+    for case, timings in current["results"].items():
+        reference = baseline["results"].get(case, {})
+        for operation, seconds in timings.items():
+            before = reference.get(operation)
+            if before is None or max(before, seconds) < min_seconds:
+                continue
+            if seconds > before * (1 + threshold):
+                regressions.append({"case": case, "operation": operation, "baseline": before,
+                                    "current": seconds, "ratio": seconds / before if before else float("inf")})
+    return regressions
+
+
+def bench_cli_startup(runs: int = 10, command: Sequence[str] = ("list",),
+                      directory: Optional[str] = None) -> Dict[str, float]:
+    """
+    Measures the wall-clock time of one non-interactive ``cli.py`` call.
+
+    The command runs ``runs`` times in fresh interpreter processes against a
+    small database; a bare ``python -c pass`` is measured the same way so
+    the tracker's own share of the startup is visible.
+
+    Args:
+        runs (int): Processes started per measurement.
+        command (Sequence[str]): cli.py arguments after ``--db PATH``.
+        directory (Optional[str]): Where to create the database. Defaults to a temporary directory.
+
+    Returns:
+        Dict[str, float]: Median milliseconds for the interpreter alone and for the command,
+        and the difference between them.
+    """
+    cli_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+
+    def median_ms(arguments: List[str]) -> float:
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run(arguments, check=True, stdout=subprocess.DEVNULL)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _fresh_db_path(directory or tmp, "startup")
+        db = DatabaseConnector(path)
+        db.save_habits(_suite_habits(20, 30, 0.3))
+        db.close()
+        interpreter = median_ms([sys.executable, "-c", "pass"])
+        total = median_ms([sys.executable, cli_path, "--db", path, *command])
+    return {"interpreter_ms": interpreter, "command_ms": total, "overhead_ms": total - interpreter}
+
+
+def main():
+    """
+    Command-line entry point: runs the selected benchmark and prints its results.
+    """
+    parser = argparse.ArgumentParser(description="Digital Detox Tracker benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    profiles = commands.add_parser("profiles", help="write throughput per storage profile")
+    profiles.add_argument("--operations", type=int, default=500)
+    profiles.add_argument("--directory", help="directory for the benchmark databases")
+
+    load = commands.add_parser("async", help="AsyncHabitManager check-ins per second by concurrency")
+    load.add_argument("--habits", type=int, default=2000)
+    load.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    load.add_argument("--directory", help="directory for the benchmark databases")
+
+    pool = commands.add_parser("pool", help="PooledDatabaseConnector read throughput by thread count")
+    pool.add_argument("--habits", type=int, default=2000)
+    pool.add_argument("--queries", type=int, default=50)
+    pool.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    pool.add_argument("--directory", help="directory for the benchmark database")
+
+    parallel = commands.add_parser("parallel", help="per-habit report time by worker process count")
+    parallel.add_argument("--habits", type=int, default=20_000)
+    parallel.add_argument("--history", type=int, default=365, help="longest history in days (default: 365)")
+    parallel.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parallel.add_argument("--chunk-size", type=int, default=2000)
+    parallel.add_argument("--directory", help="directory for the benchmark database")
+
+    memory = commands.add_parser("memory", help="bytes per habit of the in-memory habit layouts")
+    memory.add_argument("--totals", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    memory.add_argument("--per-habit", type=int, default=100)
+
+    suite = commands.add_parser("suite", help="storage, streak and analytics timings over dataset sizes")
+    suite.add_argument("--habits", type=int, nargs="+", default=[100, 1000])
+    suite.add_argument("--history", type=int, nargs="+", default=[30, 365], help="days of history per habit")
+    suite.add_argument("--weekly-share", type=float, nargs="+", default=[0.0, 0.5])
+    suite.add_argument("--storage", choices=["memory", "file"], nargs="+", default=["memory", "file"])
+    suite.add_argument("--repeat", type=int, default=3)
+    suite.add_argument("--directory", help="directory for the file databases")
+    suite.add_argument("--output", help="write the results to this JSON file")
+    suite.add_argument("--baseline", help="JSON results to compare against")
+    suite.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown (default: 0.25)")
+
+    startup = commands.add_parser("startup", help="wall-clock time of a non-interactive cli.py command")
+    startup.add_argument("--runs", type=int, default=10)
+    startup.add_argument("--budget-ms", type=float, default=100.0,
+                         help="fail if the command's median time minus the interpreter's exceeds this "
+                              "(default: 100)")
+    startup.add_argument("cli_args", nargs="*", default=["list"], help="cli.py command (default: list)")
+
+    args = parser.parse_args()
+    if args.command == "startup":
+        row = bench_cli_startup(args.runs, args.cli_args)
+        print(f"interpreter {row['interpreter_ms']:.1f} ms, cli.py {' '.join(args.cli_args)} "
+              f"{row['command_ms']:.1f} ms (tracker overhead {row['overhead_ms']:.1f} ms, "
+              f"budget {args.budget_ms:.0f} ms)")
+        if row["overhead_ms"] > args.budget_ms:
+            sys.exit(1)
+    elif args.command == "suite":
+        report = run_suite(args.habits, args.history, args.weekly_share, args.storage, args.repeat, args.directory)
+        for case, timings in report["results"].items():
+            print(case)
+            for operation, seconds in timings.items():
+                print(f"    {operation:<30} {seconds * 1000:>10.2f} ms")
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as stream:
+                json.dump(report, stream, indent=2)
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as stream:
+                regressions = compare_results(report, json.load(stream), args.threshold)
+            for row in regressions:
+                print(f"REGRESSION {row['case']} {row['operation']}: "
+                      f"{row['baseline'] * 1000:.2f} ms -> {row['current'] * 1000:.2f} ms ({row['ratio']:.2f}x)")
+            if regressions:
+                sys.exit(1)
+            print(f"No regressions above {args.threshold:.0%}.")
+    elif args.command == "memory":
+        print(f"{'completions':>12} {'habits':>8} {'list B/habit':>13} {'bitmap B/habit':>15} {'lazy B/habit':>13}")
+        for row in bench_habit_memory(args.totals, args.per_habit):
+            print(f"{row['completions']:>12} {row['habits']:>8} {row['list_bytes_per_habit']:>13} "
+                  f"{row['bitmap_bytes_per_habit']:>15} {row['lazy_bytes_per_habit']:>13}")
+    elif args.command == "parallel":
+        print(f"{'workers':>8} {'seconds':>8}")
+        for row in bench_parallel_reports(args.habits, args.history, args.workers, args.chunk_size, args.directory):
+            print(f"{'serial' if row['workers'] == 0 else row['workers']:>8} {row['seconds']:>8}")
+    elif args.command == "pool":
+        print(f"{'threads':>8} {'queries/s':>10} {'waits':>6} {'max wait ms':>12}")
+        for row in bench_pooled_reads(args.habits, args.queries, args.threads, args.directory):
+            print(f"{row['threads']:>8} {row['queries_per_s']:>10} {row['waits']:>6} {row['max_wait_ms']:>12}")
+    elif args.command == "async":
+        print(f"{'workers':>8} {'completions/s':>14}")
+        for row in bench_async_checkins(args.habits, args.workers, args.directory):
+            print(f"{row['workers']:>8} {row['completions_per_s']:>14}")
+    elif args.command == "profiles":
+        print(f"{'profile':<10} {'autocommit/s':>14} {'transaction/s':>14}")
+        for row in bench_storage_profiles(args.operations, args.directory):
+            print(f"{row['profile']:<10} {row['autocommit_per_s']:>14} {row['transaction_per_s']:>14}")
+
+
+if __name__ == "__main__":
+    main()
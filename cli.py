@@ -1,7 +1,32 @@
-from habit_manager import HabitManager
-from db import DatabaseConnector
-from analysis import calculate_average_success_rate
-from analysis import find_longest_streak
+"""
+cli.py
+
+Purpose: Command-line interface of the Digital Detox Habit Tracker.
+
+Without a command it runs the interactive menu. Commands run
+non-interactively, in one process and one transaction, for scripts
+and scheduled jobs:
+
+    python cli.py create "No phone after 9pm" --periodicity daily
+    python cli.py complete --ids 1,2,3
+    python cli.py list --periodicity weekly
+    python cli.py analyze --json
+    python cli.py delete 4
+    python cli.py report --workers 4 --chunk-size 5000
+    python cli.py rollover
+
+Modules are imported only by the commands that need them, to keep
+startup fast (see ``python benchmarks.py startup``).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from habit_manager import HabitManager
 
 def create_habit_cli(manager: HabitManager):
     """
@@ -10,17 +35,18 @@ def create_habit_cli(manager: HabitManager):
     (daily or weekly), then creates the habit in the system.
     """
 
+    from habit import PERIODICITIES
+
     name = input("Enter habit name: ").strip() # Remove extra spaces
     periodicity = input ("Enter periodicity (daily/weekly):").strip().lower()
     
     # Validates periodicity
-    if periodicity not in ["daily", "weekly"]:
+    if periodicity not in PERIODICITIES:
         print("Invalid periodicity! Please enter 'daily' or 'weekly'.")
         return
     
     # Check for Duplicate
-    existing = [h for h in manager.list_habits() if h.name.lower() == name.lower()]
-    if existing:
+    if manager.db.habit_name_exists(name):
         print(f"Habit '{name}' already exists!")
         return
     
@@ -75,7 +101,7 @@ def list_habits_cli(manager: HabitManager):
     for each habit stored in the database.
     """
 
-    habits = manager.db.get_all_habits()
+    habits = manager.list_summaries()
     if not habits:
         print("No habits found.")
         return
@@ -92,28 +118,222 @@ def show_analysis_cli(manager: HabitManager):
     with the longest current streak.
     """
 
-    habits = manager.db.get_all_habits()
-    if not habits:
+    import analysis
+
+    if manager.db.count_habits() == 0:
         print("No habits found.")
         return
-    
-    avg_rate = calculate_average_success_rate(habits)
-    longest_name, longest_streak = find_longest_streak(habits)
+
+    # Read from the per-habit statistics, so the screen stays fast on large databases.
+    avg_rate = analysis.average_success_rate_from_db(manager.db)
+    longest_name, longest_streak = analysis.longest_streak_from_db(manager.db)
+    record_name, record_streak = analysis.longest_ever_streak_from_db(manager.db)
     print("\n=== Habit Analytics ===")
     print(f"Average success rate: {avg_rate:.2f}%")
-    print(f"Longest streak: {longest_name} with {longest_streak} days\n")
+    print(f"Longest streak: {longest_name} with {longest_streak} days")
+    print(f"Longest streak ever: {record_name} with {record_streak}\n")
+
+#NON-INTERACTIVE COMMANDS
+
+def _parse_ids(value: str) -> List[int]:
+    """
+    Parses a comma-separated list of habit IDs such as '1,2,3'.
+    """
+    try:
+        return [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated habit IDs, got {value!r}") from None
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser for the interactive menu and all commands.
+    """
+    parser = argparse.ArgumentParser(description="Digital Detox Habit Tracker. Runs the interactive menu "
+                                                 "when no command is given.")
+    parser.add_argument("--db", default="habits.db", help="database file (default: habits.db)")
+    parser.add_argument("--profile", action="store_true", help="print a profile of hot-path calls at exit")
+    parser.add_argument("--profile-allocations", action="store_true",
+                        help="with --profile, also record memory allocations (slower)")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    create = commands.add_parser("create", help="create a habit")
+    create.add_argument("name")
+    create.add_argument("--periodicity", choices=["daily", "weekly"], default="daily")
+
+    complete = commands.add_parser("complete", help="mark habits as completed today")
+    complete.add_argument("--ids", type=_parse_ids, required=True, help="comma-separated habit IDs")
+
+    listing = commands.add_parser("list", help="list habits and their current streaks")
+    listing.add_argument("--periodicity", choices=["daily", "weekly"])
+    listing.add_argument("--json", action="store_true", help="print JSON instead of text")
+
+    analyze = commands.add_parser("analyze", help="show the habit analytics")
+    analyze.add_argument("--json", action="store_true", help="print JSON instead of text")
+
+    delete = commands.add_parser("delete", help="delete habits")
+    delete.add_argument("ids", type=int, nargs="+", metavar="ID")
+
+    report = commands.add_parser("report", help="per-habit success rate, missed days and streaks")
+    report.add_argument("--workers", type=int, default=1,
+                        help="worker processes; 0 uses every CPU (default: 1)")
+    report.add_argument("--chunk-size", type=int, default=10_000, help="habits per worker task (default: 10000)")
+    report.add_argument("--json", action="store_true", help="print JSON instead of text")
+    report.add_argument("--cache", metavar="FILE",
+                        help="reuse rows of unchanged habits from this file and update it (single process)")
+
+    commands.add_parser("rebuild-stats", help="recompute the per-habit statistics from the stored history")
+
+    rollover = commands.add_parser("rollover", help="reset the streaks of habits whose period passed "
+                                                    "without a completion (run once a day)")
+    rollover.add_argument("--force", action="store_true", help="run even if it already ran today")
+    return parser
 
-def main():
+def run_command(manager: HabitManager, args: argparse.Namespace) -> int:
     """
-    Run the main CLI loop for the Habit Tracker.
+    Runs one non-interactive command inside a single transaction.
 
-    Provides a simple text-based interface where users can
-    create, complete, list , delete habits, or view analytics
+    Args:
+        manager (HabitManager): Manager of the open database.
+        args (argparse.Namespace): Parsed arguments from build_parser().
+
+    Returns:
+        int: Process exit code; 1 if a habit ID was not found.
+    """
+    status = 0
+    with manager.transaction():
+        if args.command == "create":
+            habit = manager.create_habit(args.name.strip(), args.periodicity)
+            print(f"ID {habit.id}")
+
+        elif args.command == "complete":
+            for habit_id in args.ids:
+                if manager.db.get_habit_by_id(habit_id) is None:
+                    print(f"{habit_id}: not found")
+                    status = 1
+                elif manager.complete_habit(habit_id):
+                    print(f"{habit_id}: completed")
+                else:
+                    print(f"{habit_id}: already completed today")
+
+        elif args.command == "list":
+            habits = manager.list_summaries(args.periodicity)
+            if args.json:
+                print(json.dumps([habit._asdict() for habit in habits]))
+            else:
+                for habit in habits:
+                    print(f"{habit.id}\t{habit.name}\t{habit.periodicity}\t{habit.current_streak}")
+
+        elif args.command == "analyze":
+            import analysis
+
+            longest_name, longest_streak = analysis.longest_streak_from_db(manager.db)
+            record_name, record_streak = analysis.longest_ever_streak_from_db(manager.db)
+            report = {
+                "habits": manager.db.count_habits(),
+                "average_success_rate": analysis.average_success_rate_from_db(manager.db),
+                "longest_streak": {"name": longest_name, "streak": longest_streak},
+                "longest_streak_ever": {"name": record_name, "streak": record_streak},
+            }
+            if args.json:
+                print(json.dumps(report))
+            else:
+                print(f"Habits: {report['habits']}")
+                print(f"Average success rate: {report['average_success_rate']:.2f}%")
+                print(f"Longest streak: {longest_name} with {longest_streak}")
+                print(f"Longest streak ever: {record_name} with {record_streak}")
+
+        elif args.command == "delete":
+            for habit_id in args.ids:
+                if manager.delete_habit(habit_id):
+                    print(f"{habit_id}: deleted")
+                else:
+                    print(f"{habit_id}: not found")
+                    status = 1
+
+        elif args.command == "report":
+            from parallel_reports import parallel_report, serial_report
+
+            if args.cache:
+                from analytics_cache import AnalyticsCache, cached_report
+
+                cache = AnalyticsCache.load(args.cache, database_id=manager.db.database_id())
+                rows = cached_report(manager.db, cache)
+                cache.save(args.cache)
+            elif args.workers == 1 or args.db == ":memory:":
+                rows = serial_report(manager.db)
+            else:
+                rows = parallel_report(args.db, args.workers or None, args.chunk_size)
+            if args.json:
+                print(json.dumps([dict(row._asdict(), missed_days=[day.isoformat() for day in row.missed_days])
+                                  for row in rows]))
+            else:
+                for row in rows:
+                    print(f"{row.id}\t{row.name}\t{row.success_rate:.2f}%\t{len(row.missed_days)} missed\t"
+                          f"{row.current_streak}\t{row.longest_streak}")
+
+        elif args.command == "rebuild-stats":
+            print(f"Rebuilt statistics for {manager.db.rebuild_stats()} habits.")
+
+        elif args.command == "rollover":
+            from rollover import rollover
+
+            result = rollover(manager.db, force=args.force)
+            if result.skipped:
+                print(f"Rollover already ran on {result.last_run}.")
+            else:
+                print(f"Rolled over {result.days_caught_up} day(s): {result.expired} streaks expired.")
+    return status
+
+def main(argv: Optional[List[str]] = None) -> int:
     """
+    Run the Habit Tracker command line.
 
-    db = DatabaseConnector()
-    manager = HabitManager(db)
+    Without a command, provides a simple text-based interface where users
+    can create, complete, list , delete habits, or view analytics.
+    With --profile, timings of the storage and analytics calls are
+    printed when the program ends.
 
+    Args:
+        argv (Optional[List[str]]): Arguments; defaults to sys.argv[1:].
+
+    Returns:
+        int: Process exit code.
+    """
+    args = build_parser().parse_args(argv)
+    if not args.profile:
+        return _run(args)
+
+    import instrumentation
+
+    instrumentation.enable(track_allocations=args.profile_allocations)
+    try:
+        return _run(args)
+    finally:
+        instrumentation.disable()
+        print("\n=== Profile ===")
+        print(instrumentation.format_summary())
+
+def _run(args: argparse.Namespace) -> int:
+    """
+    Opens the database and runs the command, or the menu when there is none.
+    """
+    from db import DatabaseConnector
+    from habit_manager import HabitManager
+
+    db = DatabaseConnector(args.db, cache_size=10_000)
+    try:
+        manager = HabitManager(db)
+        if args.command is None:
+            run_menu(manager)
+            return 0
+        return run_command(manager, args)
+    finally:
+        db.close()
+
+def run_menu(manager: HabitManager):
+    """
+    Runs the interactive menu until the user chooses Exit.
+    """
     while True:
         print("1. Create a habit")
         print("2. Complete a habit")
@@ -141,5 +361,4 @@ def main():
             print("Invalid option. Please choose 1-6.\n")
 
 if __name__ == "__main__":
-    main()
-
+    sys.exit(main())
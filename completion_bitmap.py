@@ -0,0 +1,262 @@
+import struct
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Blob layout: origin date as a little-endian int32 ordinal, then the bitmap bytes.
+_HEADER = struct.Struct("<i")
+
+class CompletionBitmap:
+    """
+    Compact set of completed days, one bit per day offset from an origin date.
+
+    Bit ``i`` of the bitmap stands for ``origin + i days``. Habits use their
+    creation date as origin; a completion recorded before the origin shifts
+    the origin back so every day remains representable.
+
+    Attributes:
+        origin (date): The day represented by bit 0.
+        changes (int): Counts add(), discard() and clear() calls that changed the set,
+            so derived structures can tell whether they are stale.
+    """
+
+    __slots__ = ("origin", "_bits", "changes")
+
+    def __init__(self, origin: date, days: Iterable[date] = ()):
+        """
+        Initializes a bitmap, optionally filled with completed days.
+
+        Args:
+            origin (date): The day represented by bit 0.
+            days (Iterable[date], optional): Days to mark as completed.
+        """
+        self.origin = origin
+        self._bits = bytearray()
+        self.changes = 0
+        for day in days:
+            self.add(day)
+
+    @classmethod
+    def from_offsets(cls, origin: date, offsets: Iterable[int]) -> "CompletionBitmap":
+        """
+        Builds a bitmap from completed day offsets, without creating date objects.
+
+        Args:
+            origin (date): The day represented by bit 0.
+            offsets (Iterable[int]): Non-negative day offsets from ``origin``.
+
+        Returns:
+            CompletionBitmap: The filled bitmap.
+        """
+        bitmap = cls(origin)
+        bits = bitmap._bits
+        for offset in offsets:
+            if offset < 0:
+                raise ValueError("offsets must not be negative")
+            index = offset >> 3
+            if index >= len(bits):
+                bits.extend(bytes(index - len(bits) + 1))
+            bits[index] |= 1 << (offset & 7)
+        return bitmap
+
+    def _offset(self, day: date) -> int:
+        """
+        Returns the bit index of a day, moving the origin back if needed.
+        """
+        offset = (day - self.origin).days
+        if offset < 0:
+            shift_bytes = (-offset + 7) // 8
+            self._bits[:0] = bytes(shift_bytes)
+            self.origin -= timedelta(days=shift_bytes * 8)
+            offset += shift_bytes * 8
+        return offset
+
+    def add(self, day: date) -> bool:
+        """
+        Marks a day as completed.
+
+        Args:
+            day (date): The completed day.
+
+        Returns:
+            bool: True if the day was newly added, False if it was already set.
+        """
+        offset = self._offset(day)
+        index, mask = offset >> 3, 1 << (offset & 7)
+        if index >= len(self._bits):
+            self._bits.extend(bytes(index - len(self._bits) + 1))
+        elif self._bits[index] & mask:
+            return False
+        self._bits[index] |= mask
+        self.changes += 1
+        return True
+
+    def discard(self, day: date):
+        """
+        Removes a day from the completed set if present.
+
+        Args:
+            day (date): The day to clear.
+        """
+        offset = (day - self.origin).days
+        if 0 <= offset and (offset >> 3) < len(self._bits) and self._bits[offset >> 3] & (1 << (offset & 7)):
+            self._bits[offset >> 3] &= ~(1 << (offset & 7)) & 0xFF
+            self.changes += 1
+
+    def clear(self):
+        """
+        Removes every completed day.
+        """
+        if any(self._bits):
+            self.changes += 1
+        self._bits.clear()
+
+    def __contains__(self, day: date) -> bool:
+        offset = (day - self.origin).days
+        if offset < 0 or (offset >> 3) >= len(self._bits):
+            return False
+        return bool(self._bits[offset >> 3] & (1 << (offset & 7)))
+
+    def __len__(self) -> int:
+        return self.as_int().bit_count()
+
+    def __iter__(self) -> Iterator[date]:
+        """
+        Yields completed days in ascending order.
+        """
+        origin = self.origin
+        for index, byte in enumerate(self._bits):
+            while byte:
+                low = byte & -byte
+                yield origin + timedelta(days=(index << 3) + low.bit_length() - 1)
+                byte ^= low
+
+    def as_bytes(self) -> bytes:
+        """
+        Returns the raw bitmap, bit ``i`` of byte ``j`` being ``origin + 8j + i days``.
+        """
+        return bytes(self._bits)
+
+    def as_int(self) -> int:
+        """
+        Returns the bitmap as an integer, bit ``i`` being ``origin + i days``.
+        """
+        return int.from_bytes(self._bits, "little")
+
+    def first(self) -> Optional[date]:
+        """
+        Returns the earliest completed day, or None if the bitmap is empty.
+        """
+        value = self.as_int()
+        if not value:
+            return None
+        return self.origin + timedelta(days=(value & -value).bit_length() - 1)
+
+    def last(self) -> Optional[date]:
+        """
+        Returns the latest completed day, or None if the bitmap is empty.
+
+        Only the bytes after the last set bit are scanned, which to_bytes()
+        strips anyway, so this is constant time for a loaded bitmap.
+        """
+        bits = self._bits
+        for index in range(len(bits) - 1, -1, -1):
+            if bits[index]:
+                return self.origin + timedelta(days=(index << 3) + bits[index].bit_length() - 1)
+        return None
+
+    def trailing_run(self) -> int:
+        """
+        Counts consecutive completed days ending at the latest completion.
+        """
+        value = self.as_int()
+        if not value:
+            return 0
+        width = value.bit_length()
+        # Highest missing day below the latest completion; nothing missing means one run.
+        return width - (~value & ((1 << width) - 1)).bit_length()
+
+    def longest_run(self) -> int:
+        """
+        Length of the longest run of consecutive completed days.
+        """
+        value = self.as_int()
+        if not value:
+            return 0
+        # One linear pass in C over the binary digits.
+        return max(map(len, bin(value)[2:].split("0")))
+
+    def missing(self, start: date, step: int, count: int) -> List[date]:
+        """
+        Lists the days ``start + k * step`` (for ``k < count``) that are not completed.
+
+        The expected days are turned into a strided mask so the whole check is a
+        handful of integer operations rather than one lookup per day.
+
+        Args:
+            start (date): The first expected day.
+            step (int): Days between expected days (1 for daily, 7 for weekly).
+            count (int): Number of expected days.
+
+        Returns:
+            List[date]: Expected days without a completion, in ascending order.
+        """
+        if count <= 0:
+            return []
+        value = self.as_int()
+        base = (start - self.origin).days
+        if base < 0:
+            value <<= -base
+            base = 0
+        # Geometric series: one bit every `step` positions, `count` bits in total.
+        mask = ((1 << (step * count)) - 1) // ((1 << step) - 1)
+        gaps = (mask & ~(value >> base))
+        missed = []
+        while gaps:
+            low = gaps & -gaps
+            missed.append(start + timedelta(days=low.bit_length() - 1))
+            gaps ^= low
+        return missed
+
+    def to_bytes(self, spare: int = 0) -> bytes:
+        """
+        Serializes the bitmap for storage in a BLOB column.
+
+        Args:
+            spare (int, optional): Zero bytes to append, so later days can be
+                written into the stored BLOB in place (see stored_byte()).
+
+        Returns:
+            bytes: Origin ordinal header followed by the bitmap with trailing zero bytes stripped.
+        """
+        return _HEADER.pack(self.origin.toordinal()) + bytes(self._bits).rstrip(b"\x00") + bytes(spare)
+
+    def stored_byte(self, day: date) -> Tuple[bytes, int, int]:
+        """
+        Locates the byte holding a day in the to_bytes() serialization.
+
+        Args:
+            day (date): A day on or after origin.
+
+        Returns:
+            Tuple[bytes, int, int]: The header a stored BLOB must start with for
+            the position to apply, the byte's position in the BLOB and its value.
+        """
+        index = (day - self.origin).days >> 3
+        value = self._bits[index] if 0 <= index < len(self._bits) else 0
+        return _HEADER.pack(self.origin.toordinal()), _HEADER.size + index, value
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "CompletionBitmap":
+        """
+        Restores a bitmap written by to_bytes().
+
+        Args:
+            blob (bytes): The serialized bitmap.
+
+        Returns:
+            CompletionBitmap: The decoded bitmap.
+        """
+        (ordinal,) = _HEADER.unpack_from(blob)
+        bitmap = cls(date.fromordinal(ordinal))
+        bitmap._bits = bytearray(blob[_HEADER.size:])
+        return bitmap
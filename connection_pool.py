@@ -0,0 +1,195 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Union
+
+from db import DatabaseConnector, StorageProfile
+
+class PoolTimeout(TimeoutError):
+    """
+    Raised when no connection becomes available within the checkout timeout.
+    """
+
+class PoolStats:
+    """
+    Checkout counters for one side of a PooledDatabaseConnector.
+
+    Attributes:
+        checkouts (int): Connections handed out.
+        waits (int): Checkouts that had to wait for a busy connection.
+        wait_time (float): Total seconds spent waiting.
+        max_wait (float): Longest single wait in seconds.
+        timeouts (int): Checkouts that gave up after the timeout.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record(self, waited: Optional[float]):
+        """
+        Records one checkout.
+
+        Args:
+            waited (Optional[float]): Seconds spent waiting, 0.0 if the connection
+                was free, or None if the checkout timed out.
+        """
+        with self._lock:
+            if waited is None:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            if waited > 0:
+                self.waits += 1
+                self.wait_time += waited
+                self.max_wait = max(self.max_wait, waited)
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Returns the counters as a dictionary.
+        """
+        with self._lock:
+            return {"checkouts": self.checkouts, "waits": self.waits, "wait_time": self.wait_time,
+                    "max_wait": self.max_wait, "timeouts": self.timeouts}
+
+class PooledDatabaseConnector(DatabaseConnector):
+    """
+    DatabaseConnector that can be shared by many threads.
+
+    Read queries run on a pool of reader connections, so readers never wait
+    for each other's connection or for a writer. This keeps reads available
+    under concurrent writes; it does not make them faster, as the Python
+    side of every query still runs under the GIL (see benchmarks.py pool).
+    Every statement that modifies the database goes through the single
+    writer connection, one thread at a time; a thread holding the writer
+    (for example inside transaction()) also reads through it, so it sees its
+    own uncommitted changes.
+
+    With ``cache_size`` set, all threads are handed the same cached Habit
+    instances. complete_today() and the other Habit mutators run outside the
+    writer lock, so a cached habit must not be mutated by two threads at
+    once; serialize check-ins of the same habit, or leave the cache off.
+
+    Use a WAL profile ('fast' or 'durable') so readers are not blocked while
+    a write commits. An in-memory database cannot be shared between
+    connections, so ':memory:' runs without readers and serializes all calls
+    on the writer.
+
+    Example:
+        db = PooledDatabaseConnector("habits.db", pool_size=8)
+        manager = HabitManager(db)  # safe to use from any thread without cache_size
+    """
+
+    def __init__(self, db_path: str = "habits.db", pool_size: int = 4, timeout: float = 5.0,
+                 cache_size: Optional[int] = None, profile: Union[str, StorageProfile] = "fast"):
+        """
+        Opens the writer and ``pool_size`` reader connections.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            pool_size (int): Number of reader connections.
+            timeout (float): Seconds a thread waits for a connection before PoolTimeout is raised.
+            cache_size (Optional[int]): Size of the HabitCache shared by all threads. Disabled by default.
+            profile (Union[str, StorageProfile]): Storage profile for every connection.
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.timeout = timeout
+        self.reader_stats = PoolStats()
+        self.writer_stats = PoolStats()
+        self._writer_lock = threading.RLock()
+        self._writer_owner: Optional[int] = None
+        self._writer_depth = 0
+        self._readers: Optional["queue.Queue[sqlite3.Connection]"] = None
+        self._reader_connections: List[sqlite3.Connection] = []
+        super().__init__(db_path, cache_size=cache_size, profile=profile, check_same_thread=False)
+
+        if db_path != ":memory:":
+            self._readers = queue.Queue()
+            for _ in range(pool_size):
+                conn = sqlite3.connect(db_path, cached_statements=self.profile.cached_statements,
+                                       check_same_thread=False)
+                for pragma in self.profile.pragmas():
+                    conn.execute(pragma)
+                conn.execute("PRAGMA query_only = ON")
+                self._reader_connections.append(conn)
+                self._readers.put(conn)
+
+    @property
+    def pool_size(self) -> int:
+        """Number of reader connections (0 for ':memory:')."""
+        return len(self._reader_connections)
+
+    def pool_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns checkout and wait counters for the readers and the writer.
+
+        Returns:
+            Dict[str, Dict[str, float]]: {'readers': {...}, 'writer': {...}}, see PoolStats.
+        """
+        return {"readers": self.reader_stats.as_dict(), "writer": self.writer_stats.as_dict()}
+
+    def close(self):
+        """
+        Closes the writer and every reader connection.
+        """
+        with self._writer_lock:
+            for conn in self._reader_connections:
+                conn.close()
+            super().close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Holds the writer connection for the calling thread; re-entrant.
+        """
+        if self._writer_lock.acquire(blocking=False):
+            self.writer_stats.record(0.0)
+        else:
+            started = time.perf_counter()
+            if not self._writer_lock.acquire(timeout=self.timeout):
+                self.writer_stats.record(None)
+                raise PoolTimeout(f"writer connection busy for more than {self.timeout}s")
+            self.writer_stats.record(time.perf_counter() - started)
+
+        self._writer_owner = threading.get_ident()
+        self._writer_depth += 1
+        try:
+            yield self.conn
+        finally:
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer_owner = None
+            self._writer_lock.release()
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """
+        Checks out a reader, or the writer if this thread already holds it.
+        """
+        if self._readers is None or self._writer_owner == threading.get_ident():
+            with self._write() as conn:
+                yield conn
+            return
+
+        try:
+            conn = self._readers.get_nowait()
+            self.reader_stats.record(0.0)
+        except queue.Empty:
+            started = time.perf_counter()
+            try:
+                conn = self._readers.get(timeout=self.timeout)
+            except queue.Empty:
+                self.reader_stats.record(None)
+                raise PoolTimeout(f"no reader connection free within {self.timeout}s") from None
+            self.reader_stats.record(time.perf_counter() - started)
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
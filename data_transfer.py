@@ -0,0 +1,281 @@
+"""
+data_transfer.py
+
+Purpose: Streaming import and export of habits and their completions,
+for backups and migrations between databases.
+
+Both formats carry the same records, written habit by habit: a "habit"
+record followed by one "completion" record per completed day.
+
+    CSV:   record,habit_id,name,periodicity,creation_date,day
+    JSONL: {"record": "habit", "habit_id": 1, "name": ..., "periodicity": ..., "creation_date": ...}
+           {"record": "completion", "habit_id": 1, "day": "2024-01-01"}
+
+Records are read and written through generators in chunks, so memory use
+does not grow with the number of completions. Usage:
+
+    python data_transfer.py export backup.jsonl
+    python data_transfer.py import backup.csv --db other.db
+"""
+import argparse
+import csv
+import json
+import time
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from db import DatabaseConnector, iter_batches, normalize_name
+from habit import PERIODICITIES, Habit
+
+CSV_FIELDS = ["record", "habit_id", "name", "periodicity", "creation_date", "day"]
+FORMATS = ("csv", "jsonl")
+
+
+class TransferReport:
+    """
+    Counters collected during an import or export.
+
+    Attributes:
+        rows (int): Records read or written.
+        habits_created (int): Habits inserted by an import.
+        habits_merged (int): Imported habits that matched an existing one.
+        completions_added (int): Completions that were not stored before.
+        rows_skipped (int): Invalid records, or completions of skipped habits.
+        elapsed (float): Duration in seconds.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.habits_created = 0
+        self.habits_merged = 0
+        self.completions_added = 0
+        self.rows_skipped = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput of the transfer."""
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.rows} rows in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s): "
+                f"{self.habits_created} habits created, {self.habits_merged} merged, "
+                f"{self.completions_added} completions added, {self.rows_skipped} rows skipped")
+
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    """
+    Returns the explicit format, or the one implied by the file extension.
+    """
+    fmt = fmt or path.rsplit(".", 1)[-1].lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    return fmt
+
+
+#EXPORT
+
+def iter_records(db: DatabaseConnector, batch_size: int = 1000) -> Iterator[Dict[str, object]]:
+    """
+    Streams every habit followed by its completions as export records.
+
+    Args:
+        db (DatabaseConnector): Source database.
+        batch_size (int): Rows fetched from SQLite at a time.
+
+    Yields:
+        Dict[str, object]: "habit" and "completion" records.
+    """
+    previous = None
+    # One joined stream holds a single reader, so exports also work with a one-connection pool.
+    for habit_id, name, periodicity, creation_date, day in db.iter_habit_completion_records(batch_size):
+        if habit_id != previous:
+            yield {"record": "habit", "habit_id": habit_id, "name": name,
+                   "periodicity": periodicity, "creation_date": creation_date}
+            previous = habit_id
+        if day is not None:
+            yield {"record": "completion", "habit_id": habit_id, "day": day}
+
+
+def write_records(records: Iterable[Dict[str, object]], stream: TextIO, fmt: str) -> int:
+    """
+    Writes records to an open text stream.
+
+    Args:
+        records (Iterable[Dict[str, object]]): Records from iter_records().
+        stream (TextIO): Destination opened in text mode (newline='' for CSV).
+        fmt (str): 'csv' or 'jsonl'.
+
+    Returns:
+        int: Number of records written.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    else:
+        for record in records:
+            stream.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+def export_habits(db: DatabaseConnector, path: str, fmt: Optional[str] = None, batch_size: int = 1000) -> TransferReport:
+    """
+    Exports all habits and completions to a CSV or JSONL file.
+
+    Args:
+        db (DatabaseConnector): Source database.
+        path (str): Destination file.
+        fmt (Optional[str]): 'csv' or 'jsonl'. Defaults to the file extension.
+        batch_size (int): Rows fetched from SQLite at a time.
+
+    Returns:
+        TransferReport: Number of rows written and throughput.
+    """
+    fmt = _detect_format(path, fmt)
+    report = TransferReport()
+    started = time.perf_counter()
+    with open(path, "w", newline="", encoding="utf-8") as stream:
+        report.rows = write_records(iter_records(db, batch_size), stream, fmt)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+#IMPORT
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Dict[str, object]]:
+    """
+    Lazily reads records from an open text stream.
+
+    Args:
+        stream (TextIO): Source opened in text mode (newline='' for CSV).
+        fmt (str): 'csv' or 'jsonl'.
+
+    Yields:
+        Dict[str, object]: One record per CSV row or JSON line; a line that is
+        not valid JSON yields an empty record, which import_records() skips.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield {}
+
+
+def import_records(db: DatabaseConnector, records: Iterable[Dict[str, object]], batch_size: int = 1000) -> TransferReport:
+    """
+    Imports records into a database, one transaction per chunk.
+
+    Habits are validated like the interactive CLI does (periodicity must be
+    'daily' or 'weekly' after stripping and lower-casing) and deduplicated
+    like HabitManager.create_habit: a habit whose name and periodicity
+    already exist is merged into the stored one, completions included.
+    Habit IDs from the file are remapped to the IDs in this database.
+
+    Args:
+        db (DatabaseConnector): Destination database.
+        records (Iterable[Dict[str, object]]): Records from read_records().
+        batch_size (int): Records handled per transaction.
+
+    Returns:
+        TransferReport: What was created, merged and skipped, and the throughput.
+    """
+    report = TransferReport()
+    started = time.perf_counter()
+    # Only source ID -> stored ID pairs are kept across chunks, never habits or completions.
+    id_map: Dict[int, int] = {}
+
+    for chunk in iter_batches(records, batch_size):
+        report.rows += len(chunk)
+        chunk_habits: Dict[int, Habit] = {}
+        new_habits: Dict[Tuple[str, str], Habit] = {}
+        completions: List[Tuple[int, date]] = []
+
+        with db.transaction():
+            for record in chunk:
+                try:
+                    source_id = int(record["habit_id"])
+                    if record["record"] == "habit":
+                        name = str(record["name"]).strip()
+                        periodicity = str(record["periodicity"]).strip().lower()
+                        creation_date = date.fromisoformat(str(record["creation_date"]))
+                        if not name or periodicity not in PERIODICITIES:
+                            raise ValueError("invalid habit")
+                    elif record["record"] == "completion":
+                        completions.append((source_id, date.fromisoformat(str(record["day"]))))
+                        continue
+                    else:
+                        raise ValueError("unknown record type")
+                except (KeyError, TypeError, ValueError):
+                    report.rows_skipped += 1
+                    continue
+
+                key = (normalize_name(name), periodicity)
+                habit = new_habits.get(key) or db.find_habit(name, periodicity)
+                if habit is None:
+                    habit = Habit(name=name, periodicity=periodicity, creation_date=creation_date)
+                    new_habits[key] = habit
+                    report.habits_created += 1
+                else:
+                    report.habits_merged += 1
+                chunk_habits[source_id] = habit
+
+            db.save_habits(new_habits.values(), batch_size)
+            id_map.update((source_id, habit.id) for source_id, habit in chunk_habits.items())
+
+            resolved = [(id_map[source_id], day) for source_id, day in completions if source_id in id_map]
+            report.rows_skipped += len(completions) - len(resolved)
+            report.completions_added += db.add_completions(resolved, batch_size)
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def import_habits(db: DatabaseConnector, path: str, fmt: Optional[str] = None, batch_size: int = 1000) -> TransferReport:
+    """
+    Imports habits and completions from a CSV or JSONL file.
+
+    Args:
+        db (DatabaseConnector): Destination database.
+        path (str): Source file.
+        fmt (Optional[str]): 'csv' or 'jsonl'. Defaults to the file extension.
+        batch_size (int): Records handled per transaction.
+
+    Returns:
+        TransferReport: What was created, merged and skipped, and the throughput.
+    """
+    fmt = _detect_format(path, fmt)
+    with open(path, newline="", encoding="utf-8") as stream:
+        return import_records(db, read_records(stream, fmt), batch_size)
+
+
+def main():
+    """
+    Command-line entry point for importing and exporting habit data.
+    """
+    parser = argparse.ArgumentParser(description="Import or export Digital Detox Tracker data")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path", help="CSV or JSONL file")
+    parser.add_argument("--format", choices=FORMATS, help="defaults to the file extension")
+    parser.add_argument("--db", default="habits.db", help="database file (default: habits.db)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = DatabaseConnector(args.db)
+    if args.command == "export":
+        report = export_habits(db, args.path, args.format, args.batch_size)
+    else:
+        report = import_habits(db, args.path, args.format, args.batch_size)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,88 +1,1094 @@
 import sqlite3
+import uuid
+from contextlib import contextmanager
 from habit import Habit
-from datetime import date
-from typing import List, Optional
+from completion_bitmap import CompletionBitmap
+from habit_cache import HabitCache
+from datetime import date, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# Bumped whenever create_table() learns a new migration step.
+SCHEMA_VERSION = 7
+
+# meta table key holding the random ID that tells databases apart (see database_id()).
+DATABASE_ID_KEY = "database_id"
+
+# Column list understood by DatabaseConnector._habit_from_row().
+_HABIT_COLUMNS = "id, name, periodicity, creation_date, current_streak, completion_bitmap"
+
+# Version of a newly inserted habit. It starts above every version a deleted
+# habit ever had, so a reused ID never matches an old (id, version) pair.
+_NEW_VERSION = "(SELECT COALESCE(MAX(CAST(value AS INTEGER)), 0) + 1 FROM meta WHERE key = 'retired_habit_version')"
+
+# Writes one row of DatabaseConnector._stats_values().
+_STATS_UPSERT = """
+    INSERT OR REPLACE INTO habit_stats
+        (habit_id, completions, last_completion, current_streak, longest_streak, expected_periods, as_of)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Refreshes habit_stats after a check-in later than every stored completion,
+# without rereading the habit's history.
+_STATS_CHECK_IN = """
+    UPDATE habit_stats
+    SET completions = completions + :inserted, last_completion = :day, current_streak = :streak,
+        longest_streak = MAX(longest_streak, :streak), expected_periods = :expected, as_of = :today
+    WHERE habit_id = :id
+"""
+
+# Zero bytes kept after a rewritten completion bitmap, so the following
+# check-ins (64 days of a daily habit) are written into the BLOB in place.
+_BITMAP_SPARE_BYTES = 8
+
+class HabitSummary(NamedTuple):
+    """
+    Listing row returned by DatabaseConnector.list_habit_summaries().
+    """
+    id: int
+    name: str
+    periodicity: str
+    current_streak: int
+
+class HabitWindow(NamedTuple):
+    """
+    A habit and its completions inside a date window, returned by DatabaseConnector.habit_windows().
+    """
+    id: int
+    name: str
+    periodicity: str
+    creation_date: date
+    days: List[date]
+
+class StorageProfile:
+    """
+    Connection settings applied when a DatabaseConnector opens its database.
+
+    Attributes:
+        name (str): Profile name.
+        journal_mode (Optional[str]): PRAGMA journal_mode, e.g. 'WAL'. None keeps SQLite's default.
+        synchronous (Optional[str]): PRAGMA synchronous level ('OFF', 'NORMAL', 'FULL').
+        cache_size (Optional[int]): PRAGMA cache_size (negative values are KiB).
+        mmap_size (Optional[int]): PRAGMA mmap_size in bytes.
+        cached_statements (int): Size of the sqlite3 prepared statement cache.
+    """
+
+    def __init__(self, name: str, journal_mode: Optional[str] = None, synchronous: Optional[str] = None,
+                 cache_size: Optional[int] = None, mmap_size: Optional[int] = None, cached_statements: int = 128):
+        self.name = name
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+
+    def pragmas(self) -> List[str]:
+        """
+        Returns the PRAGMA statements that apply this profile.
+        """
+        settings = [("journal_mode", self.journal_mode), ("synchronous", self.synchronous),
+                    ("cache_size", self.cache_size), ("mmap_size", self.mmap_size)]
+        return [f"PRAGMA {key} = {value}" for key, value in settings if value is not None]
+
+    def __repr__(self) -> str:
+        return f"StorageProfile(name='{self.name}')"
+
+# Named profiles accepted by DatabaseConnector(profile=...).
+STORAGE_PROFILES: Dict[str, StorageProfile] = {
+    # SQLite defaults: rollback journal, synchronous=FULL.
+    "default": StorageProfile("default"),
+    # WAL keeps readers unblocked during writes; FULL still syncs every commit.
+    "durable": StorageProfile("durable", journal_mode="WAL", synchronous="FULL",
+                              cache_size=-16_000, cached_statements=256),
+    # WAL with NORMAL sync only fsyncs at checkpoints; a power loss can drop the
+    # last commits but never corrupts the database.
+    "fast": StorageProfile("fast", journal_mode="WAL", synchronous="NORMAL",
+                           cache_size=-64_000, mmap_size=256 * 1024 * 1024, cached_statements=512),
+}
+
+def iter_batches(items: Iterable, size: int) -> Iterator[list]:
+    """
+    Splits an iterable into lists of at most ``size`` items without materializing it.
+    """
+    if size < 1:
+        raise ValueError("batch_size must be at least 1")
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def normalize_name(name: str) -> str:
+    """
+    Returns the form of a habit name used for duplicate detection.
+
+    Args:
+        name (str): The habit name as entered.
+
+    Returns:
+        str: The name stripped of surrounding whitespace and lower-cased.
+    """
+    return name.strip().lower()
 
 class DatabaseConnector:
     """
     Handles SQLite3 database operations for storing and retrieving habits.
+
+    Completion history lives in its own ``completions`` table (one row per
+    habit and day), so recording a check-in is a single indexed insert
+    instead of a rewrite of the whole history. Each habit row also carries
+    a ``completion_bitmap`` BLOB (see CompletionBitmap) that is kept in step
+    with the table and lets habits load without parsing a date per completion.
+
+    The ``habit_stats`` table holds per-habit totals (completions, last
+    completion, current and longest streak, expected periods) that every
+    write refreshes in the same transaction, so reports read one small row
+    per habit however long the histories are.
     """
 
-    def __init__(self, db_path: str = "habits.db"):
-        """ 
+    def __init__(self, db_path: str = "habits.db", cache_size: Optional[int] = None,
+                 profile: Union[str, StorageProfile] = "default", check_same_thread: bool = True):
+        """
         Initializes the database connection and ensures the habits table exists.
 
         Args:
             db_path (str): Path to the SQLite database file.
+            cache_size (Optional[int]): If set, keep up to this many loaded habits
+                in an identity-map HabitCache. Disabled by default.
+            profile (Union[str, StorageProfile]): Storage profile, by name from
+                STORAGE_PROFILES or as an instance.
+            check_same_thread (bool): Passed to sqlite3.connect(). Only disable it
+                when the caller guarantees the connection is never used concurrently.
         """
-        self.conn = sqlite3.connect(db_path)
+        self.profile = STORAGE_PROFILES[profile] if isinstance(profile, str) else profile
+        self.conn = sqlite3.connect(db_path, cached_statements=self.profile.cached_statements,
+                                    check_same_thread=check_same_thread)
+        for pragma in self.profile.pragmas():
+            self.conn.execute(pragma)
+        self.cache: Optional[HabitCache] = HabitCache(cache_size) if cache_size else None
+        self._transaction_depth = 0
+        self._savepoints: List[str] = []
         self.create_table()
 
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups several operations into one commit.
+
+        Methods called inside the block skip their own commit; the work is
+        committed when the outermost block exits, or rolled back if it raises.
+        Blocks may be nested: a nested block, like every write method called
+        inside one, runs under a savepoint, so if it raises only its own work
+        is undone and the enclosing block may still commit.
+
+        Yields:
+            DatabaseConnector: This connector.
+        """
+        with self._write() as conn:
+            if self._transaction_depth == 0 and not conn.in_transaction:
+                # Opened up front, so that releasing a nested savepoint never commits.
+                conn.execute("BEGIN")
+            self._begin()
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                self._rollback()
+                raise
+            self._transaction_depth -= 1
+            self._commit()
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """
+        Provides the connection for a read-only query.
+        PooledDatabaseConnector overrides this to hand out a pooled reader.
+        """
+        yield self.conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Provides the connection for statements that modify the database.
+        PooledDatabaseConnector overrides this to serialize writers.
+        """
+        yield self.conn
+
+    def _begin(self):
+        """
+        Marks the start of a write. Inside a transaction() block this sets the
+        savepoint that the matching _commit() releases or _rollback() returns to.
+        """
+        if self._transaction_depth:
+            savepoint = f"write_{len(self._savepoints)}"
+            self.conn.execute(f"SAVEPOINT {savepoint}")
+            self._savepoints.append(savepoint)
+
+    def _commit(self):
+        """
+        Commits, or only releases the write's savepoint inside a transaction() block.
+        """
+        if self._transaction_depth == 0:
+            self.conn.commit()
+        else:
+            self.conn.execute(f"RELEASE {self._savepoints.pop()}")
+
+    def _rollback(self):
+        """
+        Rolls back, or only undoes the write's savepoint inside a transaction() block.
+        """
+        if self._transaction_depth == 0:
+            self.conn.rollback()
+        else:
+            savepoint = self._savepoints.pop()
+            if self.conn.in_transaction:
+                self.conn.execute(f"ROLLBACK TO {savepoint}")
+                self.conn.execute(f"RELEASE {savepoint}")
+        if self.cache is not None:
+            # Cached instances may hold changes that were never stored.
+            self.cache.clear()
+
     def create_table(self):
         """
-        Creates the habits table if it doesn't already exist.
-        """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS habits (
-                id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                periodicity TEXT NOT NULL,
-                creation_date TEXT NOT NULL,
-                completion_dates TEXT,
-                current_streak INTEGER
+        Creates the habits and completions tables if they don't already exist
+        and migrates databases written by older versions of the tracker.
+        """
+        with self._write() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS habits (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    normalized_name TEXT,
+                    periodicity TEXT NOT NULL,
+                    creation_date TEXT NOT NULL,
+                    current_streak INTEGER,
+                    completion_bitmap BLOB,
+                    version INTEGER NOT NULL DEFAULT 1
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS completions (
+                    habit_id INTEGER NOT NULL,
+                    day TEXT NOT NULL,
+                    PRIMARY KEY (habit_id, day)
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS habit_stats (
+                    habit_id INTEGER PRIMARY KEY,
+                    completions INTEGER NOT NULL,
+                    last_completion TEXT,
+                    current_streak INTEGER NOT NULL,
+                    longest_streak INTEGER NOT NULL,
+                    expected_periods INTEGER NOT NULL,
+                    as_of TEXT NOT NULL
+                )
+            """)
+            cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self._migrate_completion_dates(cursor)
+            if version < 2:
+                self._migrate_completion_bitmaps(cursor)
+            if version < 3:
+                self._migrate_normalized_names(cursor)
+            if version < 5:
+                columns = [row[1] for row in cursor.execute("PRAGMA table_info(habits)")]
+                if "version" not in columns:
+                    cursor.execute("ALTER TABLE habits ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            if version < 6:
+                cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)",
+                               (DATABASE_ID_KEY, uuid.uuid4().hex))
+            if version < 7:
+                # Older versions stored streaks that counted the first run of the
+                # history; habit_stats (added in version 4) is rebuilt from the
+                # recomputed ones.
+                self._refresh_current_streaks(cursor, date.today())
+                self._rebuild_stats(cursor, date.today())
+            if version < SCHEMA_VERSION:
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._commit()
+
+    def _migrate_completion_dates(self, cursor: sqlite3.Cursor):
+        """
+        Moves the legacy comma-joined ``habits.completion_dates`` column into
+        the completions table. Runs once per database.
+
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the ongoing create_table() call.
+        """
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(habits)")]
+        if "completion_dates" not in columns:
+            return
+
+        rows = cursor.execute(
+            "SELECT id, completion_dates FROM habits WHERE completion_dates IS NOT NULL AND completion_dates != ''"
+        ).fetchall()
+        for habit_id, dates_str in rows:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO completions (habit_id, day) VALUES (?, ?)",
+                [(habit_id, d) for d in dates_str.split(",") if d]
             )
-        """)
-        self.conn.commit()
+        cursor.execute("UPDATE habits SET completion_dates = NULL")
+
+    def _migrate_completion_bitmaps(self, cursor: sqlite3.Cursor):
+        """
+        Adds the completion_bitmap column and fills it from the completions table.
+
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the ongoing create_table() call.
+        """
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(habits)")]
+        if "completion_bitmap" not in columns:
+            cursor.execute("ALTER TABLE habits ADD COLUMN completion_bitmap BLOB")
+
+        habits = cursor.execute("SELECT id, creation_date FROM habits").fetchall()
+        for habit_id, creation_date in habits:
+            days = cursor.execute("SELECT day FROM completions WHERE habit_id=?", (habit_id,)).fetchall()
+            bitmap = CompletionBitmap(date.fromisoformat(creation_date), (date.fromisoformat(d) for (d,) in days))
+            cursor.execute("UPDATE habits SET completion_bitmap=? WHERE id=?", (bitmap.to_bytes(), habit_id))
+
+    def _migrate_normalized_names(self, cursor: sqlite3.Cursor):
+        """
+        Adds and backfills the normalized_name column and its (normalized_name,
+        periodicity) index used for duplicate detection.
+
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the ongoing create_table() call.
+        """
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(habits)")]
+        if "normalized_name" not in columns:
+            cursor.execute("ALTER TABLE habits ADD COLUMN normalized_name TEXT")
+
+        # Backfilled in Python so the value matches normalize_name() exactly.
+        rows = cursor.execute("SELECT id, name FROM habits").fetchall()
+        cursor.executemany(
+            "UPDATE habits SET normalized_name=? WHERE id=?",
+            [(normalize_name(name), habit_id) for habit_id, name in rows]
+        )
+        try:
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS habits_name_periodicity ON habits (normalized_name, periodicity)"
+            )
+        except sqlite3.IntegrityError:
+            # Databases written before duplicate checks existed may hold duplicates;
+            # keep them readable and still indexed.
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS habits_name_periodicity ON habits (normalized_name, periodicity)"
+            )
+
+    def _habit_from_row(self, row: tuple) -> Habit:
+        """
+        Builds a Habit from an (id, name, periodicity, creation_date, current_streak, completion_bitmap) row.
+        An instance already in the cache is returned as is.
+        """
+        id, name, periodicity, creation_date, streak, blob = row
+        if self.cache is not None:
+            cached = self.cache.peek(id)
+            if cached is not None:
+                return cached
+        habit = Habit(id=id, name=name, periodicity=periodicity, creation_date=date.fromisoformat(creation_date))
+        if blob is not None:
+            habit.load_completions_from(blob)
+        habit.restore_streak(streak or 0)
+        if self.cache is not None:
+            self.cache.put(habit)
+        return habit
+
+    @staticmethod
+    def _habit_values(habit: Habit) -> tuple:
+        """
+        Column values of a habit row, in the order
+        (name, normalized_name, periodicity, creation_date, current_streak, completion_bitmap).
+        """
+        return (habit.name, normalize_name(habit.name), habit.periodicity, habit.creation_date.isoformat(),
+                habit.current_streak, habit.completions.to_bytes())
+
+    @staticmethod
+    def _stats_values(habit: Habit, today: date) -> tuple:
+        """
+        habit_stats row of a habit, computed from its in-memory state.
+        """
+        last = habit.completions.last()
+        return (habit.id, habit.completion_count, last.isoformat() if last else None, habit.current_streak or 0,
+                habit.longest_streak(), habit.expected_periods(today), today.isoformat())
+
+    def _write_stats(self, cursor: sqlite3.Cursor, habits: List[Habit]):
+        """
+        Refreshes the habit_stats rows of habits that were just written.
+
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the ongoing write.
+            habits (List[Habit]): Stored habits.
+        """
+        today = date.today()
+        if len(habits) == 1:
+            cursor.execute(_STATS_UPSERT, self._stats_values(habits[0], today))
+        else:
+            cursor.executemany(_STATS_UPSERT, [self._stats_values(habit, today) for habit in habits])
+
+    def _rebuild_stats(self, cursor: sqlite3.Cursor, today: date):
+        """
+        Recomputes every habit_stats row from the habits and completions tables in one statement.
+
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the ongoing write.
+            today (date): Day the expected periods are counted up to.
+        """
+        cursor.execute("DELETE FROM habit_stats")
+        cursor.execute(self._STREAK_ISLANDS + """
+            , totals AS (
+                SELECT habit_id, COUNT(*) AS completions, MAX(day) AS last_completion
+                FROM completions
+                GROUP BY habit_id
+            ),
+            longest AS (
+                SELECT habit_id, MAX(streak) AS streak FROM islands GROUP BY habit_id
+            ),
+            periods AS (
+                SELECT id, periodicity, CAST(julianday(:today) - julianday(creation_date) AS INTEGER) AS delta
+                FROM habits
+            )
+            INSERT INTO habit_stats
+                (habit_id, completions, last_completion, current_streak, longest_streak, expected_periods, as_of)
+            SELECT h.id,
+                   COALESCE(t.completions, 0),
+                   t.last_completion,
+                   COALESCE(h.current_streak, 0),
+                   COALESCE(l.streak, 0),
+                   CASE
+                       WHEN p.periodicity NOT IN ('daily', 'weekly') THEN 1
+                       WHEN p.delta < 0 THEN 0
+                       WHEN p.periodicity = 'daily' THEN p.delta + 1
+                       ELSE p.delta / 7 + 1
+                   END,
+                   :today
+            FROM habits h
+            JOIN periods p ON p.id = h.id
+            LEFT JOIN totals t ON t.habit_id = h.id
+            LEFT JOIN longest l ON l.habit_id = h.id
+        """, {"today": today.isoformat()})
+
+    def _refresh_current_streaks(self, cursor: sqlite3.Cursor, today: date) -> int:
+        """
+        Recomputes habits.current_streak from the completions table, raising
+        the version of every habit whose stored streak was wrong.
+
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the ongoing write.
+            today (date): Day a lapsed streak is counted as broken on.
+
+        Returns:
+            int: Number of habits whose streak changed.
+        """
+        streaks = cursor.execute(self._CURRENT_STREAKS, {"today": today.isoformat()}).fetchall()
+        cursor.executemany(
+            "UPDATE habits SET current_streak=?, version=version + 1 WHERE id=? AND current_streak IS NOT ?",
+            [(streak, habit_id, streak) for habit_id, streak in streaks]
+        )
+        return cursor.rowcount
+
+    def rebuild_stats(self, today: Optional[date] = None) -> int:
+        """
+        Recomputes the current streaks and the habit_stats table from the
+        stored history, e.g. after the database was edited by other tools.
+
+        Args:
+            today (Optional[date]): Day the expected periods are counted up to. Defaults to today.
+
+        Returns:
+            int: Number of habits whose statistics were rebuilt.
+        """
+        today = today or date.today()
+        with self._write() as conn:
+            cursor = conn.cursor()
+            self._begin()
+            try:
+                changed = self._refresh_current_streaks(cursor, today)
+                self._rebuild_stats(cursor, today)
+                count = cursor.execute("SELECT COUNT(*) FROM habit_stats").fetchone()[0]
+                self._commit()
+            except Exception:
+                self._rollback()
+                raise
+        if changed and self.cache is not None:
+            # Cached instances still hold the old streaks.
+            self.cache.clear()
+        return count
+
+    def get_habit_stats(self, habit_id: int) -> Optional[Dict[str, object]]:
+        """
+        Returns the stored statistics of one habit.
+
+        Args:
+            habit_id (int): The habit ID.
+
+        Returns:
+            Optional[Dict[str, object]]: completions, last_completion (date or None),
+            current_streak, longest_streak, expected_periods and as_of (date), or None.
+        """
+        with self._read() as conn:
+            row = conn.execute("""
+                SELECT completions, last_completion, current_streak, longest_streak, expected_periods, as_of
+                FROM habit_stats WHERE habit_id=?
+            """, (habit_id,)).fetchone()
+        if row is None:
+            return None
+        completions, last, current, longest, expected, as_of = row
+        return {"completions": completions, "last_completion": date.fromisoformat(last) if last else None,
+                "current_streak": current, "longest_streak": longest, "expected_periods": expected,
+                "as_of": date.fromisoformat(as_of)}
+
+    def expire_streaks(self, today: Optional[date] = None) -> int:
+        """
+        Resets the current streak of every habit whose period passed without a completion.
+
+        A streak has lapsed once more than one period (1 day for daily habits,
+        7 otherwise) separates the last completion from ``today``. The habits
+        are updated with one set-based statement, and every habit_stats row
+        gets the new streak and the expected periods as of ``today``. The
+        result only depends on ``today``, so after downtime a single call
+        catches up on all missed days.
+
+        Args:
+            today (Optional[date]): Evaluation date. Defaults to today.
+
+        Returns:
+            int: Number of habits whose streak was reset.
+        """
+        today = today or date.today()
+        with self._write() as conn:
+            cursor = conn.cursor()
+            self._begin()
+            try:
+                # The MAX(day) lookups are answered by the (habit_id, day) primary key.
+                cursor.execute("""
+                    UPDATE habits SET current_streak = 0, version = version + 1
+                    WHERE current_streak > 0
+                      AND COALESCE((SELECT MAX(day) FROM completions WHERE habit_id = habits.id), '')
+                          < CASE periodicity WHEN 'daily' THEN :daily_cutoff ELSE :weekly_cutoff END
+                """, {"daily_cutoff": (today - timedelta(days=1)).isoformat(),
+                      "weekly_cutoff": (today - timedelta(days=7)).isoformat()})
+                expired = cursor.rowcount
+                cursor.execute("""
+                    UPDATE habit_stats SET (current_streak, expected_periods, as_of) = (
+                        SELECT COALESCE(h.current_streak, 0),
+                               CASE
+                                   WHEN h.periodicity NOT IN ('daily', 'weekly') THEN 1
+                                   WHEN julianday(:today) < julianday(h.creation_date) THEN 0
+                                   WHEN h.periodicity = 'daily'
+                                       THEN CAST(julianday(:today) - julianday(h.creation_date) AS INTEGER) + 1
+                                   ELSE CAST(julianday(:today) - julianday(h.creation_date) AS INTEGER) / 7 + 1
+                               END,
+                               :today
+                        FROM habits h WHERE h.id = habit_stats.habit_id
+                    )
+                """, {"today": today.isoformat()})
+                self._commit()
+            except Exception:
+                self._rollback()
+                raise
+        if expired and self.cache is not None:
+            # Cached instances still hold the old streaks.
+            self.cache.clear()
+        return expired
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """
+        Reads a value from the meta table of tracker settings and job state.
+
+        Args:
+            key (str): Setting name.
+
+        Returns:
+            Optional[str]: The stored value, or None if it was never set.
+        """
+        with self._read() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def database_id(self) -> str:
+        """
+        Returns the random ID given to this database when it was created or migrated.
+
+        (habit id, version) pairs only identify a habit state within one
+        database; caches kept outside it also check this ID.
+
+        Returns:
+            str: A UUID in hex form.
+        """
+        return self.get_meta(DATABASE_ID_KEY)
+
+    def set_meta(self, key: str, value: str):
+        """
+        Stores a value in the meta table.
+
+        Args:
+            key (str): Setting name.
+            value (str): New value.
+        """
+        with self._write() as conn:
+            self._begin()
+            try:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+                self._commit()
+            except Exception:
+                self._rollback()
+                raise
 
     def save_habit(self, habit: Habit):
         """
         Saves a habit to the database.
 
+        Only completion days that differ from what is already stored are
+        written, so re-saving an unchanged habit touches a single row.
+
         Args:
             habit (Habit): The habit to save.
         """
 
-        cursor = self.conn.cursor()
-        dates_str = ",".join([d.isoformat() for d in habit.completion_dates])
+        with self._write() as conn:
+            cursor = conn.cursor()
+            new = habit.id is None
+            self._begin()
+            try:
+                if new:
+                    cursor.execute(f"""
+                        INSERT INTO habits (name, normalized_name, periodicity, creation_date, current_streak, completion_bitmap,
+                                            version)
+                        VALUES (?, ?, ?, ?, ?, ?, {_NEW_VERSION})
+                    """, self._habit_values(habit))
+                    habit.id = cursor.lastrowid
+                    stored = set()
+                else:
+                    cursor.execute("""
+                        UPDATE habits
+                        SET name=?, normalized_name=?, periodicity=?, creation_date=?, current_streak=?, completion_bitmap=?,
+                            version=version + 1
+                        WHERE id=?
+                    """, self._habit_values(habit) + (habit.id,))
+                    cursor.execute("SELECT day FROM completions WHERE habit_id=?", (habit.id,))
+                    stored = {row[0] for row in cursor.fetchall()}
+
+                wanted = {d.isoformat() for d in habit.completion_dates}
+                cursor.executemany(
+                    "DELETE FROM completions WHERE habit_id=? AND day=?",
+                    [(habit.id, d) for d in stored - wanted]
+                )
+                cursor.executemany(
+                    "INSERT INTO completions (habit_id, day) VALUES (?, ?)",
+                    [(habit.id, d) for d in wanted - stored]
+                )
+                self._write_stats(cursor, [habit])
+                self._commit()
+            except Exception:
+                # Also releases the write lock an IntegrityError would otherwise leave open.
+                self._rollback()
+                if new:
+                    habit.id = None
+                raise
+            if self.cache is not None:
+                self.cache.put(habit)
+
+    def add_completion(self, habit: Habit, day: date) -> bool:
+        """
+        Appends one completion for a habit that is already stored, together
+        with its refreshed streak and bitmap. This is the write path used by check-ins.
+
+        Work stays independent of the history length: only the bitmap byte
+        holding ``day`` is written, and for a day later than every other
+        completion the statistics are advanced rather than recomputed.
+
+        If the write fails, the habit is evicted from the cache: the caller has
+        already marked the day on this instance, so it no longer matches the
+        stored row and would report the day as completed.
+
+        Args:
+            habit (Habit): The stored habit, already updated in memory.
+            day (date): The completed day.
+
+        Returns:
+            bool: True if the day was recorded, False if it was already stored.
+        """
+        try:
+            return self._store_completion(habit, day)
+        except Exception:
+            if self.cache is not None:
+                self.cache.evict(habit.id)
+            raise
+
+    def _store_completion(self, habit: Habit, day: date) -> bool:
+        """
+        Writes one completion for add_completion().
+        """
+        with self._write() as conn:
+            cursor = conn.cursor()
+            self._begin()
+            try:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO completions (habit_id, day) VALUES (?, ?)",
+                    (habit.id, day.isoformat())
+                )
+                inserted = cursor.rowcount > 0
+                if self._patch_bitmap(conn, habit, day):
+                    cursor.execute(
+                        "UPDATE habits SET current_streak=?, version=version + 1 WHERE id=?",
+                        (habit.current_streak, habit.id)
+                    )
+                else:
+                    cursor.execute(
+                        "UPDATE habits SET current_streak=?, completion_bitmap=?, version=version + 1 WHERE id=?",
+                        (habit.current_streak, habit.completions.to_bytes(_BITMAP_SPARE_BYTES), habit.id)
+                    )
+
+                today = date.today()
+                advanced = False
+                if day == habit.completions.last():
+                    cursor.execute(_STATS_CHECK_IN, {
+                        "id": habit.id, "inserted": int(inserted), "day": day.isoformat(),
+                        "streak": habit.current_streak or 0, "expected": habit.expected_periods(today),
+                        "today": today.isoformat(),
+                    })
+                    advanced = cursor.rowcount > 0
+                if not advanced:
+                    # An earlier day can merge runs, and a missing row has nothing to advance.
+                    self._write_stats(cursor, [habit])
+                self._commit()
+            except Exception:
+                self._rollback()
+                raise
+            if self.cache is not None:
+                self.cache.put(habit)
+            return inserted
+
+    @staticmethod
+    def _patch_bitmap(conn: sqlite3.Connection, habit: Habit, day: date) -> bool:
+        """
+        Writes the bitmap byte holding ``day`` into the stored BLOB in place.
+
+        Returns:
+            bool: False if the stored BLOB has another origin, is too short or
+            is missing, in which case the whole bitmap has to be written.
+        """
+        header, position, value = habit.completions.stored_byte(day)
+        try:
+            with conn.blobopen("habits", "completion_bitmap", habit.id) as blob:
+                if position >= len(blob) or blob.read(len(header)) != header:
+                    return False
+                blob.seek(position)
+                blob.write(bytes((value,)))
+        except sqlite3.OperationalError:
+            # No row, or a NULL bitmap.
+            return False
+        return True
+
+    def save_habits(self, habits: Iterable[Habit], batch_size: int = 1000) -> int:
+        """
+        Saves many habits in a single transaction.
+
+        Habits are consumed from the iterable in batches of ``batch_size`` and
+        written with executemany. New habits get their IDs assigned just like
+        with save_habit(). If any row fails (for example a duplicate name),
+        nothing from the call is kept.
+
+        Args:
+            habits (Iterable[Habit]): Habits to insert or update.
+            batch_size (int): Number of habits written per executemany round.
+
+        Returns:
+            int: Number of habits saved.
+        """
+        with self._write() as conn:
+            cursor = conn.cursor()
+            saved = 0
+            assigned: List[Habit] = []
+            self._begin()
+            try:
+                for batch in iter_batches(habits, batch_size):
+                    new = [h for h in batch if h.id is None]
+                    existing = [h for h in batch if h.id is not None]
+
+                    # IDs are handed out up front so one executemany can insert the whole batch.
+                    next_id = cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM habits").fetchone()[0]
+                    for offset, habit in enumerate(new):
+                        habit.id = next_id + offset
+                    assigned.extend(new)
+                    cursor.executemany(f"""
+                        INSERT INTO habits (id, name, normalized_name, periodicity, creation_date, current_streak,
+                                            completion_bitmap, version)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, {_NEW_VERSION})
+                    """, [(h.id,) + self._habit_values(h) for h in new])
+
+                    cursor.executemany("""
+                        UPDATE habits
+                        SET name=?, normalized_name=?, periodicity=?, creation_date=?, current_streak=?, completion_bitmap=?,
+                        version=version + 1
+                        WHERE id=?
+                    """, [self._habit_values(h) + (h.id,) for h in existing])
+                    cursor.executemany("DELETE FROM completions WHERE habit_id=?", [(h.id,) for h in existing])
+                    cursor.executemany(
+                        "INSERT INTO completions (habit_id, day) VALUES (?, ?)",
+                        [(h.id, d.isoformat()) for h in batch for d in h.completions]
+                    )
+                    self._write_stats(cursor, batch)
+
+                    if self.cache is not None:
+                        for habit in batch:
+                            self.cache.put(habit)
+                    saved += len(batch)
+                self._commit()
+            except Exception:
+                self._rollback()
+                for habit in assigned:
+                    habit.id = None
+                raise
+            return saved
+
+    def add_completions(self, completions: Iterable[Tuple[int, date]], batch_size: int = 1000) -> int:
+        """
+        Records many (habit_id, day) check-ins in a single transaction.
+
+        Completions for unknown habit IDs are skipped. Each affected habit's
+        bitmap and streak are refreshed once per batch.
+
+        Args:
+            completions (Iterable[Tuple[int, date]]): Habit IDs and completed days.
+            batch_size (int): Number of check-ins handled per executemany round.
+
+        Returns:
+            int: Number of completions that were not stored before.
+        """
+        with self._write() as conn:
+            cursor = conn.cursor()
+            inserted = 0
+            self._begin()
+            try:
+                for batch in iter_batches(completions, batch_size):
+                    days_by_habit: Dict[int, List[date]] = {}
+                    for habit_id, day in batch:
+                        days_by_habit.setdefault(habit_id, []).append(day)
+
+                    habits = [h for h in map(self.get_habit_by_id, days_by_habit) if h is not None]
+                    cursor.executemany(
+                        "INSERT OR IGNORE INTO completions (habit_id, day) VALUES (?, ?)",
+                        [(h.id, d.isoformat()) for h in habits for d in days_by_habit[h.id]]
+                    )
+                    inserted += cursor.rowcount
+
+                    for habit in habits:
+                        for day in days_by_habit[habit.id]:
+                            habit.completions.add(day)
+                        habit.update_streak()
+                    cursor.executemany(
+                        "UPDATE habits SET current_streak=?, completion_bitmap=?, version=version + 1 WHERE id=?",
+                        [(h.current_streak, h.completions.to_bytes(), h.id) for h in habits]
+                    )
+                    self._write_stats(cursor, habits)
+                self._commit()
+            except Exception:
+                self._rollback()
+                raise
+            return inserted
+
 
-        if habit.id is None:
-           cursor.execute("""
-            INSERT INTO habits (name, periodicity, creation_date, completion_dates, current_streak)
-            VALUES (?, ?, ?, ?, ?)
-        """,(habit.name, habit.periodicity, habit.creation_date.isoformat(), dates_str, habit.current_streak)) 
-           habit.id = cursor.lastrowid
-        else:
-            cursor.execute("""
-                UPDATE habits 
-                SET name=?, periodicity=?, creation_date=?, completion_dates=?, current_streak=?
-                WHERE id=?
-        """,(habit.name, habit.periodicity, habit.creation_date.isoformat(), dates_str, habit.current_streak, habit.id))
-
-        self.conn.commit()
-                            
-    
     def load_habits(self) -> List[Habit]:
         """
-        Loads all habits from the database.
+        Loads all habits from the database. Completion history is decoded
+        lazily, the first time a habit's completions are used.
 
         Returns:
             List[Habit]: List of Habit instances.
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT id, name, periodicity,  creation_date, completion_dates, current_streak FROM habits")
-        rows = cursor.fetchall()
-        habits = []
-        for row in rows:
-          id, name, periodicity, creation_date, dates_str, streak = row
-          dates = [date.fromisoformat(d) for d in dates_str.split(",") if d]
-          habit = Habit(id=id, name=name, periodicity=periodicity, creation_date=date.fromisoformat(creation_date))
-          habit.completion_dates = dates
-          habit.current_streak = streak
-          habits.append(habit)
+        if self.cache is not None and self.cache.complete:
+            return self.cache.all()
+
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {_HABIT_COLUMNS} FROM habits"
+            )
+            habits = [self._habit_from_row(row) for row in cursor.fetchall()]
+            if self.cache is not None:
+                self.cache.record_full_load(len(habits))
+            return habits
+
+
+    def iter_habits(self, batch_size: int = 1000, periodicity: Optional[str] = None) -> Iterator[Habit]:
+        """
+        Streams habits in ID order, fetching ``batch_size`` rows at a time.
+
+        Unlike load_habits(), only one batch of rows is held at once, and the
+        first habit is available as soon as its batch has been read. Completion
+        history is decoded lazily, as with load_habits().
+
+        Args:
+            batch_size (int): Rows fetched from SQLite at a time.
+            periodicity (Optional[str]): Only stream 'daily' or 'weekly' habits. Defaults to all.
+
+        Yields:
+            Habit: One Habit instance per stored habit.
+        """
+        query = f"SELECT {_HABIT_COLUMNS} FROM habits"
+        params: tuple = ()
+        if periodicity is not None:
+            query += " WHERE periodicity=?"
+            params = (periodicity,)
+        with self._read() as conn:
+            cursor = conn.execute(query + " ORDER BY id", params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield self._habit_from_row(row)
+
+    def load_habits_between(self, first_id: int, last_id: int) -> List[Habit]:
+        """
+        Loads the habits whose IDs lie in a range, e.g. one shard of id_shards().
+
+        Args:
+            first_id (int): Lowest habit ID (inclusive).
+            last_id (int): Highest habit ID (inclusive).
+
+        Returns:
+            List[Habit]: Habit instances in ID order.
+        """
+        with self._read() as conn:
+            rows = conn.execute(f"SELECT {_HABIT_COLUMNS} FROM habits WHERE id BETWEEN ? AND ? ORDER BY id",
+                                (first_id, last_id)).fetchall()
+        return [self._habit_from_row(row) for row in rows]
+
+    def load_habits_by_ids(self, habit_ids: Iterable[int], batch_size: int = 500) -> List[Habit]:
+        """
+        Loads the habits with the given IDs, a batch of IDs per query.
+
+        Args:
+            habit_ids (Iterable[int]): IDs to load; unknown IDs are skipped.
+            batch_size (int): IDs per query, below SQLite's bound-parameter limit.
+
+        Returns:
+            List[Habit]: Habit instances in ID order.
+        """
+        habits: List[Habit] = []
+        with self._read() as conn:
+            for batch in iter_batches(sorted(set(habit_ids)), batch_size):
+                placeholders = ", ".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT {_HABIT_COLUMNS} FROM habits WHERE id IN ({placeholders}) ORDER BY id", batch
+                ).fetchall()
+                habits.extend(self._habit_from_row(row) for row in rows)
         return habits
 
-    
+    def habit_versions(self) -> List[Tuple[int, int]]:
+        """
+        Lists every habit's version, which each write to the habit increases.
+
+        Versions of new habits start above those of all deleted habits, so an
+        (id, version) pair always identifies the same stored state.
+
+        Returns:
+            List[Tuple[int, int]]: (id, version) rows in ID order.
+        """
+        with self._read() as conn:
+            return conn.execute("SELECT id, version FROM habits ORDER BY id").fetchall()
+
+    def id_shards(self, chunk_size: int) -> List[Tuple[int, int]]:
+        """
+        Splits the habits into consecutive ID ranges of ``chunk_size`` habits each.
+
+        Gaps left by deleted habits do not unbalance the shards, as the
+        bounds are taken from the stored IDs.
+
+        Args:
+            chunk_size (int): Habits per shard (the last shard may hold fewer).
+
+        Returns:
+            List[Tuple[int, int]]: (first_id, last_id) of every shard, inclusive, in ID order.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        with self._read() as conn:
+            rows = conn.execute("""
+                SELECT MIN(id), MAX(id)
+                FROM (SELECT id, (ROW_NUMBER() OVER (ORDER BY id) - 1) / ? AS shard FROM habits)
+                GROUP BY shard
+                ORDER BY shard
+            """, (chunk_size,)).fetchall()
+        return [tuple(row) for row in rows]
+
+    def list_habit_summaries(self, periodicity: Optional[str] = None) -> List[HabitSummary]:
+        """
+        Lists habits for display without building Habit objects or reading
+        completion history.
+
+        Args:
+            periodicity (Optional[str]): Only list 'daily' or 'weekly' habits. Defaults to all.
+
+        Returns:
+            List[HabitSummary]: (id, name, periodicity, current_streak) rows in ID order.
+        """
+        query = "SELECT id, name, periodicity, current_streak FROM habits"
+        params: tuple = ()
+        if periodicity is not None:
+            query += " WHERE periodicity=?"
+            params = (periodicity,)
+        with self._read() as conn:
+            rows = conn.execute(query + " ORDER BY id", params).fetchall()
+        return [HabitSummary._make(row) for row in rows]
+
+    def habit_windows(self, start: date, end: date, periodicity: Optional[str] = None,
+                      habit_id: Optional[int] = None) -> List[HabitWindow]:
+        """
+        Reads the completions of every habit between two dates, without loading full histories.
+
+        Each habit's rows are found with a range seek on the (habit_id, day)
+        primary key, so the cost depends on the number of habits and of
+        completions inside the window, not on how long the histories are.
+        Habits created after ``end`` are left out.
+
+        Args:
+            start (date): First day of the window.
+            end (date): Last day of the window (inclusive).
+            periodicity (Optional[str]): Only habits with this periodicity.
+            habit_id (Optional[int]): Only this habit.
+
+        Returns:
+            List[HabitWindow]: One entry per habit in ID order, with its completed days in ascending order.
+        """
+        query = """
+            SELECT h.id, h.name, h.periodicity, h.creation_date, c.day
+            FROM habits h
+            LEFT JOIN completions c ON c.habit_id = h.id AND c.day BETWEEN :start AND :end
+            WHERE h.creation_date <= :end
+        """
+        params = {"start": start.isoformat(), "end": end.isoformat()}
+        if periodicity is not None:
+            query += " AND h.periodicity = :periodicity"
+            params["periodicity"] = periodicity
+        if habit_id is not None:
+            query += " AND h.id = :habit_id"
+            params["habit_id"] = habit_id
+        query += " ORDER BY h.id, c.day"
+
+        windows: List[HabitWindow] = []
+        with self._read() as conn:
+            for id, name, habit_periodicity, creation_date, day in conn.execute(query, params):
+                if not windows or windows[-1].id != id:
+                    windows.append(HabitWindow(id, name, habit_periodicity, date.fromisoformat(creation_date), []))
+                if day is not None:
+                    windows[-1].days.append(date.fromisoformat(day))
+        return windows
+
     def get_all_habits(self) -> List[Habit]:
         """
         Returns all habits from the database (alias for the load_habits).
@@ -96,53 +1102,340 @@ class DatabaseConnector:
 
         Returns:
         The habit if it exists, otherwise None.
-        
+
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT id, name , periodicity, creation_date, completion_dates, current_streak FROM habits Where id=?",
-            (habit_id,)
-        )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        id, name, periodicity, creation_date, dates_str, streak = row
-        completion_dates = [date.fromisoformat(d) for d in dates_str.split(",") if d]
-    
-        habit = Habit(id=id, name=name, periodicity=periodicity, creation_date=date.fromisoformat(creation_date))
-        habit.completion_dates = completion_dates
-        habit.current_streak = streak
-        return habit
-    
+        if self.cache is not None:
+            cached = self.cache.get(habit_id)
+            if cached is not None:
+                return cached
+            if self.cache.complete:
+                return None
+
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {_HABIT_COLUMNS} FROM habits WHERE id=?",
+                (habit_id,)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return self._habit_from_row(row)
+
+
+    def find_habit(self, name: str, periodicity: str) -> Optional[Habit]:
+        """
+        Looks up a habit by name (ignoring case and surrounding spaces) and periodicity.
+        Answered from the (normalized_name, periodicity) index.
+
+        Args:
+            name (str): The habit name.
+            periodicity (str): 'daily' or 'weekly'.
+
+        Returns:
+            Optional[Habit]: The matching habit, or None.
+        """
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {_HABIT_COLUMNS} FROM habits WHERE normalized_name=? AND periodicity=? LIMIT 1",
+                (normalize_name(name), periodicity)
+            )
+            row = cursor.fetchone()
+            return self._habit_from_row(row) if row else None
+
+    def habit_name_exists(self, name: str) -> bool:
+        """
+        Checks whether any habit, whatever its periodicity, uses this name.
+
+        Args:
+            name (str): The habit name.
+
+        Returns:
+            bool: True if a habit with the same normalized name exists.
+        """
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM habits WHERE normalized_name=? LIMIT 1", (normalize_name(name),))
+            return cursor.fetchone() is not None
 
     def delete_habit(self, habit_id: int) -> bool:
         """
-        Deletes a habit from the database by its ID.
- 
+        Deletes a habit and its completion history from the database by its ID.
+
         Args:
             habit_id (int): The unique identifier of the habit to delete.
 
         Returns:
             bool: True if the habit was deleted successfully, False if no such habit exists.
         """
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM habits WHERE id = ?", (habit_id,))
-        self.conn.commit()
+        with self._write() as conn:
+            cursor = conn.cursor()
+            self._begin()
+            try:
+                cursor.execute("""
+                    INSERT OR REPLACE INTO meta (key, value)
+                    SELECT 'retired_habit_version',
+                           MAX(version, COALESCE((SELECT CAST(value AS INTEGER) FROM meta
+                                                  WHERE key = 'retired_habit_version'), 0))
+                    FROM habits WHERE id = ?
+                """, (habit_id,))
+                cursor.execute("DELETE FROM habits WHERE id = ?", (habit_id,))
+                deleted = cursor.rowcount > 0
+                cursor.execute("DELETE FROM completions WHERE habit_id = ?", (habit_id,))
+                cursor.execute("DELETE FROM habit_stats WHERE habit_id = ?", (habit_id,))
+                self._commit()
+            except Exception:
+                self._rollback()
+                raise
+            if self.cache is not None:
+                self.cache.evict(habit_id)
 
-        if cursor.rowcount > 0:
-            return True # Habit deleted successsfully
-        else:
-            return False #  Habit not found
-        
+            if deleted:
+                return True # Habit deleted successsfully
+            else:
+                return False #  Habit not found
 
+    def iter_habit_records(self, batch_size: int = 1000) -> Iterator[Tuple[int, str, str, str]]:
+        """
+        Streams (id, name, periodicity, creation_date) rows in ID order without building Habit objects.
 
+        Args:
+            batch_size (int): Rows fetched from SQLite at a time.
 
-         
-        
+        Yields:
+            Tuple[int, str, str, str]: One row per habit; creation_date is ISO formatted.
+        """
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, name, periodicity, creation_date FROM habits ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
 
-        
+    def iter_habit_completion_records(self, batch_size: int = 1000) -> Iterator[Tuple[int, str, str, str, Optional[str]]]:
+        """
+        Streams every habit joined with its completions, ordered by habit ID and day,
+        through a single cursor (and so a single pooled reader).
 
+        Args:
+            batch_size (int): Rows fetched from SQLite at a time.
 
-      
+        Yields:
+            Tuple[int, str, str, str, Optional[str]]: (id, name, periodicity, creation_date, day)
+            per completion, with day None for a habit without completions; dates are ISO formatted.
+        """
+        with self._read() as conn:
+            cursor = conn.cursor()
+            # Habits are scanned in rowid order and completions come from their
+            # (habit_id, day) primary key, so no sort is needed.
+            cursor.execute("""
+                SELECT h.id, h.name, h.periodicity, h.creation_date, c.day
+                FROM habits h
+                LEFT JOIN completions c ON c.habit_id = h.id
+                ORDER BY h.id, c.day
+            """)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
 
+    def iter_completion_records(self, batch_size: int = 1000) -> Iterator[Tuple[int, str]]:
+        """
+        Streams every (habit_id, day) completion ordered by habit ID and day.
+
+        Args:
+            batch_size (int): Rows fetched from SQLite at a time.
+
+        Yields:
+            Tuple[int, str]: Habit ID and ISO formatted day.
+        """
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT habit_id, day FROM completions ORDER BY habit_id, day")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
 
+    # SQL ANALYTICS
+    # These queries work on the stored rows directly, so reports over large
+    # databases never build Habit objects or decode completion history.
+
+    # Gaps-and-islands: a new island starts at a habit's first completion and
+    # after every gap wider than one period; an island's streak is 1 plus the
+    # number of exact one-period steps inside it (see Habit.update_streak).
+    _STREAK_ISLANDS = """
+        WITH ordered AS (
+            SELECT c.habit_id,
+                   c.day,
+                   CASE h.periodicity WHEN 'daily' THEN 1 ELSE 7 END AS gap_days,
+                   CAST(julianday(c.day) AS INTEGER)
+                     - LAG(CAST(julianday(c.day) AS INTEGER)) OVER (PARTITION BY c.habit_id ORDER BY c.day) AS gap
+            FROM completions c
+            JOIN habits h ON h.id = c.habit_id
+        ),
+        marked AS (
+            SELECT habit_id, day, gap, gap_days,
+                   SUM(CASE WHEN gap IS NULL OR gap > gap_days THEN 1 ELSE 0 END)
+                     OVER (PARTITION BY habit_id ORDER BY day ROWS UNBOUNDED PRECEDING) AS island
+            FROM ordered
+        ),
+        islands AS (
+            SELECT habit_id, island, 1 + SUM(CASE WHEN gap = gap_days THEN 1 ELSE 0 END) AS streak,
+                   MAX(day) AS last_day, MAX(gap_days) AS gap_days
+            FROM marked
+            GROUP BY habit_id, island
+        )
+    """
+
+    # (habit id, current streak) as of :today: the last island's streak, or 0 once it lapsed.
+    _CURRENT_STREAKS = _STREAK_ISLANDS + """
+        , latest AS (
+            SELECT habit_id, streak, last_day, gap_days,
+                   ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY island DESC) AS position
+            FROM islands
+        )
+        SELECT h.id,
+               CASE WHEN julianday(:today) - julianday(l.last_day) <= l.gap_days THEN l.streak ELSE 0 END
+        FROM habits h
+        LEFT JOIN latest l ON l.habit_id = h.id AND l.position = 1
+        ORDER BY h.id
+    """
+
+    def count_habits(self) -> int:
+        """
+        Returns the number of stored habits.
+        """
+        with self._read() as conn:
+            return conn.execute("SELECT COUNT(*) FROM habits").fetchone()[0]
+
+    def completion_counts(self) -> Dict[int, int]:
+        """
+        Counts the completions of every habit.
+
+        Returns:
+            Dict[int, int]: Completion count per habit ID, in ID order.
+        """
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT h.id, COUNT(c.day)
+                FROM habits h
+                LEFT JOIN completions c ON c.habit_id = h.id
+                GROUP BY h.id
+                ORDER BY h.id
+            """)
+            return dict(cursor.fetchall())
+
+    def success_rates(self, today: Optional[date] = None) -> Dict[int, float]:
+        """
+        Computes every habit's completion rate since creation, as a percentage.
+        Matches analysis.success_rates for the same habits.
+
+        Reads one habit_stats row per habit: the stored expected-period count
+        is used when it was written for the same day, otherwise it is
+        derived from the creation date.
+
+        Args:
+            today (Optional[date]): Evaluation date. Defaults to today.
+
+        Returns:
+            Dict[int, float]: Success rate per habit ID, in ID order.
+        """
+        today = today or date.today()
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                WITH periods AS (
+                    SELECT h.id,
+                           h.periodicity,
+                           CAST(julianday(:today) - julianday(h.creation_date) AS INTEGER) AS delta,
+                           COALESCE(s.completions, 0) AS completed,
+                           s.expected_periods,
+                           s.as_of
+                    FROM habits h
+                    LEFT JOIN habit_stats s ON s.habit_id = h.id
+                )
+                SELECT id,
+                       CASE
+                           WHEN as_of = :today AND expected_periods > 0 THEN completed * 1.0 / expected_periods * 100
+                           WHEN as_of = :today THEN 0.0
+                           WHEN delta < 0 AND periodicity IN ('daily', 'weekly') THEN 0.0
+                           WHEN periodicity = 'daily' THEN completed * 1.0 / (delta + 1) * 100
+                           WHEN periodicity = 'weekly' THEN completed * 1.0 / (delta / 7 + 1) * 100
+                           ELSE completed * 100.0
+                       END
+                FROM periods
+                ORDER BY id
+            """, {"today": today.isoformat()})
+            return dict(cursor.fetchall())
+
+    def current_streaks(self, today: Optional[date] = None) -> Dict[int, int]:
+        """
+        Recomputes every habit's current streak from its stored completions.
+
+        Args:
+            today (Optional[date]): Evaluation date. Defaults to today.
+
+        Returns:
+            Dict[int, int]: Streak per habit ID, as Habit.update_streak(today) would set it.
+        """
+        today = today or date.today()
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self._CURRENT_STREAKS, {"today": today.isoformat()})
+            return dict(cursor.fetchall())
+
+    def longest_streaks(self) -> Dict[int, int]:
+        """
+        Finds the longest streak every habit has ever reached, from habit_stats.
+
+        Returns:
+            Dict[int, int]: Longest historical streak per habit ID.
+        """
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT h.id, COALESCE(s.longest_streak, 0)
+                FROM habits h
+                LEFT JOIN habit_stats s ON s.habit_id = h.id
+                ORDER BY h.id
+            """)
+            return dict(cursor.fetchall())
+
+    def top_longest_streak(self) -> Optional[Tuple[str, int]]:
+        """
+        Finds the habit with the longest streak ever reached, from habit_stats.
+
+        Returns:
+            Optional[Tuple[str, int]]: Habit name and streak (lowest ID wins ties),
+            or None if there are no habits.
+        """
+        with self._read() as conn:
+            row = conn.execute("""
+                SELECT h.name, COALESCE(s.longest_streak, 0) AS longest
+                FROM habits h
+                LEFT JOIN habit_stats s ON s.habit_id = h.id
+                ORDER BY longest DESC, h.id
+                LIMIT 1
+            """).fetchone()
+        return tuple(row) if row else None
+
+    def top_current_streak(self) -> Optional[Tuple[str, int]]:
+        """
+        Finds the habit with the highest stored current streak.
+
+        Returns:
+            Optional[Tuple[str, int]]: Habit name and streak (lowest ID wins ties),
+            or None if there are no habits.
+        """
+        with self._read() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name, current_streak FROM habits ORDER BY current_streak DESC, id LIMIT 1")
+            row = cursor.fetchone()
+            return tuple(row) if row else None
@@ -1,93 +1,189 @@
-from datetime import date, timedelta
-from habit import Habit
-
-""" 
+"""
 example_data.py
 
 Purpose: Provides sample habits for testing and demonstration
-of the Digital Detox Tracker project.
+of the Digital Detox Tracker project, and synthetic datasets of any
+size for load testing.
 
 It defines:
-5 digital detox habits (3 daily, 2 weekly),
-each with 4 weeks of sample completions
+get_example_habits(): 5 digital detox habits (3 daily, 2 weekly),
+each with 4 weeks of sample completions.
+generate_habits() / populate_database(): a seeded generator of
+realistic habits (steady and streaky daily habits, weekly cadence,
+abandoned habits) that is streamed into a database in batches.
 
-These examples help demonstrate how the Habit Tracker app stores,
-tracks, and analyzes habits.
+Nothing is built at import time. A large dataset can be created with:
+
+    python example_data.py --habits 100000 --history 730 --db load.db
 """
-# Create today's data reference
-today = date.today()
-
-# Daily Habit Example 
-daily_habit = Habit(
-    name="No Social Media After 9pm",
-    periodicity="daily",
-    creation_date=today - timedelta(days=28)
-)
-
-#Mark as completed for 28 consecutive days (4 weeks)
-for i in range(28):
-   daily_habit.completion_dates.append(today - timedelta(days=i))
-daily_habit.update_streak()
-
-
-# Weekly Habit Example
-weekly_habit = Habit( 
-    name="Screen-Free Sunday",
-    periodicity="weekly",
-    creation_date=today - timedelta(weeks=4)
-)
-
-#Mark as completed for the last 4 weeks
-for i in range(4):
-    weekly_habit.completion_dates.append(today - timedelta(weeks=i))
-weekly_habit.update_streak()
-
-#Additional Daily Habit
-daily_habit2 = Habit( 
-    name="No Phone During Meals",
-    periodicity="daily",
-    creation_date=today - timedelta(days=28)
-)
-for i in range (28):
-    daily_habit2.completion_dates.append(today - timedelta(days=i))
-daily_habit2.update_streak()
-
-#Additional Daily Habit
-daily_habit3 = Habit( 
-    name="Read Instead of Scrolling",
-    periodicity="daily",
-    creation_date=today - timedelta(days=28)
-)
-for i in range(28):
-    daily_habit3.completion_dates.append(today - timedelta(days=i))
-daily_habit3.update_streak()
-
-
-#Additional Habit
-weekly_habit2 = Habit(
-    name="No TV Saturday",
-    periodicity="weekly",
-    creation_date=today - timedelta(weeks=4)
-)
-for i in range(4):
-    weekly_habit2.completion_dates.append(today - timedelta(weeks=i))
-weekly_habit2.update_streak()
-
-    
-#Combine the habits into a list for easy import in other modules
-habits = [daily_habit, daily_habit2, daily_habit3, weekly_habit, weekly_habit2]
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import Iterator, Optional, Tuple
+
+from completion_bitmap import CompletionBitmap
+from db import DatabaseConnector, iter_batches
+from habit import Habit
+
+#EXAMPLE HABITS
 
 def get_example_habits():
     """
     Returns the example habits (daily and weekly) for testing and demonstration.
-    
+
     Returns:
-        list[Habit]: A list containing the 5 example Habit instances, 
+        list[Habit]: A list containing the 5 example Habit instances,
         with pre-filled completion dates.
-    """    
+    """
+    # Create today's data reference
+    today = date.today()
+
+    # Daily habits, completed for 28 consecutive days (4 weeks)
+    daily = ["No Social Media After 9pm", "No Phone During Meals", "Read Instead of Scrolling"]
+    # Weekly habits, completed for the last 4 weeks
+    weekly = ["Screen-Free Sunday", "No TV Saturday"]
+
+    habits = []
+    for name in daily:
+        habit = Habit(name=name, periodicity="daily", creation_date=today - timedelta(days=28))
+        habit.completion_dates = [today - timedelta(days=i) for i in range(28)]
+        habits.append(habit)
+    for name in weekly:
+        habit = Habit(name=name, periodicity="weekly", creation_date=today - timedelta(weeks=4))
+        habit.completion_dates = [today - timedelta(weeks=i) for i in range(4)]
+        habits.append(habit)
+
+    for habit in habits:
+        habit.update_streak()
     return habits
 
+#SYNTHETIC DATASETS
+
+# Completion patterns of generated habits and how often each one is picked.
+PATTERNS = {
+    "steady": 0.35,     # daily, done on most days with short lapses
+    "streaky": 0.25,    # daily, long runs separated by multi-day breaks
+    "weekly": 0.25,     # weekly, done on most creation-weekday anniversaries
+    "abandoned": 0.15,  # daily or weekly, then no completions after some point
+}
+
+_NAMES = ["No Phone After 9pm", "Screen-Free Breakfast", "No Social Media", "Read Instead of Scrolling",
+          "Phone-Free Walk", "No TV Saturday", "Screen-Free Sunday", "Notifications Off", "Offline Evening",
+          "No Phone in Bed"]
 
+def _pattern_days(rng: random.Random, pattern: str, periodicity: str, span: int) -> Iterator[int]:
+    """
+    Yields completed day offsets (from the creation date) for one habit.
+
+    Args:
+        rng (random.Random): Seeded source of randomness.
+        pattern (str): One of PATTERNS.
+        periodicity (str): 'daily' or 'weekly'.
+        span (int): Number of days from creation to today.
+    """
+    step = 1 if periodicity == "daily" else 7
+    if pattern == "abandoned":
+        # Keeps going for a while, then stops for good.
+        span = rng.randint(1, max(1, span // 2))
+        rate = 0.85
+    elif pattern == "weekly":
+        rate = 0.8
+    else:
+        rate = 0.9
+
+    if pattern != "streaky":
+        for offset in range(0, span, step):
+            if rng.random() < rate:
+                yield offset
+        return
+
+    offset = 0
+    while offset < span:
+        run = int(rng.expovariate(1 / 14)) + 1
+        yield from range(offset, min(offset + run, span))
+        offset += run + int(rng.expovariate(1 / 3)) + 1
+
+def generate_habits(count: int, seed: int = 0, history_days: int = 365,
+                    today: Optional[date] = None) -> Iterator[Habit]:
+    """
+    Lazily generates habits with realistic completion histories.
 
+    Each habit is created up to ``history_days`` before ``today`` and gets
+    a pattern drawn from PATTERNS. The same seed always yields the same habits.
 
+    Args:
+        count (int): Number of habits.
+        seed (int): Random seed.
+        history_days (int): Longest history a habit can have.
+        today (Optional[date]): Last day that can be completed. Defaults to today.
+
+    Yields:
+        Habit: Unsaved habits with completions and an up-to-date streak.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    patterns, weights = list(PATTERNS), list(PATTERNS.values())
+    for i in range(count):
+        pattern = rng.choices(patterns, weights)[0]
+        if pattern == "weekly" or (pattern == "abandoned" and rng.random() < 0.3):
+            periodicity = "weekly"
+        else:
+            periodicity = "daily"
+        span = rng.randint(1, history_days)
+        creation_date = today - timedelta(days=span)
+
+        # The index keeps names unique per periodicity, as the duplicate check requires.
+        habit = Habit(name=f"{rng.choice(_NAMES)} #{i + 1}", periodicity=periodicity, creation_date=creation_date)
+        habit.completions = CompletionBitmap.from_offsets(creation_date, _pattern_days(rng, pattern, periodicity, span + 1))
+        habit.update_streak(today)
+        yield habit
+
+def populate_database(db: DatabaseConnector, count: int, seed: int = 0, history_days: int = 365,
+                      batch_size: int = 1000, today: Optional[date] = None) -> Tuple[int, int]:
+    """
+    Streams generated habits into a database, one transaction per batch.
 
+    Only one batch of habits is held in memory at a time, so datasets with
+    tens of millions of completions can be produced.
+
+    Args:
+        db (DatabaseConnector): Destination database (use an empty one to
+            avoid clashes with existing names).
+        count (int): Number of habits.
+        seed (int): Random seed.
+        history_days (int): Longest history a habit can have.
+        batch_size (int): Habits written per transaction.
+        today (Optional[date]): Last day that can be completed. Defaults to today.
+
+    Returns:
+        Tuple[int, int]: Number of habits and of completions written.
+    """
+    habits = completions = 0
+    for batch in iter_batches(generate_habits(count, seed, history_days, today), batch_size):
+        db.save_habits(batch, batch_size)
+        habits += len(batch)
+        completions += sum(habit.completion_count for habit in batch)
+    return habits, completions
+
+def main():
+    """
+    Command-line entry point: writes a synthetic dataset to a database file.
+    """
+    parser = argparse.ArgumentParser(description="Generate a synthetic Digital Detox Tracker dataset")
+    parser.add_argument("--habits", type=int, default=10_000)
+    parser.add_argument("--history", type=int, default=365, help="longest history in days (default: 365)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", default="synthetic.db", help="database file (default: synthetic.db)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = DatabaseConnector(args.db, profile="fast")
+    started = time.perf_counter()
+    habits, completions = populate_database(db, args.habits, args.seed, args.history, args.batch_size)
+    db.close()
+    print(f"{habits} habits with {completions} completions written to {args.db} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
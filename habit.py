@@ -1,5 +1,42 @@
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import Iterable, List, Optional
+from completion_bitmap import CompletionBitmap
+from streak_index import StreakIndex
+
+# Periodicities accepted when creating a habit.
+PERIODICITIES = ("daily", "weekly")
+
+class CompletionDateList(list):
+    """
+    The list returned by Habit.completion_dates: a copy of the completion
+    history whose in-place changes (append, remove, del, ...) are written
+    back to the habit, as they were when completion_dates was a plain list.
+
+    Every write-back rebuilds the bitmap and the streak state, so prefer
+    complete_today() for check-ins. A list taken before the habit changed
+    overwrites that change when it is mutated.
+    """
+
+    __slots__ = ("_habit",)
+
+    def __init__(self, habit: "Habit", dates: Iterable[date]):
+        super().__init__(dates)
+        self._habit = habit
+
+def _writing_back(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args):
+        result = method(self, *args)
+        self._habit.completion_dates = self
+        return result
+    wrapper.__name__ = name
+    return wrapper
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(CompletionDateList, _name, _writing_back(_name))
+del _name
 
 class Habit:
     """
@@ -9,10 +46,18 @@ class Habit:
         name (str): Name of the Habit (eg., "No phone after 9pm" or "No phone on Sundays" ).
         periodicity (str): Frequency of the habit ("daily" or "weekly").
         creation_date (date): Date the habit was created.
-        completion_dates ( List[date]): Dates when the habit was marked as completed.
-        current_streak (int): Number of consecutive successful completions.
+        completion_dates (List[date]): Dates when the habit was marked as completed.
+        completions (CompletionBitmap): Bitmap storage behind completion_dates.
+        current_streak (int): Periods completed in a row up to the latest completion;
+            0 once a whole period passed without one.
+        streak_index (StreakIndex): Run index for historical streak queries.
     """
 
+    # No per-instance __dict__: large in-memory habit sets only pay for these fields.
+    __slots__ = ("id", "name", "periodicity", "creation_date", "current_streak",
+                 "_completions", "_completion_blob", "_streak_ready", "_last_completion",
+                 "_streak_index", "_streak_index_changes")
+
     def __init__(self, name: str, periodicity: str, creation_date: date = date.today(), id: Optional[int] = None):
        """
        Initializes a new Habit instance.
@@ -27,53 +72,231 @@ class Habit:
        self.name = name
        self.periodicity = periodicity
        self.creation_date = creation_date
-       self.completion_dates: List[date] = []
+       self.completions = CompletionBitmap(creation_date)
        self.current_streak = 0
-    
+
+    @property
+    def completions(self) -> CompletionBitmap:
+        """
+        The completion history as a bitmap keyed by day offset from creation_date.
+
+        Returns:
+            CompletionBitmap: The bitmap backing completion_dates.
+        """
+        if self._completions is None:
+            # Deferred by load_completions_from(); decoded on first access.
+            self._completions = CompletionBitmap.from_bytes(self._completion_blob)
+            self._completion_blob = None
+        return self._completions
+
+    @completions.setter
+    def completions(self, bitmap: CompletionBitmap):
+        self._completions = bitmap
+        self._completion_blob: Optional[bytes] = None
+        self._streak_ready = False
+        self._last_completion: Optional[date] = None
+        self._streak_index: Optional[StreakIndex] = None
+        self._streak_index_changes = 0
+
+    @property
+    def streak_index(self) -> StreakIndex:
+        """
+        Run index over the completion history, built on first use and kept
+        up to date by complete_today(). Rebuilt when the bitmap was changed
+        directly, which CompletionBitmap.changes reveals in O(1).
+
+        Returns:
+            StreakIndex: Longest-ever streak, streak as of a date and range counts.
+        """
+        completions = self.completions
+        if self._streak_index is None or self._streak_index_changes != completions.changes:
+            self._streak_index = StreakIndex(self.periodicity, completions)
+            self._streak_index_changes = completions.changes
+        return self._streak_index
+
+    def restore_streak(self, streak: int):
+        """
+        Adopts a stored current streak as the state complete_today() continues from,
+        so a loaded habit is checked in without recomputing its whole history.
+
+        Args:
+            streak (int): The streak saved with the habit's current completions.
+        """
+        self.current_streak = streak
+        self._streak_ready = True
+        # Resolved from the bitmap on the next check-in.
+        self._last_completion = None
+
+    def load_completions_from(self, blob: bytes):
+        """
+        Replaces the completion history with a stored CompletionBitmap.to_bytes()
+        value that is only decoded when the history is first used.
+
+        Args:
+            blob (bytes): Serialized completion bitmap.
+        """
+        self.completions = None
+        self._completion_blob = blob
+
+    @property
+    def completions_loaded(self) -> bool:
+        """
+        False while the completion history is still an undecoded blob.
+        """
+        return self._completions is not None
+
+    @property
+    def completion_dates(self) -> List[date]:
+        """
+        Dates when the habit was marked as completed.
+
+        Built from the bitmap on every access; changing the returned list in
+        place updates the habit (see CompletionDateList).
+
+        Returns:
+            List[date]: The unique completion dates in ascending order.
+        """
+        return CompletionDateList(self, self.completions)
+
+    @completion_dates.setter
+    def completion_dates(self, dates: Iterable[date]):
+        self.completions = CompletionBitmap(self.creation_date, dates)
+
+    @property
+    def completion_count(self) -> int:
+        """
+        Number of days on which the habit was completed.
+        """
+        return len(self.completions)
+
+    def expected_periods(self, until: date) -> int:
+        """
+        Counts the periods between creation_date and a given day.
+
+        Args:
+            until (date): Last day to consider (inclusive).
+
+        Returns:
+            int: Days for daily habits, weeks for weekly habits (1 for any other
+            periodicity); 0 if ``until`` is before the first period.
+        """
+        if self.periodicity == "daily":
+            periods = (until - self.creation_date).days + 1
+        elif self.periodicity == "weekly":
+            periods = (until - self.creation_date).days // 7 + 1
+        else:
+            periods = 1
+        return max(periods, 0)
+
+    def longest_streak(self) -> int:
+        """
+        Returns the longest streak the habit has ever reached.
+
+        Daily habits are answered from the bitmap directly; other periodicities
+        use streak_index.
+        """
+        if self.periodicity == "daily":
+            return self.completions.longest_run()
+        return self.streak_index.longest()
+
+    def missed_periods(self, until: date) -> List[date]:
+        """
+        Lists the expected days without a completion between creation_date and a given day.
+
+        Args:
+            until (date): Last day to consider (inclusive).
+
+        Returns:
+            List[date]: Missed days for daily habits, or the missed weekly
+            anniversaries of creation_date for weekly habits.
+        """
+        if self.periodicity == "daily":
+            step = 1
+        elif self.periodicity == "weekly":
+            step = 7
+        else:
+            return []
+        count = (until - self.creation_date).days // step + 1
+        return self.completions.missing(self.creation_date, step, count)
+
     def complete_today(self) -> bool:
         """
         Marks today's date as completed for the habit.
-        
+
+        The streak is extended in constant time when today is later than every
+        stored completion; an out-of-order history falls back to update_streak().
+
         Returns:
             bool: True if today was successfully marked, False if already completed.
         """
         today = date.today()
-        if today not in self.completion_dates:
-           self.completion_dates.append(today)
-           self.update_streak()
-           return True
-        return False
-    
-    def update_streak(self):
+        if today in self.completions:
+            return False
+        if not self._streak_ready:
+            self.update_streak()
+        elif self._last_completion is None:
+            self._last_completion = self.completions.last()
 
-        """ Updates the current streak based on consecutive completion dates.
-            Daily habits increase by 1 per day; weekly habits increase by 1 per week.
+        self.completions.add(today)
+        if self._streak_index is not None and self._streak_index_changes + 1 == self.completions.changes:
+            self._streak_index.add(today)
+            self._streak_index_changes = self.completions.changes
+        if self._last_completion is None or today > self._last_completion:
+            self._extend_streak(today)
+        else:
+            self.update_streak()
+        return True
+
+    def _extend_streak(self, day: date):
         """
-        if not self.completion_dates:
-           self.current_streak = 0
-           return
+        Advances the running streak by one completion later than all others.
 
-        dates_to_check = sorted(list(set(self.completion_dates)))  #use unique date
+        Mirrors one iteration of the update_streak() loop: a completion exactly
+        one period after the previous one extends the streak, a closer one
+        leaves it unchanged and a wider gap starts a new streak of 1. As only
+        the gap counts, this continues correctly from a streak that
+        DatabaseConnector.expire_streaks() already reset to 0.
 
+        Args:
+            day (date): The new latest completion date.
+        """
         gap_days = 1 if self.periodicity == "daily" else 7
+        gap = None if self._last_completion is None else (day - self._last_completion).days
+        if gap is None or gap > gap_days:
+            self.current_streak = 1
+        elif gap == gap_days:
+            self.current_streak += 1
+        else:
+            self.current_streak = max(self.current_streak, 1)
+        self._last_completion = day
 
-        streak = 1
+    def update_streak(self, today: Optional[date] = None):
 
+        """ Updates the current streak based on consecutive completion dates.
+            Daily habits increase by 1 per day; weekly habits increase by 1 per week.
 
-        for i in range(1, len(dates_to_check)):
-            previous_date = dates_to_check[i -1]
-            current_date_check = dates_to_check[i]
-            gap = (current_date_check - previous_date).days
+            The streak is the run ending at the latest completion, and 0 once more
+            than one period passed since it by ``today`` (defaults to today), the
+            same rule DatabaseConnector.expire_streaks() applies to stored streaks.
 
-            if gap == gap_days:
-                streak +=1
-            elif gap < gap_days:
+            This is a full recompute; it also rebuilds the state complete_today() relies on.
+        """
+        self._last_completion = None
+        self.current_streak = 0
+        self._streak_ready = True
 
-                continue
-            else:
-                break
+        if self.periodicity == "daily":
+            # A daily streak is the run of set bits ending at the latest completion.
+            self.current_streak = self.completions.trailing_run()
+            self._last_completion = self.completions.last()
+        else:
+            for current_date_check in self.completions:
+                self._extend_streak(current_date_check)
 
-        self.current_streak = streak
+        gap_days = 1 if self.periodicity == "daily" else 7
+        today = today or date.today()
+        if self._last_completion is not None and (today - self._last_completion).days > gap_days:
+            self.current_streak = 0
 
 
     def reset_habit(self):
@@ -83,7 +306,7 @@ class Habit:
         Returns:
             None
         """
-        self.completion_dates.clear()
+        self.completions = CompletionBitmap(self.creation_date)
         self.current_streak = 0
         
     def __repr__(self) -> str: 
@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from habit import Habit
+
+class HabitCache:
+    """
+    In-process identity map for habits loaded by a DatabaseConnector.
+
+    Keeps at most one Habit instance per ID, evicting the least recently
+    used entry once ``max_size`` is reached. The connector writes through
+    it on save and evicts on delete, so cached instances never go stale
+    within a session. All methods are safe to call from several threads;
+    the Habit instances they return are shared and are not.
+
+    Attributes:
+        max_size (int): Maximum number of cached habits.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to query the database.
+        complete (bool): True while the cache holds every stored habit, so
+            load_habits() can be answered without a table scan.
+    """
+
+    def __init__(self, max_size: int = 10_000):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_size (int): Maximum number of cached habits.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.complete = False
+        self._habits: "OrderedDict[int, Habit]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._habits)
+
+    def get(self, habit_id: int) -> Optional[Habit]:
+        """
+        Looks up a habit and records a hit or miss.
+
+        Args:
+            habit_id (int): The habit ID.
+
+        Returns:
+            Optional[Habit]: The cached instance, or None on a miss.
+        """
+        with self._lock:
+            habit = self._habits.get(habit_id)
+            if habit is None:
+                self.misses += 1
+                return None
+            self._habits.move_to_end(habit_id)
+            self.hits += 1
+            return habit
+
+    def peek(self, habit_id: int) -> Optional[Habit]:
+        """
+        Returns the cached instance without touching counters or recency.
+        """
+        with self._lock:
+            return self._habits.get(habit_id)
+
+    def put(self, habit: Habit):
+        """
+        Stores or refreshes a habit, evicting the least recently used one if full.
+
+        Args:
+            habit (Habit): A habit that has an ID.
+        """
+        with self._lock:
+            self._habits[habit.id] = habit
+            self._habits.move_to_end(habit.id)
+            if len(self._habits) > self.max_size:
+                self._habits.popitem(last=False)
+                self.complete = False
+
+    def record_full_load(self, count: int):
+        """
+        Records a load of every stored habit as one miss. The cache becomes
+        complete if all ``count`` habits fit into it.
+
+        Args:
+            count (int): Number of habits loaded.
+        """
+        with self._lock:
+            self.misses += 1
+            self.complete = count <= self.max_size
+
+    def evict(self, habit_id: int):
+        """
+        Removes a habit from the cache if present. The cache no longer
+        counts as complete, as the habit may still be stored.
+
+        Args:
+            habit_id (int): The habit ID.
+        """
+        with self._lock:
+            self._habits.pop(habit_id, None)
+            self.complete = False
+
+    def all(self) -> List[Habit]:
+        """
+        Returns every cached habit in ID order and records one hit per habit.
+        """
+        with self._lock:
+            self.hits += len(self._habits)
+            habits = list(self._habits.values())
+        return sorted(habits, key=lambda h: h.id)
+
+    def clear(self):
+        """
+        Empties the cache; counters are kept.
+        """
+        with self._lock:
+            self._habits.clear()
+            self.complete = False
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            Dict[str, int]: size, max_size, hits and misses.
+        """
+        return {"size": len(self._habits), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
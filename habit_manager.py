@@ -1,6 +1,6 @@
-from typing import List
+from typing import Iterator, List, Optional
 from habit import Habit
-from db import DatabaseConnector
+from db import DatabaseConnector, HabitSummary
 import datetime
 
 class HabitManager:
@@ -18,6 +18,20 @@ class HabitManager:
         """    
         self.db = db_connector
 
+    def transaction(self):
+        """
+        Groups several manager operations into one database commit.
+
+        Example:
+            with manager.transaction():
+                manager.complete_habit(1)
+                manager.complete_habit(2)
+
+        Returns:
+            A context manager from DatabaseConnector.transaction().
+        """
+        return self.db.transaction()
+
     def create_habit(self, name: str, periodicity: str) -> Habit:
         """
         Creates a new habit and stores it in the database.
@@ -29,12 +43,12 @@ class HabitManager:
         Returns:
             Habit: The newly created Hbit object, or existing habit if duplicate found.
         """
-        # Check for duplicate habit
-        for habit in self.db.get_all_habits():
-            if habit.name.strip().lower() == name.strip().lower() and habit.periodicity == periodicity:
-                print(f"Habit '{name}' with periodicity '{periodicity}' already exists.")
-                return habit
-        
+        # Check for duplicate habit (single lookup on the normalized name index)
+        habit = self.db.find_habit(name, periodicity)
+        if habit:
+            print(f"Habit '{name}' with periodicity '{periodicity}' already exists.")
+            return habit
+
         new_habit = Habit(name=name, periodicity=periodicity, creation_date=datetime.date.today())
         self.db.save_habit(new_habit)
         print(f"Habit '{name}' added successfully.")
@@ -54,7 +68,8 @@ class HabitManager:
         habit = self.db.get_habit_by_id(habit_id)
         if habit:
             result = habit.complete_today()
-            self.db.save_habit(habit)
+            if result:
+                self.db.add_completion(habit, datetime.date.today())
             return result
         return False
     
@@ -68,8 +83,7 @@ class HabitManager:
         Returns:
             List[Habit]: A list of matching Habit objects with a unique ID and empty completion history.
         """
-        all_habits = self.db.get_all_habits()
-        return [habit for habit in all_habits if habit.periodicity == periodicity]
+        return list(self.db.iter_habits(periodicity=periodicity))
     
     def list_current_streaks(self) -> List[str]:  
         """
@@ -78,8 +92,7 @@ class HabitManager:
         Returns:
             List[str]: A formatted list of habit names and their current streaks.
         """
-        all_habits = self.db.get_all_habits()
-        return [f"{habit.name}: {habit.current_streak} days" for habit in all_habits]
+        return [f"{habit.name}: {habit.current_streak} days" for habit in self.db.iter_habits()]
     
     def delete_habit(self, habit_id: int) -> bool:
         """ 
@@ -101,6 +114,31 @@ class HabitManager:
     def list_habits(self) -> List[Habit]:
         """Return all habits."""
         return self.db.get_all_habits()
+
+    def iter_habits(self, batch_size: int = 1000, periodicity: Optional[str] = None) -> Iterator[Habit]:
+        """
+        Streams habits in ID order without loading them all at once.
+
+        Args:
+            batch_size (int): Rows fetched from the database at a time.
+            periodicity (Optional[str]): Only stream 'daily' or 'weekly' habits. Defaults to all.
+
+        Yields:
+            Habit: One Habit instance per stored habit.
+        """
+        yield from self.db.iter_habits(batch_size, periodicity)
+
+    def list_summaries(self, periodicity: Optional[str] = None) -> List[HabitSummary]:
+        """
+        Lists id, name, periodicity and current streak of each habit, without loading histories.
+
+        Args:
+            periodicity (Optional[str]): Only list 'daily' or 'weekly' habits. Defaults to all.
+
+        Returns:
+            List[HabitSummary]: One row per habit in ID order.
+        """
+        return self.db.list_habit_summaries(periodicity)
    
 
 
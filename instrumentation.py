@@ -0,0 +1,369 @@
+"""
+instrumentation.py
+
+Purpose: Opt-in profiling of the tracker's hot paths.
+
+enable() wraps the public DatabaseConnector and HabitManager methods,
+Habit.update_streak / Habit.complete_today and the analysis.py reports.
+Each wrapper records call counts, a latency histogram, the number of
+items returned (for functions returning collections or habits),
+SQL statements executed (through sqlite3's trace callback) and,
+optionally, memory allocated (through tracemalloc).
+disable() puts the original functions back, so the tracker runs
+unmodified and pays nothing while profiling is off.
+
+    import instrumentation
+    instrumentation.enable()
+    ...
+    print(instrumentation.format_summary())
+
+Functions imported by name (``from analysis import x``) before enable()
+keep pointing at the unwrapped function.
+"""
+import functools
+import inspect
+import sqlite3
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import analysis
+from db import DatabaseConnector
+from habit import Habit
+from habit_manager import HabitManager
+
+# Functions wrapped besides the public DatabaseConnector and HabitManager methods.
+_EXTRA_TARGETS = [
+    (Habit, ["update_streak", "complete_today"]),
+    (analysis, ["calculate_average_success_rate", "find_longest_streak", "get_missed_days",
+                "success_rates", "missed_days_report", "current_streaks", "longest_streaks",
+                "find_longest_ever_streak", "streaks_as_of_report",
+                "window_reports", "calculate_average_success_rate_in_window", "window_reports_from_db",
+                "average_success_rate_in_window_from_db",
+                "average_success_rate_from_db", "longest_streak_from_db", "longest_ever_streak_from_db"]),
+]
+
+class LatencyHistogram:
+    """
+    Call latencies in power-of-two microsecond buckets.
+
+    Bucket ``i`` counts calls that took less than ``2 ** i`` microseconds
+    (and at least half of that), which is enough to read percentiles to
+    within a factor of two while using constant memory.
+
+    Attributes:
+        count (int): Number of recorded calls.
+        total (float): Sum of all latencies in seconds.
+        max (float): Slowest call in seconds.
+        buckets (List[int]): Calls per bucket.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: List[int] = [0] * 40
+
+    def record(self, seconds: float):
+        """
+        Adds one latency measurement.
+
+        Args:
+            seconds (float): Duration of the call.
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        bucket = min(int(seconds * 1_000_000).bit_length(), len(self.buckets) - 1)
+        self.buckets[bucket] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the upper bound, in seconds, of the bucket holding the given percentile.
+
+        Args:
+            fraction (float): Percentile as a fraction, e.g. 0.95.
+        """
+        if not self.count:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for bucket, calls in enumerate(self.buckets):
+            seen += calls
+            if seen >= threshold:
+                return min((1 << bucket) / 1_000_000, self.max)
+        return self.max
+
+class CallStats:
+    """
+    Everything recorded for one instrumented function.
+
+    Attributes:
+        latency (LatencyHistogram): Call durations.
+        queries (int): SQL statements executed while it was the innermost instrumented call.
+        rows_returned (Optional[int]): Items of returned lists, dicts and sets, a habit
+            counting 1; None while every call returned a scalar or a single record such
+            as a tuple. This is the size of the results, not the rows SQLite read.
+        allocated (int): Net bytes still allocated after its calls returned.
+        peak (int): Largest temporary allocation during one outermost call.
+    """
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.queries = 0
+        self.rows_returned: Optional[int] = None
+        self.allocated = 0
+        self.peak = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Returns the statistics with latencies in milliseconds.
+        """
+        latency = self.latency
+        return {
+            "calls": latency.count,
+            "total_ms": latency.total * 1000,
+            "mean_ms": latency.total * 1000 / latency.count if latency.count else 0.0,
+            "p50_ms": latency.percentile(0.5) * 1000,
+            "p95_ms": latency.percentile(0.95) * 1000,
+            "max_ms": latency.max * 1000,
+            "queries": self.queries,
+            "rows_returned": self.rows_returned,
+            "allocated_bytes": self.allocated,
+            "peak_bytes": self.peak,
+        }
+
+_enabled = False
+_track_allocations = False
+_owns_tracemalloc = False
+_stats: Dict[str, CallStats] = {}
+_lock = threading.Lock()
+_local = threading.local()
+_originals: List[Tuple[object, str, object]] = []
+# Connections given a trace callback, keyed by id(); sqlite3 connections cannot be weakly referenced.
+_traced: Dict[int, sqlite3.Connection] = {}
+_total_queries = 0
+
+def _stats_for(name: str) -> CallStats:
+    stats = _stats.get(name)
+    if stats is None:
+        with _lock:
+            stats = _stats.setdefault(name, CallStats())
+    return stats
+
+def _call_stack() -> List[str]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def _on_statement(statement: str):
+    """
+    sqlite3 trace callback: attributes each statement to the innermost running call.
+    """
+    global _total_queries
+    stack = _call_stack()
+    stats = _stats_for(stack[-1]) if stack else None
+    with _lock:
+        _total_queries += 1
+        if stats is not None:
+            stats.queries += 1
+
+def _trace(conn: sqlite3.Connection):
+    if id(conn) not in _traced:
+        conn.set_trace_callback(_on_statement)
+        _traced[id(conn)] = conn
+
+def _count_rows(result: object) -> Optional[int]:
+    """
+    Returns the number of items in a call result, or None if it is not a collection.
+
+    Tuples are records (e.g. a (name, streak) pair or a NamedTuple), not row sets.
+    """
+    if isinstance(result, (list, dict, set, frozenset)):
+        return len(result)
+    if isinstance(result, Habit):
+        return 1
+    return None
+
+def _wrap(name: str, function: Callable) -> Callable:
+    """
+    Returns ``function`` wrapped so that its calls are recorded under ``name``.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        stack = _call_stack()
+        outermost = not stack
+        stack.append(name)
+        measure_memory = _track_allocations and tracemalloc.is_tracing()
+        if measure_memory:
+            if outermost:
+                tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            if measure_memory:
+                current, peak = tracemalloc.get_traced_memory()
+            stats = _stats_for(name)
+            # Calls of one function may finish on several threads at once.
+            with _lock:
+                stats.latency.record(elapsed)
+                if measure_memory:
+                    stats.allocated += current - memory_before
+                    if outermost:
+                        stats.peak = max(stats.peak, peak - memory_before)
+        rows = _count_rows(result)
+        if rows is not None:
+            with _lock:
+                stats.rows_returned = (stats.rows_returned or 0) + rows
+        return result
+    return wrapper
+
+def _wrap_connection_source(function: Callable) -> Callable:
+    """
+    Wraps a DatabaseConnector._read/_write context manager so every
+    connection it hands out reports its statements.
+    """
+    @functools.wraps(function)
+    @contextmanager
+    def wrapper(self) -> Iterator[sqlite3.Connection]:
+        with function(self) as conn:
+            _trace(conn)
+            yield conn
+    return wrapper
+
+def _targets() -> List[Tuple[object, str, Callable]]:
+    """
+    Lists (owner, attribute, wrapper) for everything enable() patches.
+    """
+    targets = []
+    for cls in (DatabaseConnector, HabitManager):
+        for attribute, function in vars(cls).items():
+            # Streaming generators and context managers return before their work is done.
+            if (attribute.startswith("_") or not inspect.isfunction(function)
+                    or inspect.isgeneratorfunction(function) or hasattr(function, "__wrapped__")):
+                continue
+            targets.append((cls, attribute, _wrap(f"{cls.__name__}.{attribute}", function)))
+    for owner, attributes in _EXTRA_TARGETS:
+        owner_name = owner.__name__
+        for attribute in attributes:
+            targets.append((owner, attribute, _wrap(f"{owner_name}.{attribute}", getattr(owner, attribute))))
+
+    # Subclasses such as PooledDatabaseConnector hand out their own connections.
+    classes = [DatabaseConnector]
+    while classes:
+        cls = classes.pop()
+        classes.extend(cls.__subclasses__())
+        for attribute in ("_read", "_write"):
+            if attribute in vars(cls):
+                targets.append((cls, attribute, _wrap_connection_source(vars(cls)[attribute])))
+    return targets
+
+def enable(track_allocations: bool = False):
+    """
+    Starts recording. Calling it again while enabled only updates ``track_allocations``.
+
+    Args:
+        track_allocations (bool): Also record memory allocated per call with
+            tracemalloc. This slows every call down noticeably.
+    """
+    global _enabled, _track_allocations, _owns_tracemalloc
+    _track_allocations = track_allocations
+    if track_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _owns_tracemalloc = True
+    if _enabled:
+        return
+    for owner, attribute, wrapper in _targets():
+        _originals.append((owner, attribute, vars(owner)[attribute]))
+        setattr(owner, attribute, wrapper)
+    _enabled = True
+
+def disable():
+    """
+    Stops recording and restores the original functions. Collected statistics are kept.
+    """
+    global _enabled, _track_allocations, _owns_tracemalloc
+    if not _enabled:
+        return
+    for owner, attribute, original in reversed(_originals):
+        setattr(owner, attribute, original)
+    _originals.clear()
+    for conn in _traced.values():
+        try:
+            conn.set_trace_callback(None)
+        except sqlite3.ProgrammingError:
+            pass  # already closed
+    _traced.clear()
+    if _owns_tracemalloc:
+        tracemalloc.stop()
+    _enabled = _track_allocations = _owns_tracemalloc = False
+
+def is_enabled() -> bool:
+    """Return True while recording is switched on."""
+    return _enabled
+
+def reset():
+    """
+    Discards all collected statistics.
+    """
+    global _total_queries
+    with _lock:
+        _stats.clear()
+        _total_queries = 0
+
+@contextmanager
+def profiling(track_allocations: bool = False):
+    """
+    Records everything that runs inside the block.
+
+    Args:
+        track_allocations (bool): See enable().
+    """
+    enable(track_allocations)
+    try:
+        yield
+    finally:
+        disable()
+
+def summary() -> Dict[str, object]:
+    """
+    Returns the collected statistics.
+
+    Returns:
+        Dict[str, object]: {'queries': total SQL statements, 'calls': {name: CallStats.as_dict()}},
+        with calls ordered by total time, slowest first.
+    """
+    with _lock:
+        calls = {name: stats.as_dict() for name, stats in _stats.items()}
+        queries = _total_queries
+    ordered = dict(sorted(calls.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+    return {"queries": queries, "calls": ordered}
+
+def format_summary(limit: Optional[int] = None) -> str:
+    """
+    Formats summary() as a text table.
+
+    Args:
+        limit (Optional[int]): Show only the slowest ``limit`` functions.
+
+    Returns:
+        str: The table, one line per instrumented function.
+    """
+    report = summary()
+    lines = [f"{'function':<45} {'calls':>7} {'total ms':>10} {'p50 ms':>8} {'p95 ms':>8} "
+             f"{'max ms':>8} {'queries':>8} {'returned':>8} {'alloc KiB':>10}"]
+    for name, row in list(report["calls"].items())[:limit]:
+        lines.append(f"{name:<45} {row['calls']:>7} {row['total_ms']:>10.2f} {row['p50_ms']:>8.3f} "
+                     f"{row['p95_ms']:>8.3f} {row['max_ms']:>8.3f} {row['queries']:>8} "
+                     f"{'-' if row['rows_returned'] is None else row['rows_returned']:>8} "
+                     f"{row['allocated_bytes'] / 1024:>10.1f}")
+    lines.append(f"SQL statements executed: {report['queries']}")
+    return "\n".join(lines)
@@ -6,7 +6,7 @@ from example_data import get_example_habits
 # list habits in CLI
 def list_habits_cli(manager):
     """List all habits with details including streak"""
-    habits= manager.list_habits()
+    habits= manager.list_summaries()
     if not habits:
         print("No habits found.")
         return
@@ -32,9 +32,8 @@ def main():
     manager = HabitManager(db)
 
     # Load example habits only if database is empty
-    if not manager.list_habits():
-        for habit in get_example_habits():
-            db.save_habit(habit)
+    if not manager.db.count_habits():
+        db.save_habits(get_example_habits())
         print("Example habits loaded successfuly!\n")
     else:
         print("Habits already exist in the database.\n")   
@@ -0,0 +1,127 @@
+"""
+parallel_reports.py
+
+Purpose: Per-habit analytics reports computed on several CPU cores.
+
+The habits are split into ID-range shards (DatabaseConnector.id_shards).
+Each shard is handled by a worker process that opens its own
+DatabaseConnector on the database file, loads only the habits in its
+range and runs the analysis.py batch functions on them. The shard
+results are merged in ID order, so parallel_report() returns exactly
+what serial_report() returns for the same database and day.
+
+    from parallel_reports import parallel_report
+    rows = parallel_report("habits.db", workers=4, chunk_size=5000)
+"""
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import analysis
+from db import DatabaseConnector
+from habit import Habit
+
+class HabitReport(NamedTuple):
+    """
+    One habit's row in a serial_report() or parallel_report().
+    """
+    id: int
+    name: str
+    periodicity: str
+    success_rate: float
+    missed_days: List[datetime.date]
+    current_streak: int
+    longest_streak: int
+
+def habit_reports(habits: Sequence[Habit], today: datetime.date) -> List[HabitReport]:
+    """
+    Computes the report rows of loaded habits.
+
+    Args:
+        habits (Sequence[Habit]): Stored habits.
+        today (datetime.date): Evaluation date.
+
+    Returns:
+        List[HabitReport]: One row per habit, in input order.
+    """
+    rates = analysis.success_rates(habits, today)
+    missed = analysis.missed_days_report(habits, today)
+    longest = analysis.longest_streaks(habits)
+    return [HabitReport(habit.id, habit.name, habit.periodicity, rate, days, habit.current_streak or 0, record)
+            for habit, rate, days, record in zip(habits, rates, missed, longest)]
+
+def _shard_report(db: DatabaseConnector, first_id: int, last_id: int, today: datetime.date) -> List[HabitReport]:
+    """
+    Computes the report rows of the habits with IDs from ``first_id`` to ``last_id``.
+    """
+    return habit_reports(db.load_habits_between(first_id, last_id), today)
+
+def _run_shard(task: Tuple[str, str, int, int, datetime.date]) -> List[HabitReport]:
+    """
+    Worker process entry point: reports one shard through a connection of its own.
+    """
+    db_path, backend, first_id, last_id, today = task
+    analysis.set_backend(backend)
+    db = DatabaseConnector(db_path)
+    try:
+        return _shard_report(db, first_id, last_id, today)
+    finally:
+        db.close()
+
+def serial_report(db: DatabaseConnector, today: Optional[datetime.date] = None) -> List[HabitReport]:
+    """
+    Computes every habit's success rate, missed days and streaks in this process.
+
+    Args:
+        db (DatabaseConnector): Connector of the database to analyze.
+        today (Optional[datetime.date]): Evaluation date. Defaults to today.
+
+    Returns:
+        List[HabitReport]: One row per habit, in ID order.
+    """
+    today = today or datetime.date.today()
+    report: List[HabitReport] = []
+    for first_id, last_id in db.id_shards(10_000):
+        report.extend(_shard_report(db, first_id, last_id, today))
+    return report
+
+def parallel_report(db_path: str, workers: Optional[int] = None, chunk_size: int = 10_000,
+                    today: Optional[datetime.date] = None) -> List[HabitReport]:
+    """
+    Computes the same report as serial_report() with a pool of worker processes.
+
+    Args:
+        db_path (str): Path of the SQLite database file (not ":memory:",
+            which worker processes cannot open).
+        workers (Optional[int]): Worker processes. Defaults to the number of CPUs.
+        chunk_size (int): Habits per shard; smaller shards balance the load
+            better, larger ones pay less per-task overhead.
+        today (Optional[datetime.date]): Evaluation date. Defaults to today.
+
+    Returns:
+        List[HabitReport]: One row per habit, in ID order.
+    """
+    if db_path == ":memory:":
+        raise ValueError("parallel_report() needs a database file; use serial_report() for ':memory:'")
+    today = today or datetime.date.today()
+    workers = workers or os.cpu_count() or 1
+    db = DatabaseConnector(db_path)
+    try:
+        shards = db.id_shards(chunk_size)
+        if workers == 1 or len(shards) <= 1:
+            report: List[HabitReport] = []
+            for first_id, last_id in shards:
+                report.extend(_shard_report(db, first_id, last_id, today))
+            return report
+    finally:
+        db.close()
+
+    backend = analysis.get_backend()
+    tasks = [(db_path, backend, first_id, last_id, today) for first_id, last_id in shards]
+    report = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+        # map() yields results in task order, which is ID order.
+        for rows in executor.map(_run_shard, tasks):
+            report.extend(rows)
+    return report
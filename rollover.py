@@ -0,0 +1,72 @@
+"""
+rollover.py
+
+Purpose: Daily rollover job of the Digital Detox Tracker.
+
+A habit's current streak is only recomputed when it is completed, so a
+habit that is simply skipped would keep showing its old streak. The
+rollover resets the streaks of all habits whose period passed without
+a completion (DatabaseConnector.expire_streaks) and remembers the day it
+last ran in the ``meta`` table. Running it again on the same day does
+nothing; running it after days of downtime catches up in one pass.
+
+Schedule it once a day, e.g. from cron:
+
+    5 0 * * *  cd /path/to/tracker && python cli.py rollover
+"""
+from datetime import date
+from typing import NamedTuple, Optional
+
+from db import DatabaseConnector
+
+# meta table key holding the ISO date of the last rollover.
+LAST_RUN_KEY = "rollover_last_run"
+
+class RolloverResult(NamedTuple):
+    """
+    Outcome of one rollover() call.
+    """
+    today: date
+    last_run: Optional[date]
+    expired: int
+    skipped: bool
+
+    @property
+    def days_caught_up(self) -> int:
+        """Days covered by this run: 1 on a normal day, more after downtime, 0 if skipped."""
+        if self.skipped:
+            return 0
+        return max((self.today - self.last_run).days, 0) if self.last_run else 1
+
+def last_rollover(db: DatabaseConnector) -> Optional[date]:
+    """
+    Returns the day the rollover last ran on this database, or None if it never ran.
+    """
+    value = db.get_meta(LAST_RUN_KEY)
+    return date.fromisoformat(value) if value else None
+
+def rollover(db: DatabaseConnector, today: Optional[date] = None, force: bool = False) -> RolloverResult:
+    """
+    Expires lapsed streaks once per day.
+
+    The streak reset and the new last-run date are committed together, so
+    an interrupted run is simply repeated next time.
+
+    Args:
+        db (DatabaseConnector): The database to roll over.
+        today (Optional[date]): Day being closed out. Defaults to today.
+        force (bool): Run even if the rollover already ran for ``today`` or later.
+
+    Returns:
+        RolloverResult: The day, the previous run, the number of reset streaks
+        and whether the run was skipped.
+    """
+    today = today or date.today()
+    with db.transaction():
+        last_run = last_rollover(db)
+        if last_run is not None and last_run >= today and not force:
+            return RolloverResult(today, last_run, 0, True)
+        expired = db.expire_streaks(today)
+        if last_run is None or today > last_run:
+            db.set_meta(LAST_RUN_KEY, today.isoformat())
+    return RolloverResult(today, last_run, expired, False)
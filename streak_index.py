@@ -0,0 +1,137 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Iterable, List, Tuple
+
+class StreakIndex:
+    """
+    Sorted index of a habit's completions and the streak runs they form.
+
+    Runs follow the Habit.update_streak() gap rule: a completion exactly one
+    period after the previous one extends the streak, a closer one leaves it
+    unchanged, and a wider gap starts a new run. For every completion the
+    index stores the streak reached at that point, and for every run its
+    (start, end) days and final streak, so that
+
+    - the longest streak ever reached is read in O(1),
+    - the streak as of any date and the number of completions in a date
+      range are answered with binary searches in O(log n),
+    - a completion later than all others is added in O(1).
+
+    Days are stored as proleptic ordinals in compact integer arrays.
+    """
+
+    __slots__ = ("gap_days", "_days", "_streaks", "_run_starts", "_run_ends", "_run_streaks", "_longest")
+
+    def __init__(self, periodicity: str, days: Iterable[date] = ()):
+        """
+        Builds the index from completed days.
+
+        Args:
+            periodicity (str): 'daily' (one-day period) or anything else (seven days).
+            days (Iterable[date], optional): Completed days in ascending order.
+        """
+        self.gap_days = 1 if periodicity == "daily" else 7
+        self._days = array("l")
+        self._streaks = array("l")
+        self._run_starts = array("l")
+        self._run_ends = array("l")
+        self._run_streaks = array("l")
+        self._longest = 0
+        for day in days:
+            self._append(day.toordinal())
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def _append(self, ordinal: int):
+        """
+        Adds a completion later than every indexed one.
+        """
+        if self._days and ordinal - self._days[-1] <= self.gap_days:
+            # Same run: only a gap of exactly one period raises the streak.
+            streak = self._streaks[-1] + (ordinal - self._days[-1] == self.gap_days)
+            self._run_ends[-1] = ordinal
+            self._run_streaks[-1] = streak
+        else:
+            streak = 1
+            self._run_starts.append(ordinal)
+            self._run_ends.append(ordinal)
+            self._run_streaks.append(streak)
+        self._days.append(ordinal)
+        self._streaks.append(streak)
+        if streak > self._longest:
+            self._longest = streak
+
+    def add(self, day: date) -> bool:
+        """
+        Records a completion, in O(1) when it is later than every indexed day.
+
+        Args:
+            day (date): The completed day.
+
+        Returns:
+            bool: True if the day was new, False if it was already indexed.
+        """
+        ordinal = day.toordinal()
+        if not self._days or ordinal > self._days[-1]:
+            self._append(ordinal)
+            return True
+        position = bisect_left(self._days, ordinal)
+        if self._days[position] == ordinal:
+            return False
+        # An earlier day can merge or split runs: rebuild from the sorted days.
+        days = self._days.tolist()
+        days.insert(position, ordinal)
+        for values in (self._days, self._streaks, self._run_starts, self._run_ends, self._run_streaks):
+            del values[:]
+        self._longest = 0
+        for value in days:
+            self._append(value)
+        return True
+
+    def longest(self) -> int:
+        """
+        Returns the longest streak ever reached.
+        """
+        return self._longest
+
+    def streak_as_of(self, day: date) -> int:
+        """
+        Returns the streak that was running on a given day.
+
+        The streak is still running when the latest completion on or before
+        ``day`` is at most one period earlier, as the period is not over yet.
+
+        Args:
+            day (date): The day to evaluate.
+
+        Returns:
+            int: The running streak, or 0 if it had been broken (or nothing was completed yet).
+        """
+        ordinal = day.toordinal()
+        position = bisect_right(self._days, ordinal)
+        if position == 0 or ordinal - self._days[position - 1] > self.gap_days:
+            return 0
+        return self._streaks[position - 1]
+
+    def count_between(self, start: date, end: date) -> int:
+        """
+        Counts completions from ``start`` to ``end``, both inclusive.
+        """
+        return max(0, bisect_right(self._days, end.toordinal()) - bisect_left(self._days, start.toordinal()))
+
+    def days_between(self, start: date, end: date) -> List[date]:
+        """
+        Lists the completed days from ``start`` to ``end``, both inclusive, in O(log n + k).
+        """
+        first = bisect_left(self._days, start.toordinal())
+        last = bisect_right(self._days, end.toordinal())
+        return [date.fromordinal(ordinal) for ordinal in self._days[first:last]]
+
+    def runs(self) -> List[Tuple[date, date, int]]:
+        """
+        Lists every run as (first day, last day, streak reached), oldest first.
+        """
+        return [(date.fromordinal(start), date.fromordinal(end), streak)
+                for start, end, streak in zip(self._run_starts, self._run_ends, self._run_streaks)]
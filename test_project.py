@@ -101,4 +101,1049 @@ def test_analytics_functions(habit_manager):
     assert longest_streak >= 1
     
    
-   
\ No newline at end of file
+   
+def test_completions_are_appended_rows(habit_manager):
+    """
+    Test that completing a habit writes to the completions table.
+
+    Verifies that:
+    A check-in inserts exactly one completion row.
+    The stored streak is refreshed alongside it.
+    """
+    habit = habit_manager.create_habit("No Phone In Bed", "daily")
+    habit_manager.complete_habit(habit.id)
+
+    rows = habit_manager.db.conn.execute(
+        "SELECT habit_id, day FROM completions WHERE habit_id=?", (habit.id,)
+    ).fetchall()
+    assert rows == [(habit.id, date.today().isoformat())]
+    assert habit_manager.db.get_habit_by_id(habit.id).current_streak == 1
+
+def test_legacy_completion_dates_are_migrated(tmp_path):
+    """
+    Test the one-time conversion of the old comma-joined completion column.
+
+    Verifies that:
+    Existing completion strings are moved into the completions table.
+    Loaded habits keep their full history.
+    """
+    import sqlite3
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE habits (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL, periodicity TEXT NOT NULL,
+            creation_date TEXT NOT NULL, completion_dates TEXT, current_streak INTEGER
+        )
+    """)
+    conn.execute(
+        "INSERT INTO habits VALUES (1, 'Legacy', 'daily', '2024-01-01', '2024-01-01,2024-01-02', 2)"
+    )
+    conn.commit()
+    conn.close()
+
+    db = DatabaseConnector(str(db_path))
+    habit = db.get_habit_by_id(1)
+    assert habit.completion_dates == [date(2024, 1, 1), date(2024, 1, 2)]
+    assert db.load_habits()[0].completion_dates == habit.completion_dates
+
+def test_incremental_streak_matches_full_recompute(monkeypatch):
+    """
+    Test the constant-time streak update in Habit.complete_today.
+
+    Verifies that:
+    Streaks extended one check-in at a time match update_streak().
+    A gap starts a new streak just like the full recompute does.
+    """
+    import habit as habit_module
+
+    start = date(2024, 1, 1)
+    offsets = [0, 1, 2, 4, 5, 6]
+    habit = Habit("Offline Breakfast", "daily", creation_date=start)
+    for offset in offsets:
+        class FixedDate(date):
+            @classmethod
+            def today(cls, _day=start + timedelta(days=offset)):
+                return _day
+        monkeypatch.setattr(habit_module, "date", FixedDate)
+        assert habit.complete_today() is True
+
+    incremental = habit.current_streak
+    habit.update_streak()
+    assert incremental == habit.current_streak == 3
+
+def test_loaded_habit_continues_stored_streak(habit_manager, monkeypatch):
+    """
+    Test checking in a habit loaded from the database.
+
+    Verifies that:
+    The stored streak is extended without a full update_streak() recompute.
+    The latest completion is read from the bitmap in constant time.
+    """
+    db = habit_manager.db
+    today = date.today()
+    habit = Habit("Seeded", "daily", creation_date=today - timedelta(days=400))
+    habit.completion_dates = [today - timedelta(days=d) for d in range(1, 400) if d % 7]
+    habit.update_streak()
+    db.save_habit(habit)
+    assert habit.current_streak == 6
+
+    loaded = db.get_habit_by_id(habit.id)
+    assert loaded.completions.last() == today - timedelta(days=1)
+
+    def full_recompute(self, today=None):
+        raise AssertionError("update_streak() called on check-in")
+    monkeypatch.setattr(Habit, "update_streak", full_recompute)
+    assert habit_manager.complete_habit(habit.id) is True
+    assert db.get_habit_by_id(habit.id).current_streak == 7
+
+def test_completion_bitmap_round_trip_and_missed_days():
+    """
+    Test the bitmap-backed completion history.
+
+    Verifies that:
+    Completions before the creation date are kept.
+    The BLOB format restores the same days.
+    Missed periods match an expected-date scan for daily and weekly habits.
+    Changes to the completion_dates list are written back to the bitmap.
+    """
+    from completion_bitmap import CompletionBitmap
+
+    start = date(2024, 3, 1)
+    days = [start - timedelta(days=3), start, start + timedelta(days=1), start + timedelta(days=14)]
+    bitmap = CompletionBitmap(start, days)
+    assert list(bitmap) == days
+    assert list(CompletionBitmap.from_bytes(bitmap.to_bytes())) == days
+    assert len(bitmap) == 4
+
+    until = start + timedelta(days=20)
+    for periodicity, step in (("daily", 1), ("weekly", 7)):
+        habit = Habit("Bitmap", periodicity, creation_date=start)
+        habit.completion_dates = days
+        expected = [start + timedelta(days=i) for i in range(0, 21, step)]
+        assert habit.missed_periods(until) == [d for d in expected if d not in days]
+    dates = habit.completion_dates
+    dates.append(until)
+    assert until in habit.completions
+    del dates[0]
+    assert habit.completion_dates == days[1:] + [until]
+    assert habit.completion_count == 4
+
+def test_numpy_backend_matches_python():
+    """
+    Test the vectorized analytics backend.
+
+    Verifies that:
+    Success rates, missed days and streaks are identical on both backends.
+    """
+    pytest.importorskip("numpy")
+    import analysis
+
+    today = date.today()
+    habits = []
+    for index, periodicity in enumerate(["daily", "weekly", "daily", "monthly"]):
+        habit = Habit(f"Habit {index}", periodicity, creation_date=today - timedelta(days=30 + index))
+        habit.completion_dates = [today - timedelta(days=d) for d in range(0, 40, index + 1) if d != 5]
+        habits.append(habit)
+
+    results = {}
+    try:
+        for backend in ("python", "numpy"):
+            assert analysis.set_backend(backend) == backend
+            results[backend] = (
+                analysis.success_rates(habits),
+                analysis.missed_days_report(habits),
+                analysis.current_streaks(habits),
+                analysis.longest_streaks(habits),
+                analysis.calculate_average_success_rate(habits),
+            )
+    finally:
+        analysis.set_backend("python")
+    assert results["python"] == results["numpy"]
+
+def test_sql_analytics_match_python(habit_manager):
+    """
+    Test the analytics computed inside SQLite.
+
+    Verifies that:
+    Completion counts, success rates and streaks match the Python reports.
+    The database-backed aggregates match the ones over loaded habits.
+    """
+    import analysis
+
+    db = habit_manager.db
+    today = date.today()
+    daily = Habit("SQL Daily", "daily", creation_date=today - timedelta(days=20))
+    daily.completion_dates = [today - timedelta(days=d) for d in (0, 1, 2, 5, 6, 7, 8, 15)]
+    weekly = Habit("SQL Weekly", "weekly", creation_date=today - timedelta(days=30))
+    weekly.completion_dates = [today - timedelta(days=d) for d in (30, 23, 20, 16, 2)]
+    for habit in (daily, weekly):
+        habit.update_streak()
+        db.save_habit(habit)
+    habit_manager.create_habit("SQL Empty", "daily")
+
+    habits = db.get_all_habits()
+    ids = [h.id for h in habits]
+    assert list(db.completion_counts().values()) == [h.completion_count for h in habits]
+    assert db.success_rates() == dict(zip(ids, analysis.success_rates(habits)))
+    assert db.current_streaks() == dict(zip(ids, analysis.current_streaks(habits)))
+    assert db.longest_streaks() == dict(zip(ids, analysis.longest_streaks(habits)))
+    assert analysis.average_success_rate_from_db(db) == calculate_average_success_rate(habits)
+    assert analysis.longest_streak_from_db(db) == find_longest_streak(habits)
+
+def test_identity_map_cache(monkeypatch):
+    """
+    Test the opt-in habit cache of DatabaseConnector.
+
+    Verifies that:
+    Repeated reads return the same instance without querying again.
+    Saves and deletes keep the cache in step with the database.
+    A check-in whose write fails is evicted, so it can be retried.
+    The cache never grows past its size bound.
+    """
+    import sqlite3
+
+    db = DatabaseConnector(":memory:", cache_size=2)
+    manager = HabitManager(db)
+    first = manager.create_habit("Cached 1", "daily")
+    second = manager.create_habit("Cached 2", "weekly")
+
+    assert db.get_habit_by_id(first.id) is first
+    assert manager.list_habits() == [first, second]
+    hits = db.cache.hits
+    assert manager.list_habits()[0] is first
+    assert db.cache.hits == hits + 2
+
+    manager.complete_habit(first.id)
+    assert db.get_habit_by_id(first.id).current_streak == 1
+
+    def busy():
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(db, "_write", busy)
+    with pytest.raises(sqlite3.OperationalError):
+        manager.complete_habit(second.id)
+    monkeypatch.undo()
+    assert db.get_habit_by_id(second.id) is not second
+    assert manager.complete_habit(second.id) is True
+    assert db.get_habit_by_id(second.id).current_streak == 1
+
+    manager.delete_habit(second.id)
+    assert db.get_habit_by_id(second.id) is None
+    assert [h.id for h in db.load_habits()] == [first.id]
+
+    manager.create_habit("Cached 3", "daily")
+    manager.create_habit("Cached 4", "daily")
+    assert len(db.cache) == 2
+    assert len(db.load_habits()) == 3
+
+def test_duplicate_detection_uses_name_index(habit_manager):
+    """
+    Test indexed duplicate detection in HabitManager.create_habit.
+
+    Verifies that:
+    Names differing only in case or spacing are treated as duplicates.
+    The same name with another periodicity is a different habit.
+    The lookup is answered from the normalized name index.
+    A save rejected by the index is rolled back instead of leaving its transaction open.
+    """
+    import sqlite3
+
+    original = habit_manager.create_habit("No Phone At Dinner", "daily")
+    assert habit_manager.create_habit("  no phone at dinner ", "daily").id == original.id
+    assert habit_manager.create_habit("No Phone At Dinner", "weekly").id != original.id
+    assert habit_manager.db.habit_name_exists("NO PHONE AT DINNER")
+
+    clash = Habit("no phone at dinner", "daily")
+    with pytest.raises(sqlite3.IntegrityError):
+        habit_manager.db.save_habit(clash)
+    assert clash.id is None and not habit_manager.db.conn.in_transaction
+
+    plan = habit_manager.db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM habits WHERE normalized_name=? AND periodicity=?",
+        ("x", "daily")
+    ).fetchall()
+    assert "habits_name_periodicity" in str(plan)
+
+def test_bulk_save_and_completions(habit_manager):
+    """
+    Test the bulk save and bulk completion APIs.
+
+    Verifies that:
+    New habits get IDs and are stored in one call across several batches.
+    Bulk check-ins update history and streaks and skip unknown habits.
+    A failing batch leaves nothing behind.
+    """
+    db = habit_manager.db
+    today = date.today()
+    habits = [Habit(f"Bulk {i}", "daily", creation_date=today - timedelta(days=3)) for i in range(5)]
+    assert db.save_habits(iter(habits), batch_size=2) == 5
+    assert [h.id for h in habits] == [h.id for h in db.load_habits()]
+
+    check_ins = [(habits[0].id, today - timedelta(days=d)) for d in range(3)]
+    check_ins += [(habits[1].id, today), (habits[0].id, today), (9999, today)]
+    assert db.add_completions(check_ins, batch_size=2) == 4
+    assert db.get_habit_by_id(habits[0].id).current_streak == 3
+    assert db.get_habit_by_id(habits[1].id).completion_dates == [today]
+
+    duplicates = [Habit("Fresh", "daily"), Habit("bulk 0", "daily")]
+    import sqlite3
+    with pytest.raises(sqlite3.IntegrityError):
+        db.save_habits(duplicates)
+    assert duplicates[0].id is None
+    assert db.count_habits() == 5
+
+def test_transaction_and_storage_profile(tmp_path):
+    """
+    Test unit-of-work transactions and storage profiles.
+
+    Verifies that:
+    Work inside a transaction becomes visible to other connections only on exit.
+    A failing transaction rolls everything back.
+    A failing nested block or write method inside a transaction only undoes its own work.
+    The 'fast' profile switches the database to WAL mode.
+    """
+    import sqlite3
+    db_path = str(tmp_path / "profile.db")
+    db = DatabaseConnector(db_path, profile="fast")
+    manager = HabitManager(db)
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    reader = sqlite3.connect(db_path)
+    with manager.transaction():
+        habit = manager.create_habit("Batched", "daily")
+        manager.complete_habit(habit.id)
+        assert reader.execute("SELECT COUNT(*) FROM habits").fetchone()[0] == 0
+    assert reader.execute("SELECT COUNT(*) FROM completions").fetchone()[0] == 1
+
+    with pytest.raises(RuntimeError):
+        with manager.transaction():
+            manager.create_habit("Rolled Back", "daily")
+            raise RuntimeError("abort")
+    assert db.find_habit("Rolled Back", "daily") is None
+
+    with manager.transaction():
+        manager.create_habit("Outer", "daily")
+        with pytest.raises(RuntimeError):
+            with manager.transaction():
+                manager.create_habit("Inner", "daily")
+                raise RuntimeError("abort inner")
+        with pytest.raises(sqlite3.IntegrityError):
+            db.save_habits([Habit("Partial", "daily"), Habit("outer", "daily")])
+    assert reader.execute("SELECT name FROM habits ORDER BY id").fetchall() == [("Batched",), ("Outer",)]
+    assert not db.conn.in_transaction
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_export_import_round_trip(tmp_path, fmt):
+    """
+    Test streaming export and import of habits and completions.
+
+    Verifies that:
+    Exported habits and completions are recreated in another database.
+    Importing the same file again merges instead of duplicating.
+    Invalid periodicities and malformed JSON lines are skipped.
+    """
+    from data_transfer import export_habits, import_habits, import_records
+
+    source = DatabaseConnector(":memory:")
+    today = date.today()
+    daily = Habit("Export Daily", "daily", creation_date=today - timedelta(days=5))
+    daily.completion_dates = [today - timedelta(days=d) for d in range(3)]
+    daily.update_streak()
+    source.save_habits([daily, Habit("Export Weekly", "weekly", creation_date=today)])
+
+    path = str(tmp_path / f"backup.{fmt}")
+    assert export_habits(source, path, batch_size=2).rows == 5
+
+    target = DatabaseConnector(":memory:")
+    report = import_habits(target, path, batch_size=2)
+    assert (report.habits_created, report.completions_added) == (2, 3)
+    imported = target.find_habit("export daily", "daily")
+    assert imported.completion_dates == daily.completion_dates
+    assert imported.current_streak == 3
+
+    again = import_habits(target, path)
+    assert (again.habits_created, again.habits_merged, again.completions_added) == (0, 2, 0)
+
+    bad = import_records(target, [
+        {"record": "habit", "habit_id": 7, "name": "Monthly", "periodicity": "monthly", "creation_date": "2024-01-01"},
+        {"record": "completion", "habit_id": 7, "day": "2024-01-02"},
+    ])
+    assert bad.rows_skipped == 2 and target.count_habits() == 2
+
+    if fmt == "jsonl":
+        with open(path, "a", encoding="utf-8") as stream:
+            stream.write('{"record": "habit", "habit_id": 9, "name": "Truncat\n')
+        resumed = import_habits(target, path)
+        assert (resumed.rows, resumed.rows_skipped, resumed.habits_merged) == (6, 1, 2)
+
+def test_async_manager_concurrent_check_ins(tmp_path):
+    """
+    Test the asyncio facade over HabitManager.
+
+    Verifies that:
+    Concurrent check-ins from several workers are all recorded.
+    Reports run through the same worker pool.
+    """
+    import asyncio
+    from async_manager import AsyncHabitManager
+
+    async def scenario():
+        async with AsyncHabitManager(str(tmp_path / "async.db"), max_workers=4) as manager:
+            habits = [await manager.create_habit(f"Async {i}", "daily") for i in range(8)]
+            results = await asyncio.gather(*(manager.complete_habit(h.id) for h in habits))
+            again = await manager.complete_habit(habits[0].id)
+            listed = await manager.list_habits()
+            longest = await manager.longest_streak()
+            return results, again, listed, longest
+
+    results, again, listed, longest = asyncio.run(scenario())
+    assert all(results) and again is False
+    assert all(h.current_streak == 1 for h in listed)
+    assert longest[1] == 1
+
+def test_pooled_connector_threads_and_timeout(tmp_path):
+    """
+    Test HabitManager on a PooledDatabaseConnector shared by several threads.
+
+    Verifies that:
+    Concurrent check-ins and listings from many threads all succeed.
+    Reader checkouts are counted in the pool statistics.
+    A checkout raises PoolTimeout when every reader stays busy past the timeout.
+    An export streams habits and completions through one reader of a single-reader pool.
+    """
+    import threading
+    from connection_pool import PooledDatabaseConnector, PoolTimeout
+    from data_transfer import iter_records
+
+    db = PooledDatabaseConnector(str(tmp_path / "pool.db"), pool_size=2, timeout=0.05)
+    manager = HabitManager(db)
+    habits = [manager.create_habit(f"Pooled {i}", "daily") for i in range(8)]
+    results = []
+
+    def worker(habit):
+        results.append(manager.complete_habit(habit.id))
+        results.append(len(manager.list_habits()) == 8)
+
+    threads = [threading.Thread(target=worker, args=(h,)) for h in habits]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results.count(True) == 16
+    assert all(h.current_streak == 1 for h in manager.list_habits())
+    assert db.pool_stats()["readers"]["checkouts"] > 0
+
+    first, second = db.iter_habit_records(), db.iter_completion_records()
+    next(first), next(second)  # both readers are now checked out
+    with pytest.raises(PoolTimeout):
+        db.count_habits()
+    assert db.pool_stats()["readers"]["timeouts"] == 1
+    first.close(), second.close()
+    assert db.count_habits() == 8
+    db.close()
+
+    single = PooledDatabaseConnector(str(tmp_path / "pool.db"), pool_size=1, timeout=0.05)
+    records = list(iter_records(single, batch_size=3))
+    assert [r["record"] for r in records[:2]] == ["habit", "completion"]
+    assert [r["record"] for r in records].count("completion") == 8 and len(records) == 16
+    single.close()
+
+def test_lazy_completions_and_summaries(habit_manager):
+    """
+    Test lazy loading of completion history and the summary listing.
+
+    Verifies that:
+    Loaded habits keep their history undecoded until it is used.
+    The decoded history and streak match what was saved.
+    Summaries list id, name, periodicity and streak, optionally filtered.
+    """
+    db = habit_manager.db
+    start = date.today() - timedelta(days=3)
+    habit = Habit("Lazy Reader", "daily", creation_date=start)
+    habit.completion_dates = [start + timedelta(days=2), start + timedelta(days=3)]
+    habit.update_streak()
+    db.save_habit(habit)
+    db.save_habit(Habit("Weekly Walk", "weekly"))
+
+    loaded = db.get_habit_by_id(habit.id)
+    assert loaded.completions_loaded is False
+    assert loaded.name == "Lazy Reader" and loaded.current_streak == 2
+    assert loaded.completions_loaded is False
+    assert loaded.completion_dates == habit.completion_dates
+    assert loaded.completions_loaded is True
+
+    summaries = habit_manager.list_summaries()
+    assert [(s.id, s.name, s.periodicity, s.current_streak) for s in summaries] == \
+        [(habit.id, "Lazy Reader", "daily", 2), (habit.id + 1, "Weekly Walk", "weekly", 0)]
+    assert [s.name for s in habit_manager.list_summaries("weekly")] == ["Weekly Walk"]
+
+def test_habit_slots_memory():
+    """
+    Test the compact Habit layout.
+
+    Verifies that:
+    Habit instances have no per-instance __dict__.
+    The memory benchmark reports fewer bytes per habit than the list-of-dates layout.
+    """
+    from benchmarks import bench_habit_memory
+
+    habit = Habit("Compact", "daily")
+    assert not hasattr(habit, "__dict__")
+    with pytest.raises(AttributeError):
+        habit.notes = "not a field"
+
+    row = bench_habit_memory(totals=(1000,), per_habit=50)[0]
+    assert row["habits"] == 20
+    assert row["lazy_bytes_per_habit"] < row["bitmap_bytes_per_habit"] < row["list_bytes_per_habit"]
+
+def test_benchmark_suite_and_baseline_comparison(tmp_path):
+    """
+    Test the benchmark suite runner and its baseline comparison.
+
+    Verifies that:
+    Every parameter combination produces timings for every operation.
+    The report survives a JSON round trip.
+    Only operations slower than the threshold are reported as regressions.
+    """
+    import json
+    from benchmarks import compare_results, run_suite
+
+    report = run_suite(habit_counts=(5,), history_days=(14,), weekly_shares=(0.0, 1.0),
+                       storages=("memory", "file"), repeat=1, directory=str(tmp_path))
+    assert len(report["results"]) == 4
+    assert all("complete_habit" in t and "longest_streaks" in t for t in report["results"].values())
+
+    baseline = json.loads(json.dumps(report))
+    assert compare_results(report, baseline) == []
+
+    case = "memory/habits=5/history=14/weekly=0"
+    baseline["results"][case]["save_habit"] = report["results"][case]["save_habit"] / 10
+    regressions = compare_results(report, baseline, threshold=0.25, min_seconds=0.0)
+    assert [(r["case"], r["operation"]) for r in regressions] == [(case, "save_habit")]
+
+def test_synthetic_dataset_generator(habit_manager):
+    """
+    Test the seeded synthetic dataset generator.
+
+    Verifies that:
+    Importing example_data builds nothing, while get_example_habits still returns 5 habits.
+    The same seed yields the same habits and histories.
+    populate_database stores every habit and completion, with streaks matching the stored history.
+    """
+    import example_data
+    from example_data import generate_habits, get_example_habits, populate_database
+
+    assert not hasattr(example_data, "habits")
+    assert len(get_example_habits()) == 5
+
+    today = date(2024, 6, 30)
+    first = [(h.name, h.periodicity, h.creation_date, h.completion_dates) for h in generate_habits(50, 7, 120, today)]
+    again = [(h.name, h.periodicity, h.creation_date, h.completion_dates) for h in generate_habits(50, 7, 120, today)]
+    assert first == again
+    assert {p for _, p, _, _ in first} == {"daily", "weekly"}
+    assert all(d <= today for *_, days in first for d in days)
+
+    db = habit_manager.db
+    habits, completions = populate_database(db, 200, seed=3, history_days=90, batch_size=64)
+    assert habits == db.count_habits() == 200
+    assert completions == sum(db.completion_counts().values()) > 0
+    assert db.current_streaks() == {h.id: h.current_streak for h in db.load_habits()}
+
+def test_instrumentation_toggle_and_summary():
+    """
+    Test the runtime-switchable instrumentation.
+
+    Verifies that:
+    Calls, SQL statements and the number of returned items are recorded while enabled.
+    Scalar and single-record results have no item count.
+    Counts from concurrent calls are not lost.
+    Allocations are recorded when requested.
+    Disabling restores the original, unwrapped methods and stops recording.
+    """
+    import instrumentation
+
+    original = DatabaseConnector.load_habits
+    instrumentation.reset()
+    with instrumentation.profiling(track_allocations=True):
+        assert instrumentation.is_enabled()
+        assert DatabaseConnector.load_habits is not original
+        manager = HabitManager(DatabaseConnector(":memory:"))
+        habit = manager.create_habit("Profiled", "daily")
+        manager.complete_habit(habit.id)
+        manager.list_habits()
+        manager.list_habits()
+        manager.db.count_habits()
+        manager.db.top_longest_streak()
+
+    assert not instrumentation.is_enabled()
+    assert DatabaseConnector.load_habits is original
+    report = instrumentation.summary()
+    calls = report["calls"]
+    assert calls["DatabaseConnector.load_habits"]["calls"] == 2
+    assert calls["DatabaseConnector.load_habits"]["rows_returned"] == 2
+    assert calls["DatabaseConnector.count_habits"]["rows_returned"] is None
+    assert calls["DatabaseConnector.top_longest_streak"]["rows_returned"] is None
+    assert calls["DatabaseConnector.add_completion"]["queries"] >= 2
+    assert calls["HabitManager.create_habit"]["allocated_bytes"] != 0
+    assert report["queries"] >= sum(row["queries"] for row in calls.values())
+    assert "HabitManager.complete_habit" in instrumentation.format_summary()
+
+    manager.list_habits()
+    assert instrumentation.summary()["calls"]["DatabaseConnector.load_habits"]["calls"] == 2
+    instrumentation.reset()
+
+    import threading
+    pair = instrumentation._wrap("pair", lambda: [1, 2])
+    def call_many():
+        for _ in range(2000):
+            pair()
+    workers = [threading.Thread(target=call_many) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    counted = instrumentation.summary()["calls"]["pair"]
+    assert (counted["calls"], counted["rows_returned"]) == (8000, 16000)
+    instrumentation.reset()
+
+def test_streak_index_history_queries():
+    """
+    Test the run index behind the historical streak reports.
+
+    Verifies that:
+    The longest-ever streak survives a broken current streak.
+    Streak-as-of and range counts follow the completion history.
+    complete_today() keeps an existing index up to date, and update_streak() keeps it.
+    A direct discard-and-add on the bitmap is noticed even though the count is unchanged.
+    """
+    from analysis import (completions_between, find_longest_ever_streak, longest_ever_streak_for_habit,
+                          streak_as_of, streaks_as_of_report)
+
+    today = date.today()
+    start = today - timedelta(days=20)
+    habit = Habit("Index", "daily", creation_date=start)
+    # Runs: 5 days, a break, then 3 days ending yesterday.
+    habit.completion_dates = ([start + timedelta(days=i) for i in range(5)] +
+                              [today - timedelta(days=i) for i in range(1, 4)])
+    habit.update_streak()
+    assert habit.current_streak == 3
+    assert longest_ever_streak_for_habit(habit) == 5
+    assert habit.streak_index.runs()[-1] == (today - timedelta(days=3), today - timedelta(days=1), 3)
+
+    assert streak_as_of(habit, start + timedelta(days=2)) == 3
+    assert streak_as_of(habit, start + timedelta(days=5)) == 5   # day after the run, still open
+    assert streak_as_of(habit, start + timedelta(days=6)) == 0   # broken
+    assert completions_between(habit, start, start + timedelta(days=10)) == 5
+
+    index = habit.streak_index
+    habit.update_streak()
+    assert habit.complete_today() is True
+    assert habit.streak_index is index
+    assert habit.current_streak == streak_as_of(habit, today) == 4
+    assert completions_between(habit, start, today) == 9
+
+    habit.completions.discard(start)
+    habit.completions.add(start + timedelta(days=5))
+    assert habit.streak_index is not index
+    assert longest_ever_streak_for_habit(habit) == 5
+    assert streak_as_of(habit, start + timedelta(days=6)) == 5
+
+    weekly = Habit("Weekly Index", "weekly", creation_date=start)
+    weekly.completion_dates = [start, start + timedelta(days=7)]
+    assert find_longest_ever_streak([habit, weekly]) == ("Index", 5)
+    assert streaks_as_of_report([habit, weekly], start + timedelta(days=10)) == [("Index", 0), ("Weekly Index", 2)]
+
+def test_habit_stats_maintained_and_rebuilt(tmp_path):
+    """
+    Test the per-habit statistics table.
+
+    Verifies that:
+    Saving, completing and bulk-recording habits keep the statistics current.
+    rebuild_stats() reproduces the incrementally maintained rows.
+    rebuild_stats() recomputes a wrong stored current streak in habits and habit_stats.
+    A database from the previous schema version gets its statistics built on open.
+    """
+    import sqlite3
+    import analysis
+
+    path = str(tmp_path / "stats.db")
+    db = DatabaseConnector(path)
+    manager = HabitManager(db)
+    today = date.today()
+    habit = Habit("Stats", "daily", creation_date=today - timedelta(days=9))
+    habit.completion_dates = [today - timedelta(days=d) for d in (9, 8, 7, 6, 3, 2, 1)]
+    habit.update_streak()
+    db.save_habit(habit)
+    weekly = manager.create_habit("Stats Weekly", "weekly")
+    manager.complete_habit(habit.id)
+    db.add_completions([(weekly.id, today)])
+
+    stats = db.get_habit_stats(habit.id)
+    assert stats["completions"] == 8 and stats["last_completion"] == today
+    assert (stats["current_streak"], stats["longest_streak"], stats["expected_periods"]) == (4, 4, 10)
+    assert db.get_habit_stats(weekly.id)["completions"] == 1
+    assert analysis.longest_ever_streak_from_db(db) == ("Stats", 4)
+
+    maintained = {i: db.get_habit_stats(i) for i in (habit.id, weekly.id)}
+    assert db.rebuild_stats() == 2
+    assert {i: db.get_habit_stats(i) for i in (habit.id, weekly.id)} == maintained
+
+    db.conn.execute("UPDATE habits SET current_streak = 9 WHERE id = ?", (habit.id,))
+    db.conn.commit()
+    assert db.rebuild_stats() == 2
+    assert db.get_habit_by_id(habit.id).current_streak == 4
+    assert {i: db.get_habit_stats(i) for i in (habit.id, weekly.id)} == maintained
+
+    manager.delete_habit(weekly.id)
+    assert db.get_habit_stats(weekly.id) is None
+    db.close()
+
+    raw = sqlite3.connect(path)
+    raw.execute("DELETE FROM habit_stats")
+    raw.execute("PRAGMA user_version = 3")
+    raw.commit()
+    raw.close()
+    reopened = DatabaseConnector(path)
+    assert reopened.get_habit_stats(habit.id) == maintained[habit.id]
+
+def test_legacy_streaks_recomputed_on_open(tmp_path):
+    """
+    Test opening a database whose stored streaks predate the current-run definition.
+
+    Verifies that:
+    The stored current streak is recomputed from the completions on open.
+    A check-in continues from the recomputed streak, not the stored one.
+    The statistics, including a longest streak built from the stale value, are rebuilt.
+    """
+    import sqlite3
+
+    path = str(tmp_path / "legacy_streaks.db")
+    db = DatabaseConnector(path)
+    manager = HabitManager(db)
+    today = date.today()
+    habit = Habit("Old Run", "daily", creation_date=today - timedelta(days=70))
+    old_run = [today - timedelta(days=60 + d) for d in range(10)]
+    habit.completion_dates = old_run + [today - timedelta(days=d) for d in (3, 2, 1)]
+    habit.update_streak()
+    db.save_habit(habit)
+    db.close()
+
+    raw = sqlite3.connect(path)
+    raw.execute("UPDATE habits SET current_streak = 10")
+    raw.execute("UPDATE habit_stats SET current_streak = 10, longest_streak = 11")
+    raw.execute("PRAGMA user_version = 6")
+    raw.commit()
+    raw.close()
+
+    db = DatabaseConnector(path)
+    manager = HabitManager(db)
+    assert db.get_habit_by_id(habit.id).current_streak == 3
+    assert manager.complete_habit(habit.id) is True
+    assert db.get_habit_by_id(habit.id).current_streak == 4
+    stats = db.get_habit_stats(habit.id)
+    assert (stats["current_streak"], stats["longest_streak"]) == (4, 10)
+
+def test_check_in_writes_do_not_scan_history(tmp_path, monkeypatch):
+    """
+    Test the check-in write path of DatabaseConnector.add_completion.
+
+    Verifies that:
+    The longest streak is advanced from the stored one instead of being recomputed.
+    A bitmap that has to grow is rewritten with spare bytes, later days are patched in place.
+    The patched bitmap and advanced statistics match a reload and rebuild_stats().
+    """
+    import sqlite3
+
+    path = str(tmp_path / "check_in.db")
+    db = DatabaseConnector(path)
+    manager = HabitManager(db)
+    today = date.today()
+    habit = Habit("Patched", "daily", creation_date=today - timedelta(days=96))
+    habit.completion_dates = [today - timedelta(days=d) for d in list(range(36, 97)) + list(range(1, 11))]
+    habit.update_streak()
+    db.save_habit(habit)
+
+    def stored_blob():
+        with sqlite3.connect(path) as raw:
+            return raw.execute("SELECT completion_bitmap FROM habits WHERE id=?", (habit.id,)).fetchone()[0]
+
+    def full_scan(self):
+        raise AssertionError("longest_streak() called on check-in")
+    monkeypatch.setattr(Habit, "longest_streak", full_scan)
+
+    assert manager.complete_habit(habit.id) is True
+    stats = db.get_habit_stats(habit.id)
+    assert (stats["completions"], stats["current_streak"], stats["longest_streak"]) == (72, 11, 61)
+    grown = stored_blob()
+    assert grown.endswith(bytes(8))
+
+    tomorrow = today + timedelta(days=1)
+    loaded = db.get_habit_by_id(habit.id)
+    loaded.completions.add(tomorrow)
+    loaded.current_streak = 12
+    assert db.add_completion(loaded, tomorrow) is True
+    assert len(stored_blob()) == len(grown) and stored_blob() != grown
+    stats = db.get_habit_stats(habit.id)
+    assert (stats["last_completion"], stats["current_streak"], stats["longest_streak"]) == (tomorrow, 12, 61)
+
+    db.close()
+    reopened = DatabaseConnector(path)
+    assert reopened.get_habit_by_id(habit.id).completion_dates[-2:] == [today, tomorrow]
+    reopened.rebuild_stats()
+    assert reopened.get_habit_stats(habit.id) == stats
+
+def test_cli_subcommands(tmp_path, capsys):
+    """
+    Test the non-interactive cli.py commands.
+
+    Verifies that:
+    Importing cli loads neither SQLite nor the analytics and profiling modules.
+    create, complete, list, analyze and delete work on the given database.
+    Unknown habit IDs give exit code 1 without undoing the other check-ins.
+    """
+    import json
+    import os
+    import subprocess
+    import sys
+    import cli
+
+    probe = "import cli, sys; print(sorted({'sqlite3', 'analysis', 'instrumentation'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.stdout.strip() == "[]"
+
+    db = ["--db", str(tmp_path / "cli.db")]
+    assert cli.main(db + ["create", "Scripted", "--periodicity", "daily"]) == 0
+    assert cli.main(db + ["create", "Scripted Weekly", "--periodicity", "weekly"]) == 0
+    capsys.readouterr()
+
+    assert cli.main(db + ["complete", "--ids", "1,2,99"]) == 1
+    assert capsys.readouterr().out.splitlines() == ["1: completed", "2: completed", "99: not found"]
+
+    assert cli.main(db + ["list", "--json", "--periodicity", "weekly"]) == 0
+    assert json.loads(capsys.readouterr().out) == [
+        {"id": 2, "name": "Scripted Weekly", "periodicity": "weekly", "current_streak": 1}]
+
+    assert cli.main(db + ["analyze", "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["habits"] == 2 and report["average_success_rate"] == 100.0
+
+    assert cli.main(db + ["delete", "2"]) == 0
+    capsys.readouterr()
+    cli.main(db + ["list"])
+    assert capsys.readouterr().out.splitlines() == ["1\tScripted\tdaily\t1"]
+
+def test_rollover_expires_lapsed_streaks(tmp_path):
+    """
+    Test the daily rollover job.
+
+    Verifies that:
+    Habits whose period passed without a completion get a zero streak, in habits and habit_stats.
+    Habits still inside their period keep their streak.
+    A second run on the same day is skipped; a run after downtime catches up in one pass.
+    An expired streak agrees with a full recompute, and the next check-in starts it at 1.
+    """
+    from rollover import last_rollover, rollover
+
+    db = DatabaseConnector(str(tmp_path / "rollover.db"), cache_size=100)
+    manager = HabitManager(db)
+    today = date(2024, 3, 20)
+    layouts = [("Lapsed daily", "daily", [today - timedelta(days=d) for d in (3, 4, 5)]),
+               ("Yesterday daily", "daily", [today - timedelta(days=d) for d in (1, 2)]),
+               ("Lapsed weekly", "weekly", [today - timedelta(days=8)]),
+               ("Weekly on time", "weekly", [today - timedelta(days=7)])]
+    for name, periodicity, days in layouts:
+        habit = Habit(name=name, periodicity=periodicity, creation_date=today - timedelta(days=10))
+        habit.completion_dates = days
+        habit.update_streak(max(days))
+        db.save_habit(habit)
+
+    result = rollover(db, today)
+    assert (result.expired, result.skipped, result.last_run) == (2, False, None)
+    assert [h.current_streak for h in manager.list_habits()] == [0, 2, 0, 1]
+    assert db.get_habit_stats(1)["current_streak"] == 0
+    assert db.get_habit_stats(2)["as_of"] == today and db.get_habit_stats(2)["expected_periods"] == 11
+    assert last_rollover(db) == today
+
+    assert rollover(db, today).skipped
+    later = rollover(db, today + timedelta(days=5))
+    assert (later.expired, later.days_caught_up) == (2, 5)
+    assert [h.current_streak for h in manager.list_habits()] == [0, 0, 0, 0]
+    assert last_rollover(db) == today + timedelta(days=5)
+
+    for habit in manager.list_habits():
+        habit.update_streak(today + timedelta(days=5))
+        assert habit.current_streak == 0
+    assert manager.complete_habit(2) is True
+    checked_in = db.get_habit_by_id(2)
+    assert checked_in.current_streak == 1
+    checked_in.update_streak()
+    assert checked_in.current_streak == 1
+
+def test_windowed_analytics(habit_manager):
+    """
+    Test the (start, end) windowed analytics.
+
+    Verifies that:
+    A window over the whole history matches the unwindowed success rates and missed days.
+    Short windows count only their own completions, days and weekly anniversaries.
+    The database-backed reports equal the in-memory ones.
+    """
+    import analysis
+
+    db = habit_manager.db
+    today = date.today()
+    daily = Habit(name="Window daily", periodicity="daily", creation_date=today - timedelta(days=400))
+    daily.completion_dates = [today - timedelta(days=d) for d in range(400) if d % 5 != 2]
+    weekly = Habit(name="Window weekly", periodicity="weekly", creation_date=today - timedelta(days=60))
+    weekly.completion_dates = [today - timedelta(days=60 - 7 * w) for w in (0, 1, 2, 4, 5)]
+    future = Habit(name="Window future", periodicity="daily", creation_date=today + timedelta(days=3))
+    habits = [daily, weekly, future]
+    for habit in habits:
+        habit.update_streak()
+        db.save_habit(habit)
+
+    whole = analysis.window_reports(habits, date.min, today)
+    assert [r.success_rate for r in whole] == analysis.success_rates(habits[:2])
+    assert [r.missed_days for r in whole] == analysis.missed_days_report(habits[:2])
+
+    start = today - timedelta(days=6)
+    week = analysis.window_report(daily, start, today)
+    assert (week.completions, week.expected_periods) == (6, 7)
+    assert week.missed_days == [today - timedelta(days=2)]
+    assert week.longest_streak == 4
+    assert analysis.get_missed_days_in_window(weekly, today - timedelta(days=50), today - timedelta(days=20)) == [
+        weekly.creation_date + timedelta(days=21)]
+
+    from_db = analysis.window_reports_from_db(db, start, today)
+    assert from_db == analysis.window_reports(habits, start, today)
+    assert analysis.average_success_rate_in_window_from_db(db, start, today) == \
+        analysis.calculate_average_success_rate_in_window(habits, start, today)
+    with pytest.raises(ValueError):
+        analysis.window_report(daily, today, start)
+
+def test_parallel_report_matches_serial(tmp_path):
+    """
+    Test the process-pool report.
+
+    Verifies that:
+    id_shards() splits the stored IDs into balanced ranges, skipping deleted IDs.
+    parallel_report() with several workers returns exactly the serial report.
+    In-memory databases are rejected, as workers cannot open them.
+    """
+    from example_data import populate_database
+    from parallel_reports import parallel_report, serial_report
+
+    path = str(tmp_path / "parallel.db")
+    db = DatabaseConnector(path)
+    populate_database(db, 40, seed=3, history_days=120)
+    for habit_id in (5, 6, 7):
+        db.delete_habit(habit_id)
+    assert db.id_shards(10) == [(1, 13), (14, 23), (24, 33), (34, 40)]
+
+    today = date.today()
+    expected = serial_report(db, today)
+    assert [row.id for row in expected] == [i for i in range(1, 41) if i not in (5, 6, 7)]
+    assert parallel_report(path, workers=2, chunk_size=10, today=today) == expected
+    assert parallel_report(path, workers=1, today=today) == expected
+    with pytest.raises(ValueError):
+        parallel_report(":memory:")
+    db.close()
+
+def test_analytics_cache_versions_and_persistence(tmp_path):
+    """
+    Test the versioned analytics cache.
+
+    Verifies that:
+    Saves, check-ins and deletes raise the habit version; a reused ID starts above the deleted version.
+    cached_report() equals serial_report() and only recomputes habits that changed.
+    The LRU size bound holds, and save()/load() round-trip the entries.
+    Entries of another database with the same IDs and versions are never reused.
+    Files referring to missing modules or classes load as an empty cache.
+    """
+    from analytics_cache import AnalyticsCache, cached_report
+    from parallel_reports import serial_report
+
+    db = DatabaseConnector(str(tmp_path / "cache.db"))
+    manager = HabitManager(db)
+    for name in ("Cache A", "Cache B", "Cache C"):
+        manager.create_habit(name, "daily")
+    assert db.habit_versions() == [(1, 1), (2, 1), (3, 1)]
+    manager.complete_habit(2)
+    assert dict(db.habit_versions())[2] == 2
+    db.delete_habit(3)
+    manager.create_habit("Cache D", "daily")
+    assert db.habit_versions() == [(1, 1), (2, 2), (3, 2)]
+
+    today = date.today()
+    cache = AnalyticsCache()
+    assert cached_report(db, cache, today) == serial_report(db, today)
+    assert cache.stats()["misses"] == 3
+    manager.complete_habit(1)
+    assert cached_report(db, cache, today) == serial_report(db, today)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    path = str(tmp_path / "analytics.cache")
+    cache.save(path)
+    reloaded = AnalyticsCache.load(path)
+    assert cached_report(db, reloaded, today) == serial_report(db, today)
+    assert (reloaded.hits, reloaded.misses) == (3, 0)
+    assert len(AnalyticsCache.load(path, max_size=2)) == 2
+    assert len(AnalyticsCache.load(str(tmp_path / "missing.cache"))) == 0
+
+    other = DatabaseConnector(str(tmp_path / "other.db"))
+    for name in ("Other A", "Other B", "Other C"):
+        HabitManager(other).create_habit(name, "weekly")
+    other.conn.execute("UPDATE habits SET version = 2")
+    other.conn.commit()
+    assert other.habit_versions() == db.habit_versions() and other.database_id() != db.database_id()
+    assert len(AnalyticsCache.load(path, database_id=other.database_id())) == 0
+    assert len(AnalyticsCache.load(path, database_id=db.database_id())) == len(cache)
+    stale = AnalyticsCache.load(path)
+    assert cached_report(other, stale, today) == serial_report(other, today)
+    assert stale.misses == 3 and stale.database_id == other.database_id()
+
+    for payload in (b"cno_such_module_for_cache\nRow\n.", b"cbuiltins\nno_such_class\n."):
+        with open(path, "wb") as stream:
+            stream.write(payload)
+        assert len(AnalyticsCache.load(path)) == 0
+
+    small = AnalyticsCache(max_size=2)
+    for key in range(3):
+        small.put(key, key)
+    assert len(small) == 2 and small.get(0) is None and small.get(2) == 2
+
+def test_iter_habits_and_streaming_analytics(tmp_path):
+    """
+    Test streaming habits out of the database.
+
+    Verifies that:
+    iter_habits() yields the stored habits in ID order, batch by batch, optionally by periodicity.
+    The analysis aggregates give the same results for a one-shot generator as for a list.
+    Streaming the average success rate peaks at a fraction of the memory of loading every habit.
+    """
+    import tracemalloc
+    import analysis
+    from example_data import populate_database
+
+    db = DatabaseConnector(str(tmp_path / "stream.db"))
+    populate_database(db, 2000, seed=4, history_days=200)
+    loaded = sorted(db.load_habits(), key=lambda h: h.id)
+    assert [h.id for h in db.iter_habits(batch_size=7)] == [h.id for h in loaded]
+    assert [h.id for h in db.iter_habits(periodicity="weekly")] == [h.id for h in loaded if h.periodicity == "weekly"]
+
+    assert analysis.calculate_average_success_rate(db.iter_habits()) == analysis.calculate_average_success_rate(loaded)
+    assert analysis.find_longest_streak(db.iter_habits()) == analysis.find_longest_streak(loaded)
+    assert analysis.find_longest_ever_streak(db.iter_habits()) == analysis.find_longest_ever_streak(loaded)
+    assert analysis.list_by_periodicity(db.iter_habits(), "daily") == analysis.list_by_periodicity(loaded, "daily")
+    assert analysis.calculate_average_success_rate(iter([])) == 0.0
+    assert analysis.find_longest_streak(iter([])) == ("None", 0)
+
+    peaks = []
+    for habits in (db.load_habits, lambda: db.iter_habits(batch_size=100)):
+        tracemalloc.start()
+        analysis.calculate_average_success_rate(habits())
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[1] * 3 < peaks[0]
+    db.close()